@@ -0,0 +1,217 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set, Tuple
+
+from config import ACTION_TIMEOUT
+from protocol import RECV_BUFFER_SIZE, FrameDecoder
+from runner import ACTION_NAMES, Runner
+from type.poker_action import PokerAction
+from type.round_state import RoundStateClient
+
+# Stream reader buffer limit; frames are split by FrameDecoder, so this only bounds buffering
+STREAM_LIMIT = 1 << 20
+
+
+class AsyncRunner(Runner):
+    """
+    Client runner built on asyncio streams.
+
+    Messages go through the same handlers as Runner, but the bot decides in a
+    worker thread so the socket keeps being read while it thinks. If the bot
+    misses the action deadline a safe fallback action is sent instead: check
+    (or call nothing) when there is nothing to call, fold otherwise.
+
+    A decision that times out is interrupted through Bot.interrupt and its
+    result is discarded: every request carries a (game, request) token, and
+    a result whose token is no longer current is dropped. The worker has a
+    single thread, so get_action calls never overlap each other. While a
+    late decision is still running, the other bot callbacks are queued on
+    the worker behind it, with copies of the round state, so the bot is
+    never called from two threads at once. A decision queued behind a late
+    one that has not started when its own deadline passes is cancelled.
+    """
+    def __init__(self, host: str, port: int, result_path: str, sim: bool = False, action_timeout: float = ACTION_TIMEOUT) -> None:
+        """
+        Initialize the runner with connection details.
+
+        Args:
+            host: Server hostname or IP address
+            port: Server port
+            result_path: File the game results are appended to
+            sim: Simulation (continuous) mode
+            action_timeout: Seconds the bot may take before the fallback action is sent
+        """
+        super().__init__(host, port, result_path, sim)
+        self.action_timeout = action_timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bot-action')
+        self.pending_actions: Set[asyncio.Task] = set()
+        self.timeouts = 0
+        # Calls handed to the bot thread and not done yet, callbacks queue behind them
+        self.bot_calls: Set[Future] = set()
+        # Action requests so far, part of the token identifying the current request
+        self.action_requests = 0
+
+    def _handle_request_action(self, _: Any) -> None:
+        """Handle request for player action without blocking the read loop."""
+        if not self.bot or not self.current_round:
+            self.logger.error("No bot or current round available")
+            return
+
+        # Waiting for the hook to stop would block the event loop, the decision runs on its own thread anyway
+        self._stop_pondering(wait_for_stop=False)
+        if self._post_blind():
+            return
+
+        self.action_requests += 1
+        task = asyncio.get_running_loop().create_task(self._request_action(self._action_token()))
+        self.pending_actions.add(task)
+        task.add_done_callback(self.pending_actions.discard)
+
+    def _action_token(self) -> Tuple[int, int]:
+        """Identifies the current action request; it changes with every request and every game."""
+        return self.game_count, self.action_requests
+
+    async def _request_action(self, token: Tuple[int, int]) -> None:
+        """
+        Run the bot decision in the executor and send it, or the fallback on timeout.
+
+        Args:
+            token: Token of the request, the result is dropped if it is no longer current
+        """
+        # The bot may still be thinking when the next GAME_STATE updates the live state
+        round_state = self.current_round.snapshot()
+        start = time.perf_counter_ns()
+        decision = self._submit_to_bot(self.bot.get_action, round_state, self.player_money)
+        try:
+            # On timeout the wrapped future is cancelled, which also cancels a decision that has not started yet
+            action, amount = await asyncio.wait_for(asyncio.wrap_future(decision), self.action_timeout)
+            self.metrics.observe('decision_latency', round_state.round, time.perf_counter_ns() - start)
+        except asyncio.TimeoutError:
+            self.bot.interrupt()
+            self.metrics.increment('action_timeouts', round_state.round)
+            self.timeouts += 1
+            action, amount = self._fallback_action()
+            self.logger.warning("Bot missed the %ss deadline, sending %s", self.action_timeout, action.name)
+        except Exception as e:
+            action, amount = self._fallback_action()
+            self.logger.exception("Bot failed to act, sending %s: %s", action.name, e)
+
+        if token != self._action_token() or self.current_round is None:
+            self.logger.warning("Dropping %s decided for an earlier action request", action.name)
+            return
+        self._submit_action(action, amount)
+
+    def _call_bot(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run a bot callback inline, or queue it behind a decision still running on the bot thread."""
+        if all(call.done() for call in list(self.bot_calls)):
+            callback(*args)
+            return
+        # The live state keeps changing before the queued callback runs
+        args = tuple(arg.snapshot() if isinstance(arg, RoundStateClient) else arg for arg in args)
+        self._submit_to_bot(callback, *args).add_done_callback(self._report_callback)
+
+    def _submit_to_bot(self, callback: Callable[..., Any], *args: Any) -> Future:
+        call = self.executor.submit(callback, *args)
+        self.bot_calls.add(call)
+        call.add_done_callback(self.bot_calls.discard)
+        return call
+
+    def _report_callback(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error("Queued bot callback failed: %s", future.exception())
+
+    def _fallback_action(self) -> Tuple[PokerAction, int]:
+        """Check, or call nothing with the big blind option, when there is nothing to call; otherwise fold."""
+        if self.current_round and self.current_round.amount_to_call(self.player_id) == 0:
+            # Same rule as _validate_action: a check is only valid with no bet to match
+            return (PokerAction.CHECK, 0) if self.current_round.current_bet == 0 else (PokerAction.CALL, 0)
+        return PokerAction.FOLD, 0
+
+    def send_action_to_server(self, player_id: str, action: int, amount: int) -> None:
+        """
+        Send player action to the server.
+
+        Args:
+            player_id: The ID of the player
+            action: Action code (from MessageType enum)
+            amount: Bet amount
+        """
+        try:
+            start = time.perf_counter_ns()
+            # The transport sends immediately when its buffer is empty, asyncio enables TCP_NODELAY itself
+            self.writer.write(self.action_writer.encode(player_id, action, amount))
+            elapsed = time.perf_counter_ns() - start
+            self.metrics.observe('send_latency', ACTION_NAMES.get(action, str(action)), elapsed)
+            self.logger.debug("Sent action: %s, amount: %s in %.1f us", action, amount, elapsed / 1e3)
+        except Exception as e:
+            self.logger.error("Failed to send action: %s", e)
+
+    async def connect_async(self) -> bool:
+        """
+        Connect to the poker server.
+
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        try:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=STREAM_LIMIT)
+            self.logger.info("Connected to server at %s:%s", self.host, self.port)
+            return True
+        except OSError as e:
+            self.logger.error("Connection failed: %s", e)
+            return False
+
+    async def receive_messages_async(self) -> None:
+        """Receive and process messages from the server."""
+        decoder = FrameDecoder()
+        while True:
+            try:
+                data = await self.reader.read(RECV_BUFFER_SIZE)
+            except OSError as e:
+                self.logger.error("Error receiving message: %s", e)
+                break
+            if not data:
+                self.logger.info("Server closed connection")
+                break
+            for frame in decoder.feed(data):
+                self.handle_frame(frame)
+            if self.writer.transport.get_write_buffer_size():
+                await self.writer.drain()
+            if self.stop_requested:
+                break
+
+    async def run_async(self) -> None:
+        """Connect to the server and handle messages until it closes the connection."""
+        if not self.bot:
+            self.logger.error("No bot set. Use set_bot() before running.")
+            return
+
+        if not await self.connect_async():
+            return
+
+        try:
+            await self.receive_messages_async()
+            if self.pending_actions:
+                await asyncio.gather(*self.pending_actions, return_exceptions=True)
+        finally:
+            self.close()
+
+    def run(self) -> None:
+        """Run the client, connecting to server and handling messages."""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            self.logger.info("Interrupted by user")
+
+    def close(self) -> None:
+        """Close the connection to the server."""
+        try:
+            if self.writer:
+                self.writer.close()
+            self.executor.shutdown(wait=False)
+        except Exception as e:
+            self.logger.error("Error closing connection: %s", e)
+        super().close()
@@ -0,0 +1,205 @@
+"""
+Vectorized 7-card hand evaluation with NumPy.
+
+Cards are integers 0-51 in the order of type.cards.CARDS, i.e. rank * 4 +
+suit with rank 0 for a deuce. A batch of hands is an (N, 7) integer array
+and is scored in one call: rank and suit counts are built with array
+operations, and everything that depends on a set of ranks (straights, top
+kickers, highest pair) is a lookup in tables indexed by 13-bit rank masks.
+
+Scores order hands exactly like eval7.evaluate and use the same hand type
+in bits 24 and up (0 = high card ... 8 = straight flush), but the bits below
+differ, so scores from the two evaluators must not be mixed.
+"""
+from typing import Iterable, Optional, Sequence, Tuple
+
+import eval7
+import numpy as np
+
+from type.cards import CARDS
+
+NUM_RANKS = 13
+NUM_SUITS = 4
+MASK_SIZE = 1 << NUM_RANKS
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+HAND_TYPE_SHIFT = 24
+
+# Card index per eval7 card mask, to convert eval7 cards into batch input
+CARD_INDEX = {card.mask: index for index, card in enumerate(CARDS)}
+RANK_BIT = np.left_shift(1, np.arange(NUM_RANKS, dtype=np.int64))
+
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    masks = np.arange(MASK_SIZE, dtype=np.int64)
+
+    # Highest set rank, -1 for an empty mask
+    highest = np.full(MASK_SIZE, -1, dtype=np.int64)
+    for rank in range(NUM_RANKS):
+        highest[(masks >> rank) & 1 == 1] = rank
+
+    # Masks keeping only the n highest set ranks
+    top = {}
+    remaining = masks.copy()
+    kept = np.zeros(MASK_SIZE, dtype=np.int64)
+    for n in range(1, 6):
+        high = highest[remaining]
+        bit = np.where(high >= 0, 1 << np.maximum(high, 0), 0)
+        kept = kept | bit
+        remaining = remaining & ~bit
+        top[n] = kept.copy()
+
+    # Highest straight rank + 1, 0 without a straight; the ace also plays low
+    straight = np.zeros(MASK_SIZE, dtype=np.int64)
+    wheel = (1 << (NUM_RANKS - 1)) | 0b1111
+    straight[(masks & wheel) == wheel] = 4
+    for high in range(4, NUM_RANKS):
+        window = 0b11111 << (high - 4)
+        straight[(masks & window) == window] = high + 1
+    return highest, top[1], top[2], top[3], top[5], straight
+
+
+HIGHEST, TOP1, TOP2, TOP3, TOP5, STRAIGHT_HIGH = _build_tables()
+
+
+def card_indices(cards: Iterable[eval7.Card]) -> np.ndarray:
+    """Batch card indices of eval7 cards."""
+    return np.array([CARD_INDEX[card.mask] for card in cards], dtype=np.int64)
+
+
+def evaluate_batch(hands: np.ndarray) -> np.ndarray:
+    """
+    Score many 7-card hands at once.
+
+    Args:
+        hands: Integer array of shape (N, 7) with distinct card indices per row
+
+    Returns:
+        np.ndarray: int64 scores of shape (N,), higher is better
+    """
+    hands = np.asarray(hands, dtype=np.int32)
+    count = hands.shape[0]
+    rows = np.arange(count, dtype=np.int32)[:, None]
+
+    # NUM_SUITS is 4, so the rank and suit are the high and low bits of the card index
+    ranks = hands >> 2
+    suits = hands & 3
+    rank_counts = np.bincount((rows * NUM_RANKS + ranks).ravel(), minlength=count * NUM_RANKS).reshape(count, NUM_RANKS)
+    suit_counts = np.bincount((rows * NUM_SUITS + suits).ravel(), minlength=count * NUM_SUITS).reshape(count, NUM_SUITS)
+    # Rank mask per suit; cards are distinct, so summing the rank bits is the same as OR-ing them
+    suit_masks = np.bincount((rows * NUM_SUITS + suits).ravel(), weights=RANK_BIT[ranks].ravel(),
+                             minlength=count * NUM_SUITS).astype(np.int64).reshape(count, NUM_SUITS)
+
+    # 13-bit rank masks of the ranks held at least once, twice, three and four times
+    present = (rank_counts >= 1) @ RANK_BIT
+    pairs = (rank_counts >= 2) @ RANK_BIT
+    trips = (rank_counts >= 3) @ RANK_BIT
+    quads = (rank_counts == 4) @ RANK_BIT
+
+    # Ranks of the flush suit, 0 without a flush (7 cards hold at most one)
+    flush_suit = np.argmax(suit_counts, axis=1)
+    has_flush = suit_counts[np.arange(count), flush_suit] >= 5
+    flush_mask = np.where(has_flush, suit_masks[np.arange(count), flush_suit], 0)
+
+    straight_flush_high = STRAIGHT_HIGH[flush_mask]
+    straight_high = STRAIGHT_HIGH[present]
+
+    quad_rank = HIGHEST[quads]
+    trip_rank = HIGHEST[trips]
+    # Full house pair: best other rank held at least twice (a second set of trips counts)
+    full_pair_rank = HIGHEST[pairs & ~np.where(trip_rank >= 0, RANK_BIT[np.maximum(trip_rank, 0)], 0)]
+    pair_rank = HIGHEST[pairs]
+    pair_bit = np.where(pair_rank >= 0, RANK_BIT[np.maximum(pair_rank, 0)], 0)
+    second_pair_rank = HIGHEST[pairs & ~pair_bit]
+    second_pair_bit = np.where(second_pair_rank >= 0, RANK_BIT[np.maximum(second_pair_rank, 0)], 0)
+    trip_bit = np.where(trip_rank >= 0, RANK_BIT[np.maximum(trip_rank, 0)], 0)
+    quad_bit = np.where(quad_rank >= 0, RANK_BIT[np.maximum(quad_rank, 0)], 0)
+
+    conditions = [
+        straight_flush_high > 0,
+        quad_rank >= 0,
+        (trip_rank >= 0) & (full_pair_rank >= 0),
+        has_flush,
+        straight_high > 0,
+        trip_rank >= 0,
+        second_pair_rank >= 0,
+        pair_rank >= 0,
+    ]
+    choices = [
+        (STRAIGHT_FLUSH << HAND_TYPE_SHIFT) | ((straight_flush_high - 1) << 20),
+        (QUADS << HAND_TYPE_SHIFT) | (quad_rank << 20) | TOP1[present & ~quad_bit],
+        (FULL_HOUSE << HAND_TYPE_SHIFT) | (trip_rank << 20) | (full_pair_rank << 16),
+        (FLUSH << HAND_TYPE_SHIFT) | TOP5[flush_mask],
+        (STRAIGHT << HAND_TYPE_SHIFT) | ((straight_high - 1) << 20),
+        (TRIPS << HAND_TYPE_SHIFT) | (trip_rank << 20) | TOP2[present & ~trip_bit],
+        (TWO_PAIR << HAND_TYPE_SHIFT) | (pair_rank << 20) | (second_pair_rank << 16) | TOP1[present & ~pair_bit & ~second_pair_bit],
+        (PAIR << HAND_TYPE_SHIFT) | (pair_rank << 20) | TOP3[present & ~pair_bit],
+    ]
+    return np.select(conditions, choices, default=(HIGH_CARD << HAND_TYPE_SHIFT) | TOP5[present])
+
+
+def evaluate_hands(hole_cards: np.ndarray, boards: np.ndarray) -> np.ndarray:
+    """
+    Score hole cards against boards.
+
+    Args:
+        hole_cards: (N, 2) card indices
+        boards: (N, 5) card indices, or a single (5,) board shared by every hand
+
+    Returns:
+        np.ndarray: int64 scores of shape (N,)
+    """
+    hole_cards = np.asarray(hole_cards, dtype=np.int64)
+    boards = np.asarray(boards, dtype=np.int64)
+    if boards.ndim == 1:
+        boards = np.broadcast_to(boards, (hole_cards.shape[0], boards.shape[0]))
+    return evaluate_batch(np.concatenate([hole_cards, boards], axis=1))
+
+
+def draw_without_replacement(rng: np.random.Generator, deck: np.ndarray, samples: int, size: int) -> np.ndarray:
+    """
+    Draw `size` distinct cards from the deck for each of `samples` rows.
+
+    Returns:
+        np.ndarray: (samples, size) card indices
+    """
+    keys = rng.random((samples, deck.shape[0]))
+    order = np.argpartition(keys, size - 1, axis=1)[:, :size] if size < deck.shape[0] else np.argsort(keys, axis=1)
+    return deck[order]
+
+
+def rollout_equity(hand: Sequence[eval7.Card], board: Sequence[eval7.Card] = (), num_opponents: int = 1, samples: int = 10000, seed: Optional[int] = None) -> float:
+    """
+    Monte Carlo equity against random opponent hands, all rollouts evaluated as one batch.
+
+    Args:
+        hand: The two hole cards
+        board: Community cards dealt so far (0 to 5)
+        num_opponents: Number of opponents holding random hands
+        samples: Number of rollouts
+        seed: Seed for the rollout RNG, None for a random seed
+
+    Returns:
+        float: Share of the pot won on average, between 0 and 1
+    """
+    if num_opponents < 1:
+        return 1.0
+    hand_indices = card_indices(hand)
+    board_indices = card_indices(board)
+    dead = set(hand_indices.tolist()) | set(board_indices.tolist())
+    deck = np.array([index for index in range(52) if index not in dead], dtype=np.int64)
+    missing = 5 - len(board_indices)
+
+    rng = np.random.default_rng(seed)
+    draws = draw_without_replacement(rng, deck, samples, missing + 2 * num_opponents)
+    boards = np.concatenate([np.broadcast_to(board_indices, (samples, len(board_indices))), draws[:, :missing]], axis=1)
+    hero = evaluate_hands(np.broadcast_to(hand_indices, (samples, 2)), boards)
+    best = np.zeros(samples, dtype=np.int64)
+    ties = np.zeros(samples, dtype=np.int64)
+    for opponent in range(num_opponents):
+        start = missing + 2 * opponent
+        scores = evaluate_hands(draws[:, start:start + 2], boards)
+        ties = np.where(scores > best, 1, ties + (scores == best))
+        best = np.maximum(best, scores)
+    won = np.where(hero > best, 1.0, np.where(hero == best, 1.0 / (ties + 1), 0.0))
+    return float(won.mean())
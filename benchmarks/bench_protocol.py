@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the inbound message path: the old makefile().readline()
++ strip + split + json.loads path against FrameDecoder with the configured
+JSON backend. A writer thread pushes the whole corpus through a socket pair
+in bursts, the way the server sends a flurry of GAME_STATE messages.
+
+Usage: python benchmarks/bench_protocol.py [-n MESSAGES] [--repeat N]
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import JSON_BACKEND, FrameDecoder, decode
+
+BURST_SIZE = 64
+
+
+def game_state_message(index: int) -> dict:
+    players = [str(player_id) for player_id in range(1, 7)]
+    return {
+        'type': 9,
+        'message': {
+            'round_num': index,
+            'round': 'FLOP',
+            'community_cards': ['Card("9s")', 'Card("Th")', 'Card("2c")'],
+            'pot': 120 + index,
+            'current_player': int(players[index % len(players)]),
+            'current_bet': 20,
+            'min_raise': 40,
+            'max_raise': 9980,
+            'player_bets': {player_id: 20 for player_id in players},
+            'player_actions': {player_id: 'CALL' for player_id in players},
+            'player_money': {player_id: 9980 for player_id in players},
+            'side_pots': [],
+        },
+    }
+
+
+def build_corpus(count: int) -> bytes:
+    return b''.join(json.dumps(game_state_message(index)).encode('utf-8') + b'\n' for index in range(count))
+
+
+def _send(sock: socket.socket, payload: bytes, bursts: int) -> None:
+    step = max(1, len(payload) // bursts)
+    for start in range(0, len(payload), step):
+        sock.sendall(payload[start:start + step])
+    sock.shutdown(socket.SHUT_WR)
+
+
+def legacy_reader(sock: socket.socket) -> int:
+    """The pre-protocol path: text readline, strip, split, json.loads."""
+    count = 0
+    sock_file = sock.makefile('r')
+    while True:
+        line = sock_file.readline()
+        if not line:
+            return count
+        for part in line.strip().split('\n'):
+            if part:
+                json.loads(part)
+                count += 1
+
+
+def frame_reader(sock: socket.socket) -> int:
+    """FrameDecoder over recv_into and decode()."""
+    count = 0
+    decoder = FrameDecoder()
+    while True:
+        frames = decoder.recv_from(sock)
+        if frames is None:
+            return count
+        for frame in frames:
+            decode(frame)
+            count += 1
+
+
+def run_once(reader, payload: bytes, bursts: int) -> float:
+    receiver, sender = socket.socketpair()
+    writer = threading.Thread(target=_send, args=(sender, payload, bursts))
+    start = time.perf_counter()
+    writer.start()
+    reader(receiver)
+    elapsed = time.perf_counter() - start
+    writer.join()
+    receiver.close()
+    sender.close()
+    return elapsed
+
+
+def main(count: int, repeat: int) -> None:
+    payload = build_corpus(count)
+    bursts = max(1, count // BURST_SIZE)
+    print(f"{count} GAME_STATE messages, {len(payload) / 1e6:.1f} MB, JSON backend: {JSON_BACKEND}")
+    results = {}
+    for name, reader in (('legacy', legacy_reader), ('framed', frame_reader)):
+        best = min(run_once(reader, payload, bursts) for _ in range(repeat))
+        results[name] = best
+        print(f"{name:>8}: {best * 1e3:8.1f} ms  {best / count * 1e6:6.2f} us/msg  {count / best:10.0f} msg/s")
+    print(f"speedup: {results['legacy'] / results['framed']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inbound message path microbenchmark")
+    parser.add_argument('-n', '--messages', type=int, default=100000, help='Messages per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per reader, the best is reported')
+    args = parser.parse_args()
+    main(args.messages, args.repeat)
@@ -0,0 +1,104 @@
+"""
+Synthetic server message corpus for the benchmarks.
+
+Games are generated from a seeded RNG and follow the order the server sends
+messages in: GAME_START, then per street ROUND_START, GAME_STATE updates,
+REQUEST_PLAYER_ACTION and ROUND_END, and finally GAME_END. Every MessageType
+appears, including the ones the runner does not handle.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+from engine import BOARD_SIZE
+from type.cards import CARDS
+from type.message import MessageType
+from type.poker_action import PokerAction, PokerRound
+
+HERO_ID = 1
+BLIND_AMOUNT = 10
+START_MONEY = 10000
+
+
+def message(message_type: MessageType, body: Any) -> Dict[str, Any]:
+    return {'type': message_type.value, 'message': body}
+
+
+def game_state(street: PokerRound, board: List[str], players: List[int], current_player: int, bets: Dict[str, int], actions: Dict[str, str], pot: int) -> Dict[str, Any]:
+    return {
+        'round_num': street.value,
+        'round': street.name,
+        'community_cards': board,
+        'pot': pot,
+        'current_player': [current_player],
+        'current_bet': max(bets.values()),
+        'min_raise': BLIND_AMOUNT * 2,
+        'max_raise': START_MONEY - pot,
+        'player_bets': dict(bets),
+        'player_actions': dict(actions),
+        'player_money': {str(player_id): START_MONEY - pot // len(players) for player_id in players},
+        'side_pots': [],
+    }
+
+
+def build_game(rng: random.Random, num_players: int) -> List[Dict[str, Any]]:
+    """Messages of one synthetic game, seen from HERO_ID."""
+    players = list(range(1, num_players + 1))
+    deck = [repr(card) for card in rng.sample(CARDS, 2 * num_players + 5)]
+    hands = {player_id: deck[2 * index:2 * index + 2] for index, player_id in enumerate(players)}
+    full_board = deck[-5:]
+    messages = [message(MessageType.GAME_START, {
+        'hands': hands[HERO_ID],
+        'blind_amount': BLIND_AMOUNT,
+        'is_small_blind': False,
+        'is_big_blind': False,
+        'small_blind_player_id': players[0],
+        'big_blind_player_id': players[1],
+        'all_players': players,
+    })]
+    pot = BLIND_AMOUNT + BLIND_AMOUNT // 2
+    for street in PokerRound:
+        board = full_board[:BOARD_SIZE[street]]
+        bets = {str(player_id): 0 for player_id in players}
+        actions = {str(player_id): '' for player_id in players}
+        messages.append(message(MessageType.ROUND_START, None))
+        for player_id in players:
+            messages.append(message(MessageType.GAME_STATE, game_state(street, board, players, player_id, bets, actions, pot)))
+            if player_id == HERO_ID:
+                messages.append(message(MessageType.REQUEST_PLAYER_ACTION, None))
+                messages.append(message(MessageType.PLAYER_ACTION, {'player_id': HERO_ID, 'action': PokerAction.CHECK.value, 'amount': 0}))
+            action = rng.choice((PokerAction.CHECK, PokerAction.CALL, PokerAction.RAISE))
+            actions[str(player_id)] = action.name
+            if action != PokerAction.CHECK:
+                bets[str(player_id)] = BLIND_AMOUNT * (2 if action == PokerAction.RAISE else 1)
+                pot += bets[str(player_id)]
+        messages.append(message(MessageType.GAME_STATE, game_state(street, board, players, players[0], bets, actions, pot)))
+        messages.append(message(MessageType.ROUND_END, None))
+        messages.append(message(MessageType.TIME_STAMPT, rng.random()))
+    scores = {str(player_id): rng.randint(-pot, pot) for player_id in players}
+    messages.append(message(MessageType.GAME_END, {
+        'player_score': scores[str(HERO_ID)],
+        'all_scores': scores,
+        'active_players_hands': {str(player_id): hands[player_id] for player_id in players},
+    }))
+    return messages
+
+
+def build_corpus(games: int, num_players: int = 2, seed: int = 0) -> List[str]:
+    """
+    Raw message lines for a whole session.
+
+    Args:
+        games: Number of games
+        num_players: Players per game, the hero included
+        seed: RNG seed, the same seed always gives the same corpus
+
+    Returns:
+        List[str]: One JSON message per entry
+    """
+    rng = random.Random(seed)
+    messages = [message(MessageType.CONNECT, HERO_ID), message(MessageType.MESSAGE, 'Welcome')]
+    for _ in range(games):
+        messages.extend(build_game(rng, num_players))
+    messages.append(message(MessageType.DISCONNECT, None))
+    return [json.dumps(entry) for entry in messages]
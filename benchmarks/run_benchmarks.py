@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the client hot paths, run on a synthetic message corpus.
+
+Results are written as JSON, one entry per benchmark, together with the git
+commit they were measured on. Pass --baseline with an earlier results file
+to list the benchmarks that got slower.
+
+Usage: python benchmarks/run_benchmarks.py [-o results.json] [--baseline old.json] [--quick]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import HERO_ID, build_corpus
+from equity import default_calculator
+from metrics import LatencyHistogram
+from player import SimplePlayer
+from replay import ReplayRunner
+from type.cards import CARDS
+from type.round_state import RoundStateClient
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'latest.json')
+# Slowdown over the baseline reported as a regression
+REGRESSION_THRESHOLD = 1.10
+
+
+def summarize(histogram: LatencyHistogram, **extra) -> dict:
+    """Latency summary in microseconds."""
+    result = {
+        'count': histogram.count,
+        'mean_us': histogram.mean() / 1e3,
+        'p50_us': histogram.percentile(0.5) / 1e3,
+        'p99_us': histogram.percentile(0.99) / 1e3,
+        'max_us': histogram.max / 1e3,
+    }
+    result.update(extra)
+    return result
+
+
+def time_per_call(function, arguments: list, repeat: int) -> LatencyHistogram:
+    """Time every call of function over the arguments, repeat times."""
+    histogram = LatencyHistogram()
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for argument in arguments:
+            start = clock()
+            function(argument)
+            histogram.record(clock() - start)
+    return histogram
+
+
+def bench_handle_messages(lines: list) -> dict:
+    """Whole inbound path: decoding, handlers, round state updates and bot callbacks."""
+    runner = ReplayRunner()
+    runner.set_bot(SimplePlayer())
+    payload = '\n'.join(lines)
+    start = time.perf_counter()
+    runner.handle_messages(payload)
+    elapsed = time.perf_counter() - start
+    return {
+        'messages': len(lines),
+        'games': runner.get_game_count(),
+        'seconds': elapsed,
+        'messages_per_sec': len(lines) / elapsed,
+        'mean_us': elapsed / len(lines) * 1e6,
+    }
+
+
+def game_states(lines: list) -> list:
+    states = []
+    for line in lines:
+        decoded = json.loads(line)
+        if decoded['type'] == 9:
+            states.append(decoded['message'])
+    return states
+
+
+def bench_from_message(states: list, repeat: int) -> dict:
+    return summarize(time_per_call(RoundStateClient.from_message, states, repeat))
+
+
+def bench_update(states: list, repeat: int) -> dict:
+    state = RoundStateClient.from_message(states[0])
+    return summarize(time_per_call(state.update, states, repeat))
+
+
+def bench_get_action(lines: list, repeat: int) -> dict:
+    """get_action latency per street, with a cold equity cache so every call does the full work."""
+    player = SimplePlayer()
+    player.set_id(HERO_ID)
+    hand = None
+    decisions = []
+    for line in lines:
+        decoded = json.loads(line)
+        if decoded['type'] == 2:
+            hand = decoded['message']['hands']
+        elif decoded['type'] == 9 and decoded['message']['current_player'] == [HERO_ID]:
+            decisions.append((hand, RoundStateClient.from_message(decoded['message'])))
+
+    histograms = {}
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for hand, state in decisions:
+            player.on_start(10000, hand, 10, 2, 1, [1, 2])
+            default_calculator.clear()
+            start = clock()
+            player.get_action(state, 10000)
+            histograms.setdefault(state.round, LatencyHistogram()).record(clock() - start)
+    return {street: summarize(histogram) for street, histogram in histograms.items()}
+
+
+def bench_card_from_string(repeat: int) -> dict:
+    player = SimplePlayer()
+    spellings = [repr(card) for card in CARDS] + [str(card) for card in CARDS]
+    return summarize(time_per_call(player.card_from_string, spellings, repeat))
+
+
+def bench_has_top_pair_or_better(lines: list, repeat: int) -> dict:
+    player = SimplePlayer()
+    spots = []
+    hand = None
+    for line in lines:
+        decoded = json.loads(line)
+        if decoded['type'] == 2:
+            hand = [player.card_from_string(card) for card in decoded['message']['hands']]
+        elif decoded['type'] == 9 and decoded['message']['community_cards']:
+            spots.append((hand, decoded['message']['community_cards']))
+    return summarize(time_per_call(lambda spot: player.has_top_pair_or_better(*spot), spots, repeat))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(games: int, repeat: int, seed: int) -> dict:
+    lines = build_corpus(games, seed=seed)
+    states = game_states(lines)
+    return {
+        'commit': git_commit(),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'corpus': {'games': games, 'messages': len(lines), 'seed': seed},
+        'benchmarks': {
+            'handle_messages': bench_handle_messages(lines),
+            'round_state_from_message': bench_from_message(states, repeat),
+            'round_state_update': bench_update(states, repeat),
+            'get_action': bench_get_action(lines[:len(lines) // 10 or len(lines)], 1),
+            'card_from_string': bench_card_from_string(repeat * 20),
+            'has_top_pair_or_better': bench_has_top_pair_or_better(lines, repeat),
+        },
+    }
+
+
+def flatten(benchmarks: dict, prefix: str = '') -> dict:
+    """Map of 'benchmark.street' to mean microseconds per operation."""
+    means = {}
+    for name, result in benchmarks.items():
+        if 'mean_us' in result:
+            means[prefix + name] = result['mean_us']
+        else:
+            means.update(flatten(result, f"{prefix}{name}."))
+    return means
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """Benchmarks whose mean got slower than the baseline by more than the threshold."""
+    current = flatten(results['benchmarks'])
+    previous = flatten(baseline['benchmarks'])
+    regressions = []
+    for name, mean in sorted(current.items()):
+        if name in previous and previous[name] > 0 and mean / previous[name] > REGRESSION_THRESHOLD:
+            regressions.append((name, previous[name], mean))
+    return regressions
+
+
+def main(output: str, baseline_path: str, games: int, repeat: int, seed: int) -> int:
+    logging.disable(logging.CRITICAL)
+    results = run(games, repeat, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+
+    for name, mean in flatten(results['benchmarks']).items():
+        print(f"{name:<36} {mean:10.2f} us")
+    print(f"Results written to {output}")
+
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.2f} us -> {after:.2f} us ({after / before:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Client hot path benchmarks")
+    parser.add_argument('-o', '--output', type=str, default=DEFAULT_OUTPUT, help='JSON results file')
+    parser.add_argument('--baseline', type=str, default=None, help='Earlier results file to compare against')
+    parser.add_argument('-g', '--games', type=int, default=1000, help='Games in the synthetic corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+    parser.add_argument('--quick', action='store_true', help='Small corpus, for a smoke run')
+    args = parser.parse_args()
+    if args.quick:
+        args.games, args.repeat = 100, 1
+    sys.exit(main(args.output, args.baseline, args.games, args.repeat, args.seed))
@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 
@@ -29,6 +30,18 @@ class Bot(ABC):
         """ Called when it is the player's turn to act. """
         pass
 
+    def observe(self, round_state: RoundStateClient) -> None:
+        """ Optional. Called with every game state received, including the ones between the player's turns. """
+        pass
+
+    def ponder(self, round_state: RoundStateClient, remaining_chips: int, cancel: threading.Event) -> None:
+        """ Optional. Called in a background thread while another player is to act; stop once cancel is set. """
+        pass
+
+    def interrupt(self) -> None:
+        """ Optional. Called from another thread once get_action has missed its deadline; its result will be discarded, so it may stop early. """
+        pass
+
     @abstractmethod
     def on_end_round(self, round_state: RoundStateClient, remaining_chips: int) -> None:
         """ Called at the end of each round. """
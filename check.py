@@ -1,8 +1,27 @@
 import os
+import numpy as np
 from config import RESULT_FILE
+from results_store import load_results, read_session_marker
+
+def store_total():
+    """Total score of the run that wrote the result file, from the results store; None if it did not use the store."""
+    session = read_session_marker(RESULT_FILE)
+    if session is None:
+        return None
+    table = load_results()
+    games = table.select(table.session == session)
+    if not len(games):
+        return None
+    # Same as Runner.total_points, the sum of the scores truncated to int
+    return int(np.trunc(games.score).sum())
 
 def extract_score():
-    """Extract and print the average score from the game result file."""
+    """Extract and print the total score, from the results store or else the game result file."""
+    total = store_total()
+    if total is not None:
+        print(total)
+        return
+
     if not os.path.exists(RESULT_FILE):
         print("0")
         return
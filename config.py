@@ -16,10 +16,40 @@ os.makedirs(BASE_PATH, exist_ok=True)
 # Network configuration
 DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 5000
+ACTION_TIMEOUT = 2.0  # Seconds a bot may think before AsyncRunner sends a fallback action
+PONDER_CANCEL_TIMEOUT = 0.05  # Seconds to wait for background pondering to stop when it is our turn
 
 START_MONEY = 10000
+BLIND_AMOUNT = 10
 RESULT_FILE = os.path.join(BASE_PATH, 'game_result.log')
+SWEEP_RESULTS_FILE = os.path.join(BASE_PATH, 'sweep_results.csv')
+
+# Structured game results: JSONL log of recent games, compacted into a columnar file
+RESULTS_LOG_FILE = os.path.join(BASE_PATH, 'game_results.jsonl')
+RESULTS_COLUMNS_FILE = os.path.join(BASE_PATH, 'game_results.npz')
+RESULTS_FLUSH_GAMES = 100  # Games buffered before the JSONL log is written
+RESULTS_COMPACT_GAMES = 10000  # Games logged before closing a writer folds the log into the columnar file
+
+# Sequential stopping of continuous simulations (--sprt-delta)
+SPRT_ALPHA = 0.05  # Chance of calling a bot better or worse when it is even
+SPRT_BETA = 0.05  # Chance of calling a real difference of delta negligible
+SPRT_MIN_GAMES = 30  # Games before the test may stop the run
 
 # Logging configuration
 CLIENT_LOG_FILE = os.path.join(BASE_PATH, 'poker_client.log')
-GAMEID_LOG_FILE = os.path.join(BASE_PATH, 'gameid.log')
\ No newline at end of file
+GAMEID_LOG_FILE = os.path.join(BASE_PATH, 'gameid.log')
+LOG_RATE_LIMIT = 5.0  # Records per second per call site below WARNING with --fast-logging
+
+# Metrics export, written at the end of every game
+METRICS_PROM_FILE = os.path.join(BASE_PATH, 'client_metrics.prom')
+METRICS_JSON_FILE = os.path.join(BASE_PATH, 'client_metrics.json')
+
+# Opponent statistics, kept across sessions
+OPPONENT_DB_FILE = os.path.join(BASE_PATH, 'opponent_stats.db')
+
+# Equity configuration
+EQUITY_SAMPLES = 1000  # Monte Carlo rollouts per equity query
+EQUITY_BATCH_SIZE = 100  # Rollouts between two time budget checks
+EQUITY_CACHE_SIZE = 4096  # Cached (hand, board, opponents) results
+RANGE_MAX_RUNOUTS = 200  # Board runouts enumerated per range equity query, sampled beyond that
+PREFLOP_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'preflop_equity.bin')
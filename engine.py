@@ -0,0 +1,429 @@
+import argparse
+import logging
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import eval7
+
+from bot import Bot
+from config import START_MONEY, BLIND_AMOUNT
+from type.cards import CARDS
+from type.poker_action import PokerAction, PokerRound
+from type.round_state import RoundStateClient
+
+# Deck in a fixed order so a seeded shuffle always produces the same deal
+FULL_DECK = list(CARDS)
+
+# Number of community cards visible on each street
+BOARD_SIZE = {
+    PokerRound.PREFLOP: 0,
+    PokerRound.FLOP: 3,
+    PokerRound.TURN: 4,
+    PokerRound.RIVER: 5,
+}
+
+
+def card_to_message(card: eval7.Card) -> str:
+    """Format a card the way the server sends it, e.g. 'Card("9s")'."""
+    return repr(card)
+
+
+class LocalEngine:
+    """
+    In-process poker engine that deals, posts blinds, settles side pots and
+    calls the Bot callbacks directly, without a server or socket.
+    """
+    def __init__(self, bots: Sequence[Bot], starting_chips: int = START_MONEY, blind_amount: int = BLIND_AMOUNT, seed: Optional[int] = None) -> None:
+        """
+        Initialize the engine with the bots that take part in every game.
+
+        Args:
+            bots: Bot instances in seat order (two for heads-up)
+            starting_chips: Stack every player starts each game with
+            blind_amount: Big blind amount, the small blind is half of it
+            seed: Seed for the deck shuffle, None for a random seed
+        """
+        if len(bots) < 2:
+            raise ValueError("LocalEngine needs at least two bots")
+        self.bots = list(bots)
+        self.player_ids = list(range(1, len(self.bots) + 1))
+        self.bot_by_id = dict(zip(self.player_ids, self.bots))
+        for player_id, bot in self.bot_by_id.items():
+            bot.set_id(player_id)
+
+        self.starting_chips = starting_chips
+        self.blind_amount = blind_amount
+        self.rng = random.Random(seed)
+        self.logger = logging.getLogger('LocalEngine')
+
+        # Multi-game support
+        self.game_count = 0
+        self.total_scores = {player_id: 0 for player_id in self.player_ids}
+        self.button = 0  # Seat index of the dealer button, moves every game
+
+        # Per-game state
+        self.stacks: Dict[int, int] = {}
+        self.bets: Dict[int, int] = {}
+        self.contributions: Dict[int, int] = {}
+        self.actions: Dict[int, str] = {}
+        self.folded = set()
+        self.all_in = set()
+        self.hands: Dict[int, List[eval7.Card]] = {}
+        self.board: List[eval7.Card] = []
+        self.street = PokerRound.PREFLOP
+        self.current_bet = 0
+        self.min_raise = 0
+
+    def get_total_scores(self) -> Dict[int, int]:
+        """
+        Get the total score of every player across all games.
+
+        Returns:
+            Dict[int, int]: Player ID to cumulative chip delta
+        """
+        return dict(self.total_scores)
+
+    def get_game_count(self) -> int:
+        """
+        Get the number of games played.
+
+        Returns:
+            int: Number of games played
+        """
+        return self.game_count
+
+    def run(self, num_games: int) -> Dict[int, int]:
+        """
+        Play several games in a row, moving the button after each one.
+
+        Args:
+            num_games: Number of games to play
+
+        Returns:
+            Dict[int, int]: Player ID to cumulative chip delta
+        """
+        for _ in range(num_games):
+            self.play_game()
+        return self.get_total_scores()
+
+    def run_duplicate(self, num_deals: int) -> List[Dict[int, int]]:
+        """
+        Play every deal once per seat rotation (duplicate poker).
+
+        The same deck is replayed while the button moves round the table, so
+        each player holds every seat's cards once and card luck cancels out
+        of the deal's total.
+
+        Args:
+            num_deals: Number of distinct deals, each played once per player
+
+        Returns:
+            List[Dict[int, int]]: Player ID to chip delta summed over the rotations, per deal
+        """
+        deals = []
+        for _ in range(num_deals):
+            deck = FULL_DECK[:]
+            self.rng.shuffle(deck)
+            totals = {player_id: 0 for player_id in self.player_ids}
+            for _ in self.player_ids:
+                for player_id, score in self.play_game(deck).items():
+                    totals[player_id] += score
+            deals.append(totals)
+        return deals
+
+    def play_game(self, deck: Optional[List[eval7.Card]] = None) -> Dict[int, int]:
+        """
+        Play a single game (one hand) from the deal to the showdown.
+
+        Args:
+            deck: Cards to deal from, top of the deck first. A freshly
+                shuffled deck is used when not given.
+
+        Returns:
+            Dict[int, int]: Player ID to chip delta for this game
+        """
+        if deck is None:
+            deck = FULL_DECK[:]
+            self.rng.shuffle(deck)
+        else:
+            deck = list(deck)
+
+        # Seat order starting from the button
+        seats = self.player_ids[self.button:] + self.player_ids[:self.button]
+        if len(seats) == 2:
+            small_blind_id, big_blind_id = seats[0], seats[1]
+        else:
+            small_blind_id, big_blind_id = seats[1], seats[2]
+
+        self._reset_game()
+        cards = iter(deck)
+        for player_id in seats:
+            self.hands[player_id] = [next(cards), next(cards)]
+        full_board = [next(cards) for _ in range(5)]
+
+        for player_id, bot in self.bot_by_id.items():
+            hand = [card_to_message(card) for card in self.hands[player_id]]
+            self._safe_call(bot.on_start, self.stacks[player_id], hand, self.blind_amount, big_blind_id, small_blind_id, list(self.player_ids))
+
+        # Blinds are posted as raises, the same way Runner posts them
+        self._put_chips(small_blind_id, self.blind_amount // 2)
+        self._put_chips(big_blind_id, self.blind_amount)
+        self.actions[small_blind_id] = PokerAction.RAISE.name
+        self.actions[big_blind_id] = PokerAction.RAISE.name
+        self.current_bet = max(self.bets.values())
+
+        for street in PokerRound:
+            self.street = street
+            self.board = full_board[:BOARD_SIZE[street]]
+            if street != PokerRound.PREFLOP:
+                self._reset_street()
+                first = seats[1]
+            else:
+                # Heads-up the button is the small blind and acts first preflop
+                first = seats[0] if len(seats) == 2 else seats[3 % len(seats)]
+
+            state = self._round_state()
+            for player_id, bot in self.bot_by_id.items():
+                self._safe_call(bot.on_round_start, state, self.stacks[player_id])
+
+            self._betting_round(seats, first)
+
+            state = self._round_state()
+            for player_id, bot in self.bot_by_id.items():
+                self._safe_call(bot.on_end_round, state, self.stacks[player_id])
+
+            if len(self._live_players()) == 1:
+                break
+
+        if len(self._live_players()) > 1:
+            # Deal out the rest of the board for a showdown after all-ins
+            self.board = full_board
+        state = self._round_state()
+        scores = self._settle(seats)
+
+        showdown = len(self._live_players()) > 1
+        active_players_hands = {
+            str(player_id): [card_to_message(card) for card in self.hands[player_id]]
+            for player_id in self._live_players()
+        } if showdown else {}
+        all_scores = {str(player_id): score for player_id, score in scores.items()}
+        for player_id, bot in self.bot_by_id.items():
+            self._safe_call(bot.on_end_game, state, scores[player_id], dict(all_scores), dict(active_players_hands))
+
+        for player_id, score in scores.items():
+            self.total_scores[player_id] += score
+        self.game_count += 1
+        self.button = (self.button + 1) % len(self.player_ids)
+        self.logger.debug("Game #%s ended with scores: %s", self.game_count, scores)
+        return scores
+
+    def _reset_game(self) -> None:
+        """Reset per-game state before dealing."""
+        self.stacks = {player_id: self.starting_chips for player_id in self.player_ids}
+        self.bets = {player_id: 0 for player_id in self.player_ids}
+        self.contributions = {player_id: 0 for player_id in self.player_ids}
+        self.actions = {player_id: "" for player_id in self.player_ids}
+        self.folded = set()
+        self.all_in = set()
+        self.hands = {}
+        self.board = []
+        self.current_bet = 0
+        self.min_raise = self.blind_amount
+
+    def _reset_street(self) -> None:
+        """Clear bets and actions at the start of a new street."""
+        for player_id in self.player_ids:
+            self.bets[player_id] = 0
+            if player_id not in self.folded and player_id not in self.all_in:
+                self.actions[player_id] = ""
+        self.current_bet = 0
+        self.min_raise = self.blind_amount
+
+    def _live_players(self) -> List[int]:
+        """Players who have not folded."""
+        return [player_id for player_id in self.player_ids if player_id not in self.folded]
+
+    def _can_act(self, player_id: int) -> bool:
+        return player_id not in self.folded and player_id not in self.all_in
+
+    def _put_chips(self, player_id: int, amount: int) -> int:
+        """Move chips from a stack into the pot, capped at the stack."""
+        amount = min(amount, self.stacks[player_id])
+        self.stacks[player_id] -= amount
+        self.bets[player_id] += amount
+        self.contributions[player_id] += amount
+        if self.stacks[player_id] == 0:
+            self.all_in.add(player_id)
+        return amount
+
+    def _betting_round(self, seats: List[int], first: int) -> None:
+        """Ask players for actions until every live player has matched the bet."""
+        pending = [player_id for player_id in seats if self._can_act(player_id)]
+        if len(pending) == 1 and self.bets[pending[0]] >= self.current_bet:
+            return
+        pending = set(pending)
+
+        index = seats.index(first)
+        while pending and len(self._live_players()) > 1:
+            player_id = seats[index % len(seats)]
+            index += 1
+            if player_id not in pending:
+                continue
+            pending.discard(player_id)
+
+            previous_bet = self.current_bet
+            action, amount = self._request_action(player_id)
+            self._apply_action(player_id, action, amount)
+            state = self._round_state()
+            for bot in self.bot_by_id.values():
+                self._safe_call(bot.observe, state)
+            if self.current_bet > previous_bet:
+                # A raise re-opens the action for everyone else
+                pending = {other for other in seats if other != player_id and self._can_act(other)}
+
+    def _request_action(self, player_id: int) -> Tuple[PokerAction, int]:
+        """Ask a bot for its action, folding it if the bot raises an error."""
+        state = self._round_state(player_id)
+        try:
+            return self.bot_by_id[player_id].get_action(state, self.stacks[player_id])
+        except Exception as e:
+            self.logger.exception("Bot %s failed to act: %s", player_id, e)
+            return PokerAction.FOLD, 0
+
+    def _apply_action(self, player_id: int, action: PokerAction, amount: int) -> None:
+        """
+        Apply an action with the same conventions Runner uses: RAISE and
+        CALL amounts are the chips added by this action. Invalid actions
+        are punished with a fold.
+        """
+        stack = self.stacks[player_id]
+        to_call = self.current_bet - self.bets[player_id]
+
+        if not isinstance(action, PokerAction) or amount is None or amount < 0:
+            self.logger.error("Invalid action from bot %s: %s, %s", player_id, action, amount)
+            action = PokerAction.FOLD
+
+        if action == PokerAction.RAISE and amount >= stack:
+            action = PokerAction.ALL_IN
+        elif action == PokerAction.RAISE and self.bets[player_id] + amount <= self.current_bet:
+            if self.bets[player_id] + amount < self.current_bet:
+                self.logger.error("Invalid raise from bot %s: %s does not reach %s", player_id, amount, self.current_bet)
+                action = PokerAction.FOLD
+            else:
+                action = PokerAction.CALL
+        elif action == PokerAction.CHECK and to_call > 0:
+            self.logger.error("Invalid check from bot %s: %s to call", player_id, to_call)
+            action = PokerAction.FOLD
+        elif action == PokerAction.CALL and to_call == 0:
+            action = PokerAction.CHECK
+
+        if action == PokerAction.FOLD:
+            self.folded.add(player_id)
+        elif action == PokerAction.CALL:
+            self._put_chips(player_id, to_call)
+        elif action == PokerAction.RAISE:
+            # Raises below the minimum are topped up to a full raise
+            raise_to = max(self.bets[player_id] + amount, self.current_bet + self.min_raise)
+            self._put_chips(player_id, raise_to - self.bets[player_id])
+        elif action == PokerAction.ALL_IN:
+            self._put_chips(player_id, stack)
+
+        if self.bets[player_id] > self.current_bet:
+            self.min_raise = max(self.min_raise, self.bets[player_id] - self.current_bet)
+            self.current_bet = self.bets[player_id]
+        self.actions[player_id] = action.name
+
+    def _side_pots(self) -> List[Dict[str, object]]:
+        """Split the chips committed so far into a main pot and side pots."""
+        live = self._live_players()
+        levels = sorted({self.contributions[player_id] for player_id in live})
+        pots: List[Dict[str, object]] = []
+        previous = 0
+        for level in levels:
+            amount = sum(max(0, min(chips, level) - previous) for chips in self.contributions.values())
+            eligible = [player_id for player_id in live if self.contributions[player_id] >= level]
+            if amount:
+                if pots and pots[-1]['eligible_players'] == eligible:
+                    pots[-1]['amount'] += amount
+                else:
+                    pots.append({'amount': amount, 'eligible_players': eligible})
+            previous = level
+        # Folded chips above the highest live contribution go to the last pot
+        extra = sum(max(0, chips - previous) for chips in self.contributions.values())
+        if extra and pots:
+            pots[-1]['amount'] += extra
+        return pots
+
+    def _settle(self, seats: List[int]) -> Dict[int, int]:
+        """Award every pot and return each player's chip delta."""
+        live = self._live_players()
+        strengths = {}
+        if len(live) > 1:
+            strengths = {player_id: eval7.evaluate(self.hands[player_id] + self.board) for player_id in live}
+
+        for pot in self._side_pots():
+            eligible = pot['eligible_players']
+            if strengths:
+                best = max(strengths[player_id] for player_id in eligible)
+                winners = [player_id for player_id in seats if player_id in eligible and strengths[player_id] == best]
+            else:
+                winners = [player_id for player_id in seats if player_id in eligible]
+            share, remainder = divmod(pot['amount'], len(winners))
+            for player_id in winners:
+                self.stacks[player_id] += share
+            # Odd chips go to the first winner after the button
+            self.stacks[winners[0]] += remainder
+
+        for player_id in self.player_ids:
+            self.contributions[player_id] = 0
+            self.bets[player_id] = 0
+        return {player_id: self.stacks[player_id] - self.starting_chips for player_id in self.player_ids}
+
+    def _round_state(self, player_id: Optional[int] = None) -> RoundStateClient:
+        """Build the RoundStateClient the server would send for the current state."""
+        side_pots = self._side_pots()
+        message = {
+            'round_num': self.street.value,
+            'round': self.street.name,
+            'community_cards': [card_to_message(card) for card in self.board],
+            'pot': sum(self.contributions.values()),
+            'current_player': [player_id] if player_id is not None else [],
+            'current_bet': self.current_bet,
+            'min_raise': self.min_raise,
+            'max_raise': self.stacks[player_id] if player_id is not None else 0,
+            'player_bets': {str(pid): bet for pid, bet in self.bets.items()},
+            'player_actions': {str(pid): action for pid, action in self.actions.items()},
+            'player_money': {str(pid): money for pid, money in self.stacks.items()},
+            'side_pots': side_pots if len(side_pots) > 1 else [],
+        }
+        return RoundStateClient.from_message(message)
+
+    def _safe_call(self, callback, *args) -> None:
+        """Call a bot callback, logging instead of aborting the game on errors."""
+        try:
+            callback(*args)
+        except Exception as e:
+            self.logger.exception("Error in bot callback %s: %s", callback.__name__, e)
+
+
+def main(num_games: int, seed: Optional[int] = None, duplicate: bool = False) -> None:
+    """Play SimplePlayer against itself and print the final scores."""
+    from player import SimplePlayer
+
+    engine = LocalEngine([SimplePlayer(), SimplePlayer()], seed=seed)
+    if duplicate:
+        engine.run_duplicate(num_games // 2)
+        totals = engine.get_total_scores()
+    else:
+        totals = engine.run(num_games)
+    print(f"Games played: {engine.get_game_count()}")
+    print(f"Total scores: {totals}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Poker Engine")
+    parser.add_argument('-g', '--games', type=int, default=100, help='Number of games to play')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the deck shuffle')
+    parser.add_argument('--duplicate', action='store_true', help='Play every deal twice with the seats swapped')
+    args = parser.parse_args()
+    main(args.games, args.seed, args.duplicate)
@@ -0,0 +1,325 @@
+"""
+Equity of a hand against opponent hands.
+
+Monte Carlo rollouts estimate equity on any street; on the turn and river
+the unknown cards are few enough to enumerate every outcome exactly. Results
+are cached by (hand, board, opponent count), so repeated queries for the
+same spot within a street cost a dictionary lookup. Only complete runs are
+cached, and an estimate is served only to queries asking for at most as
+many rollouts as it was made of.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations
+from typing import Iterable, Optional, Sequence, Tuple
+
+import eval7
+
+from config import EQUITY_SAMPLES, EQUITY_BATCH_SIZE, EQUITY_CACHE_SIZE
+from type.cards import CARDS
+
+FULL_DECK = list(CARDS)
+
+EquityKey = Tuple[Tuple[int, ...], Tuple[int, ...], int]
+# Opponent hole cards with their relative weight
+WeightedHand = Tuple[Sequence[eval7.Card], float]
+
+# Opponent count slot of the cache key for exact heads-up results
+EXACT_KEY = -1
+# Opponent hands enumerated between two checks of the thresholds and the cancel event
+STOP_CHECK_HANDS = 128
+
+
+def cards_key(cards: Sequence[eval7.Card]) -> Tuple[int, ...]:
+    """Order-independent, hashable key for a group of cards."""
+    return tuple(sorted(card.mask for card in cards))
+
+
+class EquityCalculator:
+    """
+    Estimates the probability that a hand wins at showdown against N random
+    opponent hands, by batched Monte Carlo rollouts of the unknown cards.
+
+    Safe to share between the decision thread and the ponder thread: the
+    cache is guarded by a lock and each thread draws from its own RNG.
+    """
+    def __init__(self, samples: int = EQUITY_SAMPLES, batch_size: int = EQUITY_BATCH_SIZE, cache_size: int = EQUITY_CACHE_SIZE, seed: Optional[int] = None) -> None:
+        """
+        Initialize the calculator.
+
+        Args:
+            samples: Default number of rollouts per query
+            batch_size: Rollouts run between two time budget checks
+            cache_size: Maximum number of cached results
+            seed: Seed for the rollout RNG, None for a random seed
+        """
+        self.samples = samples
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.seed = seed
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # Equity and the rollouts it was estimated from, 0 for exact results
+        self.cache: "OrderedDict[EquityKey, Tuple[float, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def equity(self, hand: Sequence[eval7.Card], board: Sequence[eval7.Card] = (), num_opponents: int = 1, samples: Optional[int] = None, time_budget: Optional[float] = None, cancel: Optional[threading.Event] = None) -> float:
+        """
+        Get the equity of a hand, from the cache when possible.
+
+        Args:
+            hand: The two hole cards
+            board: Community cards dealt so far (0 to 5)
+            num_opponents: Number of opponents holding random hands
+            samples: Rollout budget, defaults to the calculator's budget
+            time_budget: Optional limit in seconds, checked between batches
+            cancel: Optional event that stops the rollouts between batches
+
+        Returns:
+            float: Share of the pot won on average, between 0 and 1
+        """
+        samples = samples or self.samples
+        key = (cards_key(hand), cards_key(board), num_opponents)
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None and cached[1] >= samples:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+        result, played = self._rollouts(hand, board, num_opponents, samples, time_budget, cancel)
+        if played < samples:
+            # Cut short by the deadline or a cancel, less accurate than what later queries expect from the cache
+            return result
+        self._store(key, result, played)
+        return result
+
+    def simulate(self, hand: Sequence[eval7.Card], board: Sequence[eval7.Card], num_opponents: int, samples: int, time_budget: Optional[float] = None, cancel: Optional[threading.Event] = None) -> float:
+        """
+        Run rollouts without touching the cache.
+
+        Args:
+            hand: The two hole cards
+            board: Community cards dealt so far (0 to 5)
+            num_opponents: Number of opponents holding random hands
+            samples: Maximum number of rollouts
+            time_budget: Optional limit in seconds, checked between batches
+            cancel: Optional event that stops the rollouts between batches
+
+        Returns:
+            float: Share of the pot won on average, between 0 and 1
+        """
+        return self._rollouts(hand, board, num_opponents, samples, time_budget, cancel)[0]
+
+    def _rollouts(self, hand: Sequence[eval7.Card], board: Sequence[eval7.Card], num_opponents: int, samples: int, time_budget: Optional[float] = None, cancel: Optional[threading.Event] = None) -> Tuple[float, int]:
+        """Equity estimate and the number of rollouts actually played."""
+        if num_opponents < 1:
+            return 1.0, samples
+        hand = list(hand)
+        board = list(board)
+        dead = {card.mask for card in hand + board}
+        deck = [card for card in FULL_DECK if card.mask not in dead]
+        missing = 5 - len(board)
+        draw_size = missing + 2 * num_opponents
+
+        rng_sample = self._rng().sample
+        evaluate = eval7.evaluate
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        # On the river the hero's hand never changes between rollouts
+        river_score = evaluate(hand + board) if missing == 0 else None
+
+        won = 0.0
+        played = 0
+        while played < samples:
+            for _ in range(min(self.batch_size, samples - played)):
+                draw = rng_sample(deck, draw_size)
+                full_board = board + draw[:missing]
+                hero = river_score if river_score is not None else evaluate(hand + full_board)
+                best = 0
+                ties = 0
+                for i in range(missing, draw_size, 2):
+                    score = evaluate(draw[i:i + 2] + full_board)
+                    if score > best:
+                        best, ties = score, 1
+                    elif score == best:
+                        ties += 1
+                if hero > best:
+                    won += 1.0
+                elif hero == best:
+                    won += 1.0 / (ties + 1)
+                played += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if cancel is not None and cancel.is_set():
+                break
+        return (won / played if played else 0.0), played
+
+    def exact(self, hand: Sequence[eval7.Card], board: Sequence[eval7.Card], opponent_range: Optional[Iterable[WeightedHand]] = None, thresholds: Sequence[float] = (), cancel: Optional[threading.Event] = None) -> float:
+        """
+        Get the exact equity against one opponent, from the cache when possible.
+
+        Only complete enumerations against a uniform range are cached.
+
+        Args:
+            hand: The two hole cards
+            board: Community cards, turn or river (4 or 5 cards)
+            opponent_range: Opponent hands with weights, every hand equally likely when None
+            thresholds: Decision thresholds, enumeration stops once the equity is known to be on one side of each
+            cancel: Optional event that stops the enumeration between runouts
+
+        Returns:
+            float: Share of the pot won on average, between 0 and 1
+        """
+        key = (cards_key(hand), cards_key(board), EXACT_KEY)
+        if opponent_range is None:
+            with self.lock:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.cache.move_to_end(key)
+                    self.hits += 1
+                    return cached[0]
+                # Only uniform queries can be answered from the cache, range queries are not counted
+                self.misses += 1
+        result, complete = enumerate_equity(hand, board, opponent_range, thresholds, cancel)
+        if complete and opponent_range is None:
+            self._store(key, result, 0)
+        return result
+
+    def _store(self, key: EquityKey, result: float, rollouts: int) -> None:
+        with self.lock:
+            self.cache[key] = (result, rollouts)
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def _rng(self) -> random.Random:
+        """RNG of the calling thread, every thread seeded alike."""
+        rng = getattr(self.local, 'rng', None)
+        if rng is None:
+            rng = self.local.rng = random.Random(self.seed)
+        return rng
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self.lock:
+            self.cache.clear()
+
+
+def enumerate_equity(hand: Sequence[eval7.Card], board: Sequence[eval7.Card], opponent_range: Optional[Iterable[WeightedHand]] = None, thresholds: Sequence[float] = (), cancel: Optional[threading.Event] = None) -> Tuple[float, bool]:
+    """
+    Enumerate every opponent hand and runout on the turn or river.
+
+    The enumeration runs one runout card at a time. Every STOP_CHECK_HANDS
+    opponent hands, also within a runout so that the single river runout
+    can stop early too, the equity is bounded by the outcomes seen so far,
+    and it stops once no threshold lies within the bounds or cancel is set.
+    The returned estimate always lies within the bounds, so it compares to
+    every threshold the same way the exact value would.
+
+    Cost with eval7.evaluate: about 1.5 ms on the river and 35 ms for a
+    full turn enumeration, about 990 and 44 * 990 showdowns. Thresholds
+    usually settle a turn decision well before the end, but a decision
+    close to a threshold pays the full cost, so callers on the action
+    path should pass thresholds and rely on the cache warmed by pondering.
+
+    Args:
+        hand: The two hole cards
+        board: Community cards, turn or river (4 or 5 cards)
+        opponent_range: Opponent hands with weights, every hand equally likely when None
+        thresholds: Decision thresholds that allow stopping early
+        cancel: Optional event that stops the enumeration between runouts
+
+    Returns:
+        Tuple[float, bool]: Equity, and whether every outcome was enumerated
+    """
+    hand = list(hand)
+    board = list(board)
+    if len(board) not in (4, 5):
+        raise ValueError(f"Exact equity needs the turn or river, got {len(board)} board cards")
+    dead = {card.mask for card in hand + board}
+    deck = [card for card in FULL_DECK if card.mask not in dead]
+    if opponent_range is None:
+        hands = [(list(pair), 1.0) for pair in combinations(deck, 2)]
+    else:
+        hands = [(list(cards), weight) for cards, weight in opponent_range
+                 if weight > 0 and not any(card.mask in dead for card in cards)]
+    if not hands:
+        return 0.0, True
+
+    # Weight of the opponent hands each runout card makes impossible
+    blocked = {}
+    for cards, weight in hands:
+        for card in cards:
+            blocked[card.mask] = blocked.get(card.mask, 0.0) + weight
+    range_weight = sum(weight for _, weight in hands)
+    runouts = deck if len(board) == 4 else [None]
+    total = sum(range_weight - blocked.get(card.mask, 0.0) for card in runouts) if len(board) == 4 else range_weight
+
+    evaluate = eval7.evaluate
+    won = 0.0
+    seen = 0.0
+    may_stop = bool(thresholds) or cancel is not None
+    countdown = STOP_CHECK_HANDS
+    for runout in runouts:
+        if runout is None:
+            full_board = board
+            runout_mask = 0
+        else:
+            full_board = board + [runout]
+            runout_mask = runout.mask
+        hero = evaluate(hand + full_board)
+        for cards, weight in hands:
+            if runout_mask and (cards[0].mask == runout_mask or cards[1].mask == runout_mask):
+                continue
+            opponent = evaluate(cards + full_board)
+            if hero > opponent:
+                won += weight
+            elif hero == opponent:
+                won += weight / 2
+            seen += weight
+            countdown -= 1
+            if may_stop and not countdown:
+                countdown = STOP_CHECK_HANDS
+                if seen < total and can_stop(won, seen, total, thresholds, cancel):
+                    return won / seen, False
+    return won / total if total else 0.0, True
+
+
+def can_stop(won: float, seen: float, total: float, thresholds: Sequence[float], cancel: Optional[threading.Event]) -> bool:
+    """
+    Whether an enumeration is cancelled, or settled on one side of every threshold.
+
+    Args:
+        won: Pot share won over the outcomes seen so far
+        seen: Weight of the outcomes seen so far
+        total: Weight of every outcome
+        thresholds: Decision thresholds
+        cancel: Optional event that stops the enumeration
+
+    Returns:
+        bool: True once the remaining outcomes cannot move the equity across a threshold
+    """
+    if cancel is not None and cancel.is_set():
+        return True
+    if not thresholds:
+        return False
+    lower = won / total
+    upper = (won + total - seen) / total
+    return all(threshold < lower or threshold > upper for threshold in thresholds)
+
+
+# Shared calculator so every caller in a process benefits from the cache
+default_calculator = EquityCalculator()
+
+
+def estimate_equity(hand: Sequence[eval7.Card], board: Sequence[eval7.Card] = (), num_opponents: int = 1, samples: Optional[int] = None, time_budget: Optional[float] = None, cancel: Optional[threading.Event] = None) -> float:
+    """Estimate equity with the shared, cached calculator."""
+    return default_calculator.equity(hand, board, num_opponents, samples, time_budget, cancel)
+
+
+def exact_equity(hand: Sequence[eval7.Card], board: Sequence[eval7.Card], opponent_range: Optional[Iterable[WeightedHand]] = None, thresholds: Sequence[float] = (), cancel: Optional[threading.Event] = None) -> float:
+    """Exact heads-up equity on the turn or river with the shared, cached calculator."""
+    return default_calculator.exact(hand, board, opponent_range, thresholds, cancel)
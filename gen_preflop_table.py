@@ -0,0 +1,49 @@
+# python gen_preflop_table.py
+# Regenerates the preflop equity table loaded by preflop_table.py
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from batch_eval import rollout_equity
+from config import PREFLOP_TABLE_FILE
+from equity import EquityCalculator
+from preflop_table import MAX_OPPONENTS, NUM_CLASSES, class_representative, hand_class_name, write_table
+
+
+def class_equities(index: int, samples: int, seed: int, batch: bool = False) -> List[float]:
+    """Equities of one hand class against 1 to MAX_OPPONENTS opponents."""
+    hand = class_representative(index)
+    if batch:
+        return [rollout_equity(hand, [], num_opponents, samples, seed=seed + index) for num_opponents in range(1, MAX_OPPONENTS + 1)]
+    calculator = EquityCalculator(seed=seed + index)
+    return [calculator.simulate(hand, [], num_opponents, samples) for num_opponents in range(1, MAX_OPPONENTS + 1)]
+
+
+def main(output: str, samples: int, seed: int, workers: int = None, batch: bool = False) -> None:
+    """Simulate every hand class and write the table."""
+    start = time.perf_counter()
+    indices = list(range(NUM_CLASSES))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        columns = list(executor.map(class_equities, indices, [samples] * NUM_CLASSES, [seed] * NUM_CLASSES, [batch] * NUM_CLASSES))
+
+    # Rows per opponent count, columns per hand class
+    equities = [[columns[index][opponents] for index in indices] for opponents in range(MAX_OPPONENTS)]
+    write_table(output, equities)
+
+    best = max(indices, key=lambda index: columns[index][0])
+    worst = min(indices, key=lambda index: columns[index][0])
+    print(f"Wrote {output} in {time.perf_counter() - start:.1f}s")
+    print(f"Heads-up best: {hand_class_name(best)} {columns[best][0]:.3f}, worst: {hand_class_name(worst)} {columns[worst][0]:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preflop Equity Table Generator")
+    parser.add_argument('-o', '--output', type=str, default=PREFLOP_TABLE_FILE, help='Table file to write')
+    parser.add_argument('-n', '--samples', type=int, default=20000, help='Rollouts per hand class and opponent count')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed for the rollouts')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--batch', action='store_true', help='Evaluate the rollouts with the NumPy batch evaluator')
+    args = parser.parse_args()
+    main(args.output, args.samples, args.seed, args.workers, args.batch)
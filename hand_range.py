@@ -0,0 +1,297 @@
+"""
+Weighted hand ranges over the 1326 two-card combos, and their equity.
+
+A range is an array with one weight per combo, in the order of
+itertools.combinations over the batch_eval card indices. Combos that share
+a card with known cards (the board, our own hand, a combo of the other
+range) are masked out instead of removed, so every range keeps the same
+shape and ranges combine with plain array operations.
+
+Equity is taken over the runouts of the board: all of them when there are
+at most max_runouts (always on the turn and river), otherwise a random
+sample. Every combo is scored on every runout in one evaluate_batch call,
+or a few runouts per call when hero_equity may stop early.
+"""
+from itertools import combinations
+from math import comb
+import threading
+from typing import Iterable, List, Optional, Sequence
+
+import eval7
+import numpy as np
+
+from batch_eval import card_indices, draw_without_replacement, evaluate_batch, evaluate_hands
+from config import RANGE_MAX_RUNOUTS
+from equity import WeightedHand, can_stop
+from preflop_table import NUM_CLASSES, hand_class_index, hand_class_name
+from type.cards import CARDS
+
+NUM_CARDS = 52
+BOARD_CARDS = 5
+# Runouts scored between two checks of the thresholds and the cancel event
+STOP_CHECK_RUNOUTS = 4
+
+COMBOS = np.array(list(combinations(range(NUM_CARDS), 2)), dtype=np.int64)
+NUM_COMBOS = len(COMBOS)
+# Combo index per pair of card indices, in either order
+COMBO_INDEX = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.int64)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+# Combos holding each card, shape (52, 1326)
+CARD_COMBOS = np.zeros((NUM_CARDS, NUM_COMBOS), dtype=bool)
+CARD_COMBOS[COMBOS[:, 0], np.arange(NUM_COMBOS)] = True
+CARD_COMBOS[COMBOS[:, 1], np.arange(NUM_COMBOS)] = True
+# Starting-hand class (see preflop_table) of each combo
+COMBO_CLASS = np.array([hand_class_index((CARDS[first], CARDS[second])) for first, second in COMBOS], dtype=np.int64)
+CLASS_BY_NAME = {hand_class_name(index): index for index in range(NUM_CLASSES)}
+
+
+def combo_index(hand: Sequence[eval7.Card]) -> int:
+    """Index of a two-card hand among the 1326 combos."""
+    first, second = card_indices(hand)
+    index = COMBO_INDEX[first, second]
+    if index < 0:
+        raise ValueError(f"Not a two-card hand: {hand}")
+    return int(index)
+
+
+def blocked_combos(cards: Iterable[eval7.Card]) -> np.ndarray:
+    """Boolean mask of the combos holding any of the cards."""
+    indices = card_indices(cards)
+    if not len(indices):
+        return np.zeros(NUM_COMBOS, dtype=bool)
+    return CARD_COMBOS[indices].any(axis=0)
+
+
+class HandRange:
+    """Relative weights of the 1326 hole-card combos a player may hold."""
+    def __init__(self, weights: Optional[np.ndarray] = None) -> None:
+        """
+        Initialize the range.
+
+        Args:
+            weights: One non-negative weight per combo, every combo weighted 1 when None
+        """
+        if weights is None:
+            self.weights = np.ones(NUM_COMBOS)
+        else:
+            self.weights = np.array(weights, dtype=np.float64)
+            if self.weights.shape != (NUM_COMBOS,):
+                raise ValueError(f"Expected {NUM_COMBOS} weights, got shape {self.weights.shape}")
+
+    @classmethod
+    def empty(cls) -> 'HandRange':
+        return cls(np.zeros(NUM_COMBOS))
+
+    @classmethod
+    def from_hands(cls, hands: Iterable[Sequence[eval7.Card]], weight: float = 1.0) -> 'HandRange':
+        """Range holding only the given hands."""
+        hand_range = cls.empty()
+        for hand in hands:
+            hand_range.add(hand, weight)
+        return hand_range
+
+    @classmethod
+    def from_classes(cls, names: Iterable[str]) -> 'HandRange':
+        """
+        Range holding every combo of the named starting-hand classes.
+
+        Args:
+            names: Class names like 'QQ', 'AKs' or 'T9o'; 'AK' means both suited and offsuit
+        """
+        selected = np.zeros(NUM_CLASSES, dtype=bool)
+        for name in names:
+            variants = [name] if name in CLASS_BY_NAME else [name + 's', name + 'o']
+            for variant in variants:
+                if variant not in CLASS_BY_NAME:
+                    raise ValueError(f"Unknown hand class: {name}")
+                selected[CLASS_BY_NAME[variant]] = True
+        return cls(selected[COMBO_CLASS].astype(np.float64))
+
+    def add(self, hand: Sequence[eval7.Card], weight: float = 1.0) -> None:
+        self.weights[combo_index(hand)] += weight
+
+    def weight(self, hand: Sequence[eval7.Card]) -> float:
+        return float(self.weights[combo_index(hand)])
+
+    def without(self, dead_cards: Iterable[eval7.Card]) -> 'HandRange':
+        """Copy of the range with the combos holding any dead card removed."""
+        return HandRange(np.where(blocked_combos(dead_cards), 0.0, self.weights))
+
+    def total(self) -> float:
+        return float(self.weights.sum())
+
+    def normalized(self) -> 'HandRange':
+        """Copy of the range with weights summing to 1."""
+        total = self.total()
+        return HandRange(self.weights / total if total else self.weights)
+
+    def class_weights(self) -> np.ndarray:
+        """Total weight per starting-hand class, 169 entries."""
+        return np.bincount(COMBO_CLASS, weights=self.weights, minlength=NUM_CLASSES)
+
+    def weighted_hands(self) -> List[WeightedHand]:
+        """Combos with a weight, in the form equity.enumerate_equity takes."""
+        return [([CARDS[first], CARDS[second]], float(self.weights[index]))
+                for index, (first, second) in enumerate(COMBOS) if self.weights[index] > 0]
+
+    def __len__(self) -> int:
+        """Number of combos with a weight."""
+        return int(np.count_nonzero(self.weights))
+
+    def __repr__(self) -> str:
+        return f"HandRange(combos={len(self)}, total={self.total():.3f})"
+
+
+def board_runouts(board: np.ndarray, dead: np.ndarray, max_runouts: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Complete boards, all of them or a uniform sample of max_runouts.
+
+    Args:
+        board: Card indices dealt so far
+        dead: Card indices that cannot come, the board included
+
+    Returns:
+        np.ndarray: (runouts, 5) card indices
+    """
+    missing = BOARD_CARDS - len(board)
+    if missing == 0:
+        return board[None, :]
+    deck = np.setdiff1d(np.arange(NUM_CARDS), dead)
+    if comb(len(deck), missing) <= max_runouts:
+        draws = np.array(list(combinations(deck, missing)), dtype=np.int64)
+    else:
+        draws = draw_without_replacement(rng, deck, max_runouts, missing)
+    return np.concatenate([np.broadcast_to(board, (len(draws), len(board))), draws], axis=1)
+
+
+def combo_scores(boards: np.ndarray) -> np.ndarray:
+    """
+    Score every combo on every board.
+
+    Returns:
+        np.ndarray: (runouts, 1326) scores, -1 for combos sharing a card with the board
+    """
+    live = ~CARD_COMBOS[boards].any(axis=1)
+    runout, combo = np.nonzero(live)
+    scores = np.full(live.shape, -1, dtype=np.int64)
+    scores[runout, combo] = evaluate_batch(np.concatenate([COMBOS[combo], boards[runout]], axis=1))
+    return scores
+
+
+def hero_equity(hand: Sequence[eval7.Card], opponent_range: HandRange, board: Sequence[eval7.Card] = (), max_runouts: int = RANGE_MAX_RUNOUTS, seed: Optional[int] = None, thresholds: Sequence[float] = (), cancel: Optional[threading.Event] = None) -> float:
+    """
+    Equity of one hand against a weighted opponent range.
+
+    With thresholds or cancel, the runouts are scored STOP_CHECK_RUNOUTS at
+    a time and the equity is bounded after each group, the same way as
+    equity.enumerate_equity: it stops once no threshold lies within the
+    bounds, or cancel is set, with an estimate inside the bounds.
+
+    Args:
+        hand: The two hole cards
+        opponent_range: Opponent range, combos blocked by the hand or board are ignored
+        board: Community cards dealt so far (0 to 5)
+        max_runouts: Runouts enumerated before switching to a random sample
+        seed: Seed for the runout sample, None for a random seed
+        thresholds: Decision thresholds that allow stopping early
+        cancel: Optional event that stops the evaluation between runouts
+
+    Returns:
+        float: Share of the pot won on average, 0 if no opponent combo is possible
+    """
+    hand_indices = card_indices(hand)
+    board_indices = card_indices(board)
+    boards = board_runouts(board_indices, np.concatenate([hand_indices, board_indices]), max_runouts, np.random.default_rng(seed))
+    weights = np.where(CARD_COMBOS[hand_indices].any(axis=0), 0.0, opponent_range.weights)
+    # Opponent weight possible on each runout, known before any hand is scored
+    possible = np.where(CARD_COMBOS[boards].any(axis=1), 0.0, weights).sum(axis=1)
+    total = possible.sum()
+    if not total:
+        return 0.0
+
+    step = STOP_CHECK_RUNOUTS if thresholds or cancel is not None else len(boards)
+    won = 0.0
+    seen = 0.0
+    for start in range(0, len(boards), step):
+        group = boards[start:start + step]
+        hero = evaluate_hands(np.broadcast_to(hand_indices, (len(group), 2)), group)
+        scores = combo_scores(group)
+        live = np.where(scores >= 0, weights, 0.0)
+        won += (live * ((hero[:, None] > scores) + 0.5 * (hero[:, None] == scores))).sum()
+        seen += possible[start:start + step].sum()
+        if seen < total and can_stop(won, seen, total, thresholds, cancel):
+            return float(won / seen)
+    return float(won / total)
+
+
+def _combo_totals(opponent_range: HandRange, board: Sequence[eval7.Card], max_runouts: int, seed: Optional[int]):
+    """
+    Pot share won and opponent weight faced by every combo, summed over the runouts.
+
+    Opponent combos sharing a card with the combo are skipped. Per runout,
+    the combos are sorted by score once, and the opponent weight below each
+    score comes from cumulative sums; the weight of the opponent combos
+    holding one of the combo's cards is subtracted with per-card cumulative
+    sums, so no pair of combos is ever visited.
+    """
+    board_indices = card_indices(board)
+    boards = board_runouts(board_indices, board_indices, max_runouts, np.random.default_rng(seed))
+    scores = combo_scores(boards)
+    first, second = COMBOS[:, 0], COMBOS[:, 1]
+
+    won = np.zeros(NUM_COMBOS)
+    total = np.zeros(NUM_COMBOS)
+    for score in scores:
+        live = score >= 0
+        opponent = np.where(live, opponent_range.weights, 0.0)
+        order = np.argsort(score, kind='stable')
+        below = np.searchsorted(score[order], score, side='left')
+        at_or_below = np.searchsorted(score[order], score, side='right')
+        cumulative = np.concatenate([[0.0], np.cumsum(opponent[order])])
+        card_cumulative = np.concatenate([np.zeros((NUM_CARDS, 1)), np.cumsum(CARD_COMBOS[:, order] * opponent[order], axis=1)], axis=1)
+
+        # The combo itself holds both its cards, so it is subtracted twice wherever it is counted
+        beaten = cumulative[below] - card_cumulative[first, below] - card_cumulative[second, below]
+        not_beating = (cumulative[at_or_below] - card_cumulative[first, at_or_below] - card_cumulative[second, at_or_below]
+                       + opponent)
+        possible = cumulative[-1] - card_cumulative[first, -1] - card_cumulative[second, -1] + opponent
+        won += np.where(live, beaten + 0.5 * (not_beating - beaten), 0.0)
+        total += np.where(live, possible, 0.0)
+    return won, total
+
+
+def combo_equities(opponent_range: HandRange, board: Sequence[eval7.Card] = (), max_runouts: int = RANGE_MAX_RUNOUTS, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Equity of every combo against a weighted opponent range.
+
+    Args:
+        opponent_range: Opponent range
+        board: Community cards dealt so far (0 to 5)
+        max_runouts: Runouts enumerated before switching to a random sample
+        seed: Seed for the runout sample, None for a random seed
+
+    Returns:
+        np.ndarray: 1326 equities between 0 and 1, 0 for combos blocked by the board
+    """
+    won, total = _combo_totals(opponent_range, board, max_runouts, seed)
+    return np.divide(won, total, out=np.zeros(NUM_COMBOS), where=total > 0)
+
+
+def range_equity(hand_range: HandRange, opponent_range: HandRange, board: Sequence[eval7.Card] = (), max_runouts: int = RANGE_MAX_RUNOUTS, seed: Optional[int] = None) -> float:
+    """
+    Equity of a weighted range against another, over every compatible pair of combos.
+
+    Args:
+        hand_range: Range whose equity is returned
+        opponent_range: Opponent range
+        board: Community cards dealt so far (0 to 5)
+        max_runouts: Runouts enumerated before switching to a random sample
+        seed: Seed for the runout sample, None for a random seed
+
+    Returns:
+        float: Share of the pot hand_range wins on average
+    """
+    won, total = _combo_totals(opponent_range, board, max_runouts, seed)
+    possible = hand_range.weights @ total
+    return float(hand_range.weights @ won / possible) if possible else 0.0
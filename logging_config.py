@@ -0,0 +1,113 @@
+"""
+Logging setup for the client.
+
+The default mode writes synchronously to the log file and the console, as
+main.py always did. The queued mode keeps the hot path free of I/O: records
+go onto an in-memory queue and a background QueueListener thread writes
+them, while a per-call-site rate limit drops the bulk of the per-message
+INFO/DEBUG records during long simulation runs. Messages are still rendered
+in the calling thread, since the round state and bot objects passed as
+arguments are updated in place and would be read later in another state, or
+while they change. Records dropped by the rate limit are never rendered.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Dict, List, Optional, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `rate` records per second through for each call site, keyed
+    by logger name and the unformatted message template. Warnings and errors
+    always pass. The number of dropped records is reported on the next record
+    that passes for the same call site.
+    """
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Args:
+            rate: Records per second allowed per call site
+            burst: Records allowed at once before the rate applies, defaults to rate
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        # Call site -> (tokens, last refill time, dropped since last pass)
+        self.buckets: Dict[Tuple[str, object], List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.msg)
+        now = record.created
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = [float(self.burst), now, 0]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] += 1
+            return False
+        bucket[0] = tokens - 1
+        if bucket[2]:
+            record.msg = f"{record.msg} [{int(bucket[2])} similar messages suppressed]"
+            bucket[2] = 0
+        return True
+
+
+def configure_logging(file_path: str, level: int = logging.INFO, queued: bool = False, rate_limit: Optional[float] = None) -> None:
+    """
+    Send log records to a file and the console.
+
+    Args:
+        file_path: Log file, overwritten on start
+        level: Minimum level logged
+        queued: Hand records to a background thread instead of writing them inline
+        rate_limit: Records per second allowed per call site below WARNING, None for no limit
+    """
+    global _listener
+    stop_listener()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # Clear any existing handlers to avoid duplicates
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.setLevel(level)
+
+    file_handler = logging.FileHandler(file_path, mode='w')
+    file_handler.setLevel(level)
+    file_handler.setFormatter(formatter)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(formatter)
+
+    if queued:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(records)
+        if rate_limit:
+            queue_handler.addFilter(RateLimitFilter(rate_limit))
+        root_logger.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_listener)
+    else:
+        for handler in (file_handler, console_handler):
+            if rate_limit:
+                handler.addFilter(RateLimitFilter(rate_limit))
+            root_logger.addHandler(handler)
+
+
+def stop_listener() -> None:
+    """Flush queued records and stop the background logging thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,42 +1,76 @@
 import argparse
 import os
+from dataclasses import dataclass
 from time import sleep
-from config import RESULT_FILE, DEFAULT_HOST, DEFAULT_PORT, CLIENT_LOG_FILE
+from typing import Optional
+from config import RESULT_FILE, DEFAULT_HOST, DEFAULT_PORT, CLIENT_LOG_FILE, ACTION_TIMEOUT, LOG_RATE_LIMIT, OPPONENT_DB_FILE
+from async_runner import AsyncRunner
+from logging_config import configure_logging
+from opponent_stats import OpponentStatsStore
+from recorder import MessageRecorder
+from results_store import ResultsWriter, session_marker, write_session_marker
+from sequential import SequentialTest
 from runner import Runner
 import logging
 
 from player import SimplePlayer
+from range_tracker import RangeTracker
 
 
-def main(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, log_file_path: str = None, result_path=RESULT_FILE, simulation: bool = False, simulation_round: int = 6, local: bool = False, debug: bool = False) -> None:
+@dataclass
+class ClientOptions:
+    """Optional runner and bot features, all off by default except the results store."""
+    use_async: bool = False  # Asyncio runner with an action deadline
+    action_timeout: float = ACTION_TIMEOUT  # Seconds before the asyncio runner sends a fallback action
+    record_path: Optional[str] = None  # Record the server message stream to this file
+    fast_logging: bool = False  # Queued, rate-limited logging
+    ponder: bool = False  # Let the bot work while opponents act
+    opponent_db: Optional[str] = None  # SQLite file of opponent statistics
+    track_ranges: bool = False  # Narrow opponent ranges from their actions
+    sprt_delta: Optional[float] = None  # Stop a continuous simulation once the sequential test decides
+    results_store: bool = True  # Add game results to the structured results log
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> 'ClientOptions':
+        return cls(args.async_runner, args.action_timeout, args.record, args.fast_logging, args.ponder,
+                   args.opponent_db, args.track_ranges, args.sprt_delta, not args.no_results_store)
+
+
+def create_runner(host: str, port: int, result_path: str, simulation: bool, options: ClientOptions) -> Runner:
+    """Create the blocking runner, or the asyncio runner with an action deadline."""
+    if options.use_async:
+        runner = AsyncRunner(host, port, result_path, simulation, options.action_timeout)
+    else:
+        runner = Runner(host, port, result_path, simulation)
+    if options.record_path:
+        runner.set_recorder(MessageRecorder(options.record_path))
+    if options.ponder:
+        runner.enable_pondering()
+    if simulation and options.sprt_delta:
+        runner.set_evaluator(SequentialTest(options.sprt_delta))
+    if options.results_store:
+        runner.set_results_writer(ResultsWriter())
+    return runner
+
+
+def create_bot(options: ClientOptions) -> SimplePlayer:
+    """Create the bot with the optional opponent models."""
+    opponent_stats = OpponentStatsStore(options.opponent_db) if options.opponent_db else None
+    return SimplePlayer(opponent_stats, RangeTracker(opponent_stats) if options.track_ranges else None)
+
+
+def main(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, log_file_path: str = None, result_path=RESULT_FILE, simulation: bool = False, simulation_round: int = 6, local: bool = False, debug: bool = False, options: ClientOptions = None) -> None:
     """Main entry point for the poker bot runner."""
+    options = options or ClientOptions()
     
     # Configure logging - always log to both console and file
     log_level = logging.DEBUG if debug else logging.INFO
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    formatter = logging.Formatter(log_format)
     
     # Use specified log file or default to CLIENT_LOG_FILE
     file_path = log_file_path or CLIENT_LOG_FILE
     
-    # Clear any existing handlers to avoid duplicates
-    root_logger = logging.getLogger()
-    root_logger.handlers.clear()
-    
-    # Set up file handler
-    file_handler = logging.FileHandler(file_path, mode='w')
-    file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
-    
-    # Set up console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    
-    # Configure root logger
-    root_logger.setLevel(log_level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # Fast logging writes from a background thread and rate-limits per-message records
+    configure_logging(file_path, log_level, queued=options.fast_logging, rate_limit=LOG_RATE_LIMIT if options.fast_logging else None)
     
     print(f"Client logging to console and file: {file_path}")
 
@@ -44,40 +78,45 @@ def main(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, log_file_path: str
     logger = logging.getLogger(__name__)
     logger.info("Poker Client starting...")
     
-    # clear the result file
-    if os.path.exists(result_path):
-        os.remove(result_path)
+    # clear the result file and the results store session it pointed to
+    for path in (result_path, session_marker(result_path)):
+        if os.path.exists(path):
+            os.remove(path)
 
     if local:
         print("Running in local mode, saving results to local file")
         result_path = 'game_result.log'
 
     if simulation:
-        logger.info(f"Running in continuous simulation mode for {simulation_round} games")
+        logger.info("Running in continuous simulation mode for %s games", simulation_round)
         print(f"Running in continuous simulation mode for {simulation_round} games")
         # Create one runner that plays multiple games
-        runner = Runner(host, port, result_path, simulation)
-        simple_bot = SimplePlayer()
+        runner = create_runner(host, port, result_path, simulation, options)
+        simple_bot = create_bot(options)
         runner.set_bot(simple_bot)
         runner.run()
         
         # Get final statistics
         total_games = runner.get_game_count()
         total_score = runner.get_total_score()
-        logger.info(f"Continuous simulation completed. Total games played: {total_games}")
-        logger.info(f"Total score: {total_score}")
+        logger.info("Continuous simulation completed. Total games played: %s", total_games)
+        logger.info("Total score: %s", total_score)
         print(f"Continuous simulation completed. Total games played: {total_games}")
         print(f"Total score: {total_score}")
         if total_games > 0:
-            logger.info(f"Average score per game: {total_score / total_games}")
+            logger.info("Average score per game: %s", total_score / total_games)
             print(f"Average score per game: {total_score / total_games}")
             runner.append_to_file(result_path, f"CONTINUOUS_MODE \n Games: {total_games}, \n Total: {total_score}, \n Average: {total_score / total_games}")
+            if runner.results_writer:
+                write_session_marker(result_path, runner.results_writer.session)
+        if runner.evaluator:
+            print(f"Sequential test: {runner.evaluator.summary()}")
 
     else:
         logger.info("Running single game mode")
         print("Running single game mode")
-        runner = Runner(host, port, result_path, simulation)
-        simple_bot = SimplePlayer()
+        runner = create_runner(host, port, result_path, simulation, options)
+        simple_bot = create_bot(options)
         runner.set_bot(simple_bot)
         runner.run()
 
@@ -92,10 +131,19 @@ if __name__ == "__main__":
     parser.add_argument('-sr', '--simulation_rounds', type=int, default=6, help='Number of rounds in simulation mode')
     parser.add_argument('-l', '--local', type=bool, default=False, help='Run in local mode')
     parser.add_argument('--debug', default=False, action='store_true', help='Enable debug mode')
+    parser.add_argument('-a', '--async-runner', default=False, action='store_true', help='Use the asyncio runner with an action deadline')
+    parser.add_argument('--action-timeout', type=float, default=ACTION_TIMEOUT, help='Seconds the bot may think before a fallback action is sent (asyncio runner only)')
+    parser.add_argument('--fast-logging', default=False, action='store_true', help='Write logs from a background thread and rate-limit per-message records')
+    parser.add_argument('--ponder', default=False, action='store_true', help="Let the bot work in the background while opponents act")
+    parser.add_argument('--opponent-db', type=str, default=None, help=f'Keep opponent statistics in this SQLite file, e.g. {OPPONENT_DB_FILE}')
+    parser.add_argument('--track-ranges', default=False, action='store_true', help='Narrow opponent ranges from their actions and use them for turn and river equity')
+    parser.add_argument('--sprt-delta', type=float, default=None, help='Stop a continuous simulation once the mean score per game is shown to differ from 0 by this many chips, or not to')
+    parser.add_argument('--no-results-store', default=False, action='store_true', help='Do not add game results to the structured results log')
+    parser.add_argument('--record', type=str, default=None, help='Record the server message stream to this file (.gz to compress)')
     args = parser.parse_args()
 
     # Run the main function with command line arguments
     try:
-        main(args.host, args.port, args.log_file, args.result, args.simulation, args.simulation_rounds, args.local, args.debug)
+        main(args.host, args.port, args.log_file, args.result, args.simulation, args.simulation_rounds, args.local, args.debug, ClientOptions.from_args(args))
     except KeyboardInterrupt:
         print("\nExiting...")
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Low-overhead latency histograms and counters for the client, exported as a
+Prometheus text file and a JSON snapshot.
+
+Histograms use HDR-style log-linear buckets: values below 2^PRECISION_BITS
+nanoseconds are counted exactly, larger values keep PRECISION_BITS - 1
+significant bits after the leading one, i.e. 64 buckets per power of two, so
+a bucket's lowest value is at most 1/64 (about 1.6%) below any value in it.
+Recording a value is a few integer operations and one list increment.
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+PRECISION_BITS = 7
+HALF_BUCKETS = 1 << (PRECISION_BITS - 1)
+# Enough buckets for values up to 2^48 ns (about three days)
+NUM_BUCKETS = (48 - PRECISION_BITS + 2) * HALF_BUCKETS
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+METRIC_PREFIX = 'poker_client'
+
+MetricKey = Tuple[str, str]
+
+
+def bucket_index(value: int) -> int:
+    """Bucket of a non-negative integer value."""
+    shift = value.bit_length() - PRECISION_BITS
+    if shift <= 0:
+        return value
+    return shift * HALF_BUCKETS + (value >> shift)
+
+
+def bucket_value(index: int) -> int:
+    """Lowest value that falls into a bucket."""
+    if index < 2 * HALF_BUCKETS:
+        return index
+    shift = index // HALF_BUCKETS - 1
+    return (index - shift * HALF_BUCKETS) << shift
+
+
+class LatencyHistogram:
+    """Histogram of durations in nanoseconds."""
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Record one duration.
+
+        Args:
+            value: Duration in nanoseconds
+        """
+        if value < 0:
+            value = 0
+        index = bucket_index(value)
+        if index >= NUM_BUCKETS:
+            index = NUM_BUCKETS - 1
+        self.counts[index] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, quantile: float) -> int:
+        """
+        Value at a quantile, accurate to the bucket precision.
+
+        Args:
+            quantile: Between 0 and 1, e.g. 0.99 for p99
+
+        Returns:
+            int: Duration in nanoseconds, 0 if nothing was recorded
+        """
+        if not self.count:
+            return 0
+        target = max(1, int(quantile * self.count + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if seen == self.count:
+                    # The highest bucket holds the maximum, which is known exactly
+                    return self.max
+                return max(bucket_value(index), self.min)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict[str, object]:
+        """Summary of the histogram, durations in nanoseconds."""
+        return {
+            'count': self.count,
+            'sum_ns': self.total,
+            'min_ns': self.min,
+            'max_ns': self.max,
+            'mean_ns': self.mean(),
+            'percentiles_ns': {str(quantile): self.percentile(quantile) for quantile in QUANTILES},
+            'buckets': {str(bucket_value(index)): bucket_count for index, bucket_count in enumerate(self.counts) if bucket_count},
+        }
+
+
+class Metrics:
+    """Registry of latency histograms and counters, keyed by metric name and label."""
+    def __init__(self, label_names: Optional[Dict[str, str]] = None) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            label_names: Prometheus label name per metric name, 'label' by default
+        """
+        self.label_names = label_names or {}
+        self.histograms: Dict[MetricKey, LatencyHistogram] = {}
+        self.counters: Dict[MetricKey, int] = {}
+        self.started_at = time.time()
+
+    def observe(self, name: str, label: str, value: int) -> None:
+        """
+        Record a duration.
+
+        Args:
+            name: Metric name, e.g. 'handler_latency'
+            label: Label value, e.g. the message type name
+            value: Duration in nanoseconds
+        """
+        histogram = self.histograms.get((name, label))
+        if histogram is None:
+            histogram = self.histograms[(name, label)] = LatencyHistogram()
+        histogram.record(value)
+
+    def increment(self, name: str, label: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        key = (name, label)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def histogram(self, name: str, label: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get((name, label))
+
+    def to_json(self) -> Dict[str, object]:
+        """Snapshot of every metric."""
+        histograms: Dict[str, Dict[str, object]] = {}
+        for (name, label), histogram in sorted(self.histograms.items()):
+            histograms.setdefault(name, {})[label] = histogram.snapshot()
+        counters: Dict[str, Dict[str, int]] = {}
+        for (name, label), value in sorted(self.counters.items()):
+            counters.setdefault(name, {})[label] = value
+        return {
+            'timestamp': time.time(),
+            'uptime_seconds': time.time() - self.started_at,
+            'histograms': histograms,
+            'counters': counters,
+        }
+
+    def to_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        for name in sorted({name for name, _ in self.histograms}):
+            metric = f"{METRIC_PREFIX}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for (histogram_name, label), histogram in sorted(self.histograms.items()):
+                if histogram_name != name:
+                    continue
+                labels = f'{self.label_names.get(name, "label")}="{_escape(label)}"'
+                for quantile in QUANTILES:
+                    lines.append(f'{metric}{{{labels},quantile="{quantile}"}} {histogram.percentile(quantile) / 1e9:.9f}')
+                lines.append(f'{metric}_sum{{{labels}}} {histogram.total / 1e9:.9f}')
+                lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+        for name in sorted({name for name, _ in self.counters}):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_name, label), value in sorted(self.counters.items()):
+                if counter_name == name:
+                    lines.append(f'{metric}{{{self.label_names.get(name, "label")}="{_escape(label)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus text file atomically, for node_exporter's textfile collector."""
+        _write_atomic(path, self.to_prometheus())
+
+    def write_json(self, path: str) -> None:
+        """Write the JSON snapshot atomically."""
+        _write_atomic(path, json.dumps(self.to_json(), indent=2))
+
+
+def _escape(label: str) -> str:
+    return label.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, data: str) -> None:
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        file.write(data)
+    os.replace(temp_path, path)
@@ -0,0 +1,232 @@
+import argparse
+import logging
+import os
+import selectors
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import RESULT_FILE, RESULTS_LOG_FILE, DEFAULT_HOST, DEFAULT_PORT
+from protocol import FrameDecoder
+from results_store import ResultsWriter
+from runner import Runner
+from sequential import SequentialTest
+
+
+class SessionRunner(Runner):
+    """Runner driven by MultiSessionHost instead of its own blocking read loop."""
+    def __init__(self, host: str, port: int, result_path: str, sim: bool = False) -> None:
+        super().__init__(host, port, result_path, sim)
+        # Sessions keep their metrics in memory, the host reports throughput instead
+        self.metrics_prom_path = None
+        self.metrics_json_path = None
+        self.decoder = FrameDecoder()
+        self.messages = 0
+        self.actions = 0
+        self.started_at = 0.0
+        self.finished_at: Optional[float] = None
+
+    def send_action_to_server(self, player_id: str, action: int, amount: int) -> None:
+        """Send player action to the server, counting it for throughput stats."""
+        self.actions += 1
+        super().send_action_to_server(player_id, action, amount)
+
+    def feed(self, data: bytes) -> None:
+        """
+        Process newly received bytes, keeping any incomplete trailing frame.
+
+        Args:
+            data: Bytes read from the socket
+        """
+        self.process_frames(self.decoder.feed(data))
+
+    def process_frames(self, frames: List[bytes]) -> None:
+        for frame in frames:
+            if self.stop_requested:
+                # Frames after the stop are the server's next game, which is not played
+                break
+            self.messages += 1
+            self.handle_frame(frame)
+
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return max(end - self.started_at, 1e-9)
+
+
+class MultiSessionHost:
+    """
+    Hosts many client sessions in one process, each with its own socket and
+    bot instance, multiplexed over a single selector.
+    """
+    def __init__(self, host: str, port: int, bot_factory: Callable[[], object], num_sessions: int, result_path: str = RESULT_FILE, sim: bool = True, report_interval: float = 10.0, results_log: Optional[str] = RESULTS_LOG_FILE, sprt_delta: Optional[float] = None) -> None:
+        """
+        Initialize the host.
+
+        Args:
+            host: Server hostname or IP address
+            port: Server port
+            bot_factory: Callable returning a new bot for each session
+            num_sessions: Number of sessions to open
+            result_path: Result file, suffixed with the session index per session
+            sim: Simulation (continuous) mode for every session
+            report_interval: Seconds between throughput reports, 0 to disable
+            results_log: Structured results log every session adds its games to, None to disable
+            sprt_delta: Stop each session once its mean score is shown to differ from 0 by this many chips, or not to
+        """
+        self.host = host
+        self.port = port
+        self.bot_factory = bot_factory
+        self.num_sessions = num_sessions
+        self.result_path = result_path
+        self.sim = sim
+        self.report_interval = report_interval
+        self.results_log = results_log
+        self.sprt_delta = sprt_delta
+        # One results store session for the whole host, the player ID tells its sessions apart
+        self.results_session = time.time_ns()
+        self.logger = logging.getLogger('MultiSessionHost')
+        self.selector = selectors.DefaultSelector()
+        self.sessions: List[SessionRunner] = []
+        self.started_at = 0.0
+
+    def _session_result_path(self, index: int) -> str:
+        base, ext = os.path.splitext(self.result_path)
+        return f"{base}_{index}{ext}"
+
+    def open_sessions(self) -> int:
+        """
+        Connect every session and register its socket with the selector.
+
+        Returns:
+            int: Number of sessions connected
+        """
+        for index in range(self.num_sessions):
+            session = SessionRunner(self.host, self.port, self._session_result_path(index), self.sim)
+            session.set_bot(self.bot_factory())
+            if not session.connect():
+                session.close()
+                continue
+            if self.results_log:
+                session.set_results_writer(ResultsWriter(self.results_log, session=self.results_session))
+            if self.sprt_delta:
+                session.set_evaluator(SequentialTest(self.sprt_delta))
+            self.add_session(session)
+        self.logger.info("Opened %s/%s sessions to %s:%s", len(self.sessions), self.num_sessions, self.host, self.port)
+        return len(self.sessions)
+
+    def add_session(self, session: SessionRunner) -> None:
+        """
+        Serve a session whose socket is already connected.
+
+        Args:
+            session: Connected session with its bot set
+        """
+        session.started_at = time.perf_counter()
+        self.selector.register(session.client_socket, selectors.EVENT_READ, session)
+        self.sessions.append(session)
+
+    def run(self) -> None:
+        """Serve every session until all of them are closed by the server."""
+        self.started_at = time.perf_counter()
+        if not self.open_sessions():
+            return
+
+        next_report = self.started_at + self.report_interval
+        try:
+            while self.selector.get_map():
+                for key, _ in self.selector.select(timeout=1.0):
+                    self._read(key.data)
+                if self.report_interval and time.perf_counter() >= next_report:
+                    self.log_report()
+                    next_report += self.report_interval
+        except KeyboardInterrupt:
+            self.logger.info("Interrupted by user")
+        finally:
+            for session in self.sessions:
+                if session.finished_at is None:
+                    self._finish(session)
+            self.selector.close()
+        self.log_report()
+
+    def _read(self, session: SessionRunner) -> None:
+        try:
+            frames = session.decoder.recv_from(session.client_socket)
+        except OSError as e:
+            self.logger.error("Session %s read failed: %s", session.player_id, e)
+            frames = None
+        if frames is None:
+            self._finish(session)
+            return
+        session.process_frames(frames)
+        if session.stop_requested:
+            self._finish(session)
+
+    def _finish(self, session: SessionRunner) -> None:
+        session.finished_at = time.perf_counter()
+        try:
+            self.selector.unregister(session.client_socket)
+        except (KeyError, ValueError):
+            pass
+        session.close()
+
+    def report(self) -> Dict[str, object]:
+        """
+        Collect per-session and aggregate throughput.
+
+        Returns:
+            Dict[str, object]: 'sessions' list and 'aggregate' totals
+        """
+        sessions = []
+        for index, session in enumerate(self.sessions):
+            elapsed = session.elapsed()
+            sessions.append({
+                'session': index,
+                'player_id': session.player_id,
+                'games': session.get_game_count(),
+                'messages': session.messages,
+                'actions': session.actions,
+                'total_score': session.get_total_score(),
+                'games_per_sec': session.get_game_count() / elapsed,
+                'messages_per_sec': session.messages / elapsed,
+            })
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        aggregate = {
+            'sessions': len(self.sessions),
+            'active': sum(1 for session in self.sessions if session.finished_at is None),
+            'games': sum(entry['games'] for entry in sessions),
+            'messages': sum(entry['messages'] for entry in sessions),
+            'actions': sum(entry['actions'] for entry in sessions),
+            'elapsed': elapsed,
+        }
+        aggregate['games_per_sec'] = aggregate['games'] / elapsed
+        aggregate['messages_per_sec'] = aggregate['messages'] / elapsed
+        return {'sessions': sessions, 'aggregate': aggregate}
+
+    def log_report(self) -> None:
+        """Log the throughput of every session and of the whole host."""
+        report = self.report()
+        for entry in report['sessions']:
+            self.logger.debug("Session %s (player %s): %s games, %.2f games/s, %.1f msgs/s, score %s", entry['session'], entry['player_id'], entry['games'], entry['games_per_sec'], entry['messages_per_sec'], entry['total_score'])
+        aggregate = report['aggregate']
+        self.logger.info("%s/%s sessions active: %s games, %.2f games/s, %.1f msgs/s, %s actions in %.1fs", aggregate['active'], aggregate['sessions'], aggregate['games'], aggregate['games_per_sec'], aggregate['messages_per_sec'], aggregate['actions'], aggregate['elapsed'])
+
+
+def main(host: str, port: int, num_sessions: int, result_path: str, report_interval: float, results_log: Optional[str] = RESULTS_LOG_FILE, sprt_delta: Optional[float] = None) -> None:
+    """Run SimplePlayer sessions against one server."""
+    from player import SimplePlayer
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    multi_host = MultiSessionHost(host, port, SimplePlayer, num_sessions, result_path, report_interval=report_interval, results_log=results_log, sprt_delta=sprt_delta)
+    multi_host.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-Session Poker Client")
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='Server host')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Server port')
+    parser.add_argument('-n', '--sessions', type=int, default=10, help='Number of sessions to host')
+    parser.add_argument('-r', '--result', type=str, default=RESULT_FILE, help='Result file, suffixed per session')
+    parser.add_argument('--report-interval', type=float, default=10.0, help='Seconds between throughput reports')
+    parser.add_argument('--sprt-delta', type=float, default=None, help='Stop each session once its mean score per game is shown to differ from 0 by this many chips, or not to')
+    parser.add_argument('--no-results-store', default=False, action='store_true', help='Do not add game results to the structured results log')
+    args = parser.parse_args()
+    main(args.host, args.port, args.sessions, args.result, args.report_interval, None if args.no_results_store else RESULTS_LOG_FILE, args.sprt_delta)
@@ -0,0 +1,252 @@
+"""
+Persistent per-opponent statistics for opponent modeling.
+
+Actions are picked up from the player_actions and player_bets of every
+RoundStateClient the bot sees and counted in memory for the current hand.
+At the end of the hand each opponent's counters are added to a SQLite file
+in one transaction, so stats survive across sessions and an update never
+rescans history. Reads are served from an in-memory copy of the table.
+
+The file records its schema version in PRAGMA user_version. Opening a file
+written before a counter existed adds the missing columns, zero for the
+hands already recorded.
+"""
+import sqlite3
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import OPPONENT_DB_FILE
+from type.poker_action import PokerAction
+from type.round_state import RoundStateClient
+
+AGGRESSIVE_ACTIONS = (PokerAction.RAISE.name, PokerAction.ALL_IN.name)
+VOLUNTARY_ACTIONS = (PokerAction.CALL.name,) + AGGRESSIVE_ACTIONS
+# Bumped whenever a counter is added to OpponentProfile
+SCHEMA_VERSION = 1
+
+
+@dataclass
+class OpponentProfile:
+    hands: int = 0  # Hands the opponent was dealt into
+    vpip_hands: int = 0  # Hands with a voluntary call or raise preflop
+    pfr_hands: int = 0  # Hands with a preflop raise
+    aggressive_actions: int = 0  # Raises and all-ins, blinds excluded
+    passive_actions: int = 0  # Calls
+    folds: int = 0
+    showdowns: int = 0
+    showdowns_won: int = 0
+
+    @property
+    def vpip(self) -> float:
+        """Share of hands the opponent voluntarily put chips in preflop."""
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        """Share of hands the opponent raised preflop."""
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    @property
+    def aggression(self) -> float:
+        """Aggression factor: raises per call."""
+        if not self.passive_actions:
+            return float(self.aggressive_actions)
+        return self.aggressive_actions / self.passive_actions
+
+    @property
+    def showdown_rate(self) -> float:
+        """Share of hands that reached showdown."""
+        return self.showdowns / self.hands if self.hands else 0.0
+
+    @property
+    def showdown_win_rate(self) -> float:
+        return self.showdowns_won / self.showdowns if self.showdowns else 0.0
+
+    def add(self, other: 'OpponentProfile') -> None:
+        for field in COUNTERS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+COUNTERS = tuple(field.name for field in fields(OpponentProfile))
+
+CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS opponent_stats (player_id TEXT PRIMARY KEY, "
+    + ", ".join(f"{counter} INTEGER NOT NULL DEFAULT 0" for counter in COUNTERS)
+    + ")"
+)
+UPSERT = (
+    f"INSERT INTO opponent_stats (player_id, {', '.join(COUNTERS)}) VALUES (?{', ?' * len(COUNTERS)}) "
+    f"ON CONFLICT(player_id) DO UPDATE SET {', '.join(f'{counter} = {counter} + excluded.{counter}' for counter in COUNTERS)}"
+)
+
+
+def blind_posts(blind_amount: int, small_blind_id: Any = None, big_blind_id: Any = None) -> Dict[str, int]:
+    """
+    Chips each blind posts, keyed by player ID.
+
+    Args:
+        blind_amount: Big blind
+        small_blind_id: Small blind player ID, None if unknown
+        big_blind_id: Big blind player ID, None if unknown
+
+    Returns:
+        Dict[str, int]: Posts of the known blinds, empty when neither is known
+    """
+    posts = {}
+    if small_blind_id is not None:
+        posts[str(small_blind_id)] = blind_amount // 2
+    if big_blind_id is not None:
+        posts[str(big_blind_id)] = blind_amount
+    return posts
+
+
+def is_blind_post(posts: Dict[str, int], blind_amount: int, player_id: str, first_action: bool, action: str, bet: int) -> bool:
+    """
+    Whether a preflop action is a blind being posted, which the server reports as a raise.
+
+    Only a player's first action can be its post. With the blinds unknown,
+    any first raise up to the big blind is taken for one.
+    """
+    if not first_action or action not in AGGRESSIVE_ACTIONS:
+        return False
+    post = posts.get(player_id) if posts else blind_amount
+    return post is not None and bet <= post
+
+
+def migrate(connection: sqlite3.Connection) -> None:
+    """Create the table, or bring one written by an older version up to SCHEMA_VERSION."""
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Opponent stats schema version {version} is newer than {SCHEMA_VERSION}")
+    connection.execute(CREATE_TABLE)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(opponent_stats)")}
+    for counter in COUNTERS:
+        if counter not in columns:
+            connection.execute(f"ALTER TABLE opponent_stats ADD COLUMN {counter} INTEGER NOT NULL DEFAULT 0")
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+class OpponentStatsStore:
+    """
+    Opponent counters backed by a SQLite file.
+
+    Call begin_hand from on_start, observe with every round state, and
+    end_hand from on_end_game.
+    """
+    def __init__(self, path: str = OPPONENT_DB_FILE) -> None:
+        """
+        Open or create the store.
+
+        Args:
+            path: SQLite file, ':memory:' for a throwaway store
+        """
+        self.path = path
+        # The runner and AsyncRunner's bot thread both feed the store, the lock guards the
+        # connection and the counters of the hand in progress
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            migrate(self.connection)
+        self.profiles: Dict[str, OpponentProfile] = {
+            row[0]: OpponentProfile(*row[1:])
+            for row in self.connection.execute(f"SELECT player_id, {', '.join(COUNTERS)} FROM opponent_stats")
+        }
+
+        self.hero_id: Optional[str] = None
+        self.blind_amount = 0
+        self.blind_posts: Dict[str, int] = {}
+        # Counters of the hand in progress, per opponent
+        self.hand: Dict[str, OpponentProfile] = {}
+        # Last (street, action, bet) seen per opponent, to count each action once
+        self.last_seen: Dict[str, Tuple[str, str, int]] = {}
+
+    def begin_hand(self, hero_id: Any, players: Iterable[Any], blind_amount: int, small_blind_id: Any = None, big_blind_id: Any = None) -> None:
+        """
+        Start counting a new hand.
+
+        Args:
+            hero_id: Our own player ID, never counted
+            players: Every player dealt into the hand
+            blind_amount: Big blind
+            small_blind_id: Small blind player ID, its first raise up to half the big blind is its post
+            big_blind_id: Big blind player ID, its first raise up to the big blind is its post
+        """
+        with self.lock:
+            self.hero_id = str(hero_id)
+            self.blind_amount = blind_amount
+            self.blind_posts = blind_posts(blind_amount, small_blind_id, big_blind_id)
+            self.hand = {str(player_id): OpponentProfile(hands=1) for player_id in players if str(player_id) != self.hero_id}
+            self.last_seen = {}
+
+    def observe(self, round_state: RoundStateClient) -> None:
+        """
+        Count the actions that are new since the last observed state.
+
+        Args:
+            round_state: Any state received during the hand
+        """
+        street = round_state.round
+        bets = round_state.player_bets
+        with self.lock:
+            for player_id, action in round_state.player_actions.items():
+                counters = self.hand.get(player_id)
+                if counters is None or not action:
+                    continue
+                action = str(action).upper()
+                bet = bets.get(player_id, 0)
+                seen = (street, action, bet)
+                if self.last_seen.get(player_id) == seen:
+                    continue
+                previous = self.last_seen.get(player_id)
+                self.last_seen[player_id] = seen
+                if action == PokerAction.FOLD.name:
+                    if previous is None or previous[1] != action:
+                        counters.folds += 1
+                    continue
+                preflop = street.upper() == 'PREFLOP'
+                if preflop and is_blind_post(self.blind_posts, self.blind_amount, player_id, previous is None, action, bet):
+                    continue
+                if action in AGGRESSIVE_ACTIONS:
+                    counters.aggressive_actions += 1
+                elif action == PokerAction.CALL.name:
+                    counters.passive_actions += 1
+                if preflop and action in VOLUNTARY_ACTIONS:
+                    counters.vpip_hands = 1
+                    if action in AGGRESSIVE_ACTIONS:
+                        counters.pfr_hands = 1
+
+    def end_hand(self, all_scores: Dict[str, float], active_players_hands: Dict[str, Any]) -> None:
+        """
+        Record showdowns and add the hand's counters to the store.
+
+        Args:
+            all_scores: Score of every player in the hand
+            active_players_hands: Hands shown at showdown, keyed by player ID
+        """
+        with self.lock:
+            for player_id in active_players_hands or {}:
+                counters = self.hand.get(str(player_id))
+                if counters is not None:
+                    counters.showdowns = 1
+                    counters.showdowns_won = int(float((all_scores or {}).get(str(player_id), 0)) > 0)
+            if not self.hand:
+                return
+            rows = [(player_id,) + tuple(getattr(counters, counter) for counter in COUNTERS) for player_id, counters in self.hand.items()]
+            with self.connection:
+                self.connection.executemany(UPSERT, rows)
+            for player_id, counters in self.hand.items():
+                self.profiles.setdefault(player_id, OpponentProfile()).add(counters)
+            self.hand = {}
+            self.last_seen = {}
+
+    def get(self, player_id: Any) -> OpponentProfile:
+        """Stats of one opponent, all zero if never seen."""
+        with self.lock:
+            return self.profiles.get(str(player_id)) or OpponentProfile()
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
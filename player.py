@@ -1,27 +1,73 @@
 import ast
+import logging
 import random
+import threading
+from dataclasses import dataclass
 import eval7
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from bot import Bot
+from equity import estimate_equity, exact_equity
+from hand_range import HandRange, hero_equity
+from opponent_stats import OpponentStatsStore
+from preflop_table import preflop_equity
+from range_tracker import RangeTracker
 from type.poker_action import PokerAction
+from type.card_set import CardSet
+from type.cards import parse_card, parse_cards
 from type.round_state import RoundStateClient
 
+# eval7.evaluate packs the hand type (0 = high card ... 8 = straight flush) above bit 24
+HAND_TYPE_SHIFT = 24
+TWO_PAIR = 2
+TEN = eval7.ranks.index('T')
+# Exact equity at which the turn and river logic moves all-in
+ALL_IN_EQUITY = 0.8
+
+logger = logging.getLogger('SimplePlayer')
+
+
+@dataclass(frozen=True)
+class SimplePlayerParams:
+    # Preflop hand score (1 + 9 * heads-up equity) above which opens are called. 5.8 is an equity of
+    # about 0.533 and calls the same 37% of starting hands as the rank heuristic it replaced.
+    call_strength: float = 5.8
+    all_in_pairs: str = 'AKQ'  # Ranks of the pocket pairs moved all-in preflop
+    min_kicker: str = 'Q'  # Lowest kicker counted as medium or better
+    top_pair_needs_kicker: bool = False  # Postflop, top pair moves all-in only with a medium or better kicker
+    all_in_equity: float = ALL_IN_EQUITY  # Turn and river equity at which to move all-in
+
+    def __post_init__(self):
+        for rank in self.all_in_pairs + self.min_kicker:
+            if rank not in eval7.ranks:
+                raise ValueError(f"Invalid rank: {rank}")
+
+    @property
+    def min_kicker_rank(self) -> int:
+        return eval7.ranks.index(self.min_kicker)
+
+
 class SimplePlayer(Bot):
-    def __init__(self):
+    def __init__(self, opponent_stats: Optional[OpponentStatsStore] = None, range_tracker: Optional[RangeTracker] = None, params: Optional[SimplePlayerParams] = None):
         super().__init__()
+        self.params = params or SimplePlayerParams()
         self.my_hand = None  # List[eval7.Card]
         self.all_players = []
         self.preflop_aggressor = False
+        # Optional persistent opponent model, fed from every round state we see
+        self.opponent_stats = opponent_stats
+        # Optional opponent range narrowing, used for the turn and river equity
+        self.range_tracker = range_tracker
+        # Hands each opponent showed down, for range analysis
+        self.showdown_ranges: Dict[str, HandRange] = {}
+        # Set when the runner gave up on the current get_action, the equity work then stops early
+        self.interrupted = threading.Event()
 
     def on_start(self, starting_chips: int, player_hands: List[str], blind_amount: int, big_blind_player_id: int, small_blind_player_id: int, all_players: List[int]):
-        print("Player called on game start")
-        print("Player hands: ", player_hands)
-        print("Blind: ", blind_amount)
-        print("Big blind player id: ", big_blind_player_id)
-        print("Small blind player id: ", small_blind_player_id)
-        print("All players in game: ", all_players)
-        print("My id: ", self.id)
+        logger.debug("Game start: hands %s, blind %s, big blind %s, small blind %s, players %s, my id %s",
+                     player_hands, blind_amount, big_blind_player_id, small_blind_player_id, all_players, self.id)
         self.all_players = all_players
+        if self.opponent_stats:
+            self.opponent_stats.begin_hand(self.id, all_players, blind_amount, small_blind_player_id, big_blind_player_id)
         # Parse hand from string using eval7
         if player_hands and isinstance(player_hands[0], str) and player_hands[0].startswith('Hands: '):
             hands_str = player_hands[0].replace('Hands: ', '')
@@ -32,76 +78,83 @@ class SimplePlayer(Bot):
             else:
                 self.my_hand = None
         else:
-            # fallback: assume player_hands is a list of card strings
-            self.my_hand = [eval7.Card(card) for card in player_hands[self.id]] if self.id < len(player_hands) else None
+            # fallback: assume player_hands is this player's list of card strings
+            self.my_hand = [self.card_from_string(card_str) for card_str in player_hands] if len(player_hands) == 2 else None
         self.preflop_aggressor = False
+        if self.range_tracker:
+            self.range_tracker.begin_hand(self.id, all_players, blind_amount, self.my_hand, small_blind_player_id, big_blind_player_id)
 
     def card_from_string(self, card_str):
-        # card_str is like 'Card("9s")' or 'Card("Kc")'
-        if card_str.startswith('Card("') and card_str.endswith('")'):
-            rank_suit = card_str[6:-2]
-            return eval7.Card(rank_suit)
-        else:
-            return eval7.Card(card_str)
+        # card_str is like 'Card("9s")' or 'Kc', looked up in the interned card table
+        return parse_card(card_str)
 
     def on_round_start(self, round_state: RoundStateClient, remaining_chips: int):
-        print("Player called on round start")
-        print("Round state: ", round_state)
+        logger.debug("Round start: %s", round_state)
+        self.observe(round_state)
+
+    def observe(self, round_state: RoundStateClient) -> None:
+        # Feed the opponent models with the actions in this state
+        if self.opponent_stats:
+            self.opponent_stats.observe(round_state)
+        if self.range_tracker:
+            self.range_tracker.observe(round_state)
 
-    def evaluate_hand_strength(self, hand, community_cards) -> float:
-        # Use eval7 to evaluate hand strength
+    def evaluate_hand_strength(self, hand, community_cards, num_opponents: int = 1) -> float:
+        # Monte Carlo equity against random opponent hands, scaled to 1 (worst) to 10 (best)
         if not hand or len(hand) < 2:
             return 1.0
-        evaluator = eval7.Evaluator()
-        # Preflop: use a simple lookup or simulation (here, use high card value as proxy)
         if not community_cards:
-            ranks = [c.rank for c in hand]
-            values = [eval7.RANKS.index(r) for r in ranks]
-            # Pair
-            if ranks[0] == ranks[1]:
-                return 9.5 if values[0] >= 10 else 8.5
-            # Suited connectors
-            if hand[0].suit == hand[1].suit and abs(values[0] - values[1]) == 1:
-                return 8.0
-            # Both high cards
-            if values[0] >= 10 and values[1] >= 10:
-                return 8.5
-            # One high card
-            if max(values) >= 11:
-                return 7.5
-            return 5.0
-        # Postflop: use eval7 to get hand strength percentile
-        board = [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        hand_value = evaluator.evaluate(board, hand)
-        # Normalize: 1 (worst) to 10 (best)
-        # eval7: lower value is better (0 is best hand)
-        max_score = evaluator._rank_to_handtype[7462][0]  # 7462 is the worst hand rank
-        norm = 1 + 9 * (max_score - hand_value) / max_score
-        return max(1.0, min(10.0, norm))
+            # Preflop: O(1) lookup in the precomputed table
+            return 1 + 9 * preflop_equity(hand, num_opponents)
+        equity = estimate_equity(hand, parse_cards(community_cards), num_opponents)
+        return 1 + 9 * equity
+
+    def ponder(self, round_state: RoundStateClient, remaining_chips: int, cancel) -> None:
+        # Warm the equity cache for this board while the opponent thinks, get_action then finds it ready
+        if not self.my_hand or not round_state.community_cards:
+            return
+        num_opponents = self.count_opponents(round_state)
+        if len(round_state.board) >= 4 and num_opponents == 1:
+            exact_equity(self.my_hand, round_state.board, cancel=cancel)
+        else:
+            estimate_equity(self.my_hand, round_state.board, num_opponents, cancel=cancel)
+
+    def interrupt(self) -> None:
+        self.interrupted.set()
+
+    def active_opponents(self, round_state: RoundStateClient) -> List[str]:
+        # Opponents that have not folded this game
+        actions = round_state.player_actions or {}
+        return [pid for pid, action in actions.items() if pid != str(self.id) and str(action).upper() != PokerAction.FOLD.name]
+
+    def count_opponents(self, round_state: RoundStateClient) -> int:
+        return max(1, len(self.active_opponents(round_state)))
+
+    def to_card_set(self, community_cards) -> CardSet:
+        if isinstance(community_cards, CardSet):
+            return community_cards
+        return CardSet.from_cards(parse_cards(community_cards))
 
     def is_pair(self, hand, rank):
+        # rank is a rank character like 'A' or an eval7 rank index
+        rank = eval7.ranks.index(rank) if isinstance(rank, str) else rank
         return hand[0].rank == hand[1].rank and hand[0].rank == rank
 
     def is_top_pair(self, hand, community_cards):
-        if not community_cards:
+        board = self.to_card_set(community_cards)
+        if not board.mask:
             return False
-        board = [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        board_ranks = [c.rank for c in board]
-        hand_ranks = [c.rank for c in hand]
-        top_board = max(board_ranks, key=lambda r: eval7.RANKS.index(r))
-        return any(r == top_board for r in hand_ranks)
+        return CardSet.from_cards(hand).has_rank(board.top_rank())
 
     def is_overcard(self, card, community_cards):
-        if not community_cards:
+        board = self.to_card_set(community_cards)
+        if not board.mask:
             return False
-        board = [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        card_val = eval7.RANKS.index(card.rank)
-        return all(card_val > eval7.RANKS.index(c.rank) for c in board)
+        # No board card of the same rank or higher
+        return board.rank_mask >> card.rank == 0
 
     def has_flush_draw(self, hand, community_cards):
-        all_cards = hand + [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        suits = [c.suit for c in all_cards]
-        return max([suits.count(s) for s in set(suits)]) == 4
+        return (CardSet.from_cards(hand) | self.to_card_set(community_cards)).max_suit_count() == 4
 
     def get_position(self, round_state):
         idx = self.all_players.index(self.id) if self.id in self.all_players else 0
@@ -111,9 +164,11 @@ class SimplePlayer(Bot):
             return "late"
 
     def get_action(self, round_state: RoundStateClient, remaining_chips: int) -> Tuple[PokerAction, int]:
-        print("Player called get action")
+        logger.debug("Get action: round %s, pot %s", round_state.round, round_state.pot)
+        self.interrupted.clear()
+        self.observe(round_state)
         round_type = round_state.round.upper() if hasattr(round_state, 'round') else "PREFLOP"
-        strength = self.evaluate_hand_strength(self.my_hand, round_state.community_cards)
+        num_opponents = self.count_opponents(round_state)
         pot = round_state.pot
         position = self.get_position(round_state)
         min_raise = round_state.min_raise
@@ -124,82 +179,90 @@ class SimplePlayer(Bot):
         my_bet = player_bets.get(str(self.id), 0)
         # Preflop logic
         if round_type == "PREFLOP":
-            # Squeeze and all-in with AA/KK/QQ
-            if self.is_pair(self.my_hand, 'A') or self.is_pair(self.my_hand, 'K') or self.is_pair(self.my_hand, 'Q'):
+            strength = self.evaluate_hand_strength(self.my_hand, round_state.board, num_opponents)
+            # Squeeze and all-in with the big pairs (AA/KK/QQ by default)
+            if any(self.is_pair(self.my_hand, rank) for rank in self.params.all_in_pairs):
                 self.preflop_aggressor = True
                 return PokerAction.RAISE, remaining_chips  # All-in
-            # Call other opens with hand score > 7
-            if strength > 7.0 and current_bet > 0 and my_bet < current_bet:
+            # Call other opens with hand score above the threshold (5.8 by default)
+            if strength > self.params.call_strength and current_bet > 0 and my_bet < current_bet:
                 return PokerAction.CALL, current_bet - my_bet
+            # Take a free flop with the big blind option instead of folding it
+            if my_bet >= current_bet:
+                return (PokerAction.CHECK, 0) if current_bet == 0 else (PokerAction.CALL, 0)
             # Otherwise fold
             return PokerAction.FOLD, 0
-        # Postflop logic: all-in with top pair or better
-        if self.has_top_pair_or_better(self.my_hand, round_state.community_cards):
+        # Turn and river heads-up: exact equity, enumerated only until both decisions are settled.
+        # With a cold cache this costs about 19 ms per turn decision (up to 35 ms near a threshold)
+        # and about 1 ms on the river, against tens of microseconds on the other streets. Against a
+        # tracked range the turn costs 15 to 35 ms, stopping early the same way.
+        if round_type in ("TURN", "RIVER") and num_opponents == 1 and self.my_hand:
+            to_call = round_state.amount_to_call(self.id)
+            pot_odds = round_state.pot_odds(self.id)
+            all_in_equity = self.params.all_in_equity
+            thresholds = (pot_odds, all_in_equity) if to_call else (all_in_equity,)
+            opponents = self.active_opponents(round_state)
+            if self.range_tracker and len(opponents) == 1:
+                # Against the narrowed range instead of every possible hand
+                equity = hero_equity(self.my_hand, self.range_tracker.range(opponents[0]), round_state.board, thresholds=thresholds, cancel=self.interrupted)
+            else:
+                equity = exact_equity(self.my_hand, round_state.board, thresholds=thresholds, cancel=self.interrupted)
+            if equity >= all_in_equity:
+                return PokerAction.ALL_IN, remaining_chips
+            if to_call == 0:
+                return (PokerAction.CHECK, 0) if current_bet == 0 else (PokerAction.CALL, 0)
+            if equity >= pot_odds:
+                return PokerAction.CALL, to_call
+            return PokerAction.FOLD, 0
+        # Other postflop spots: all-in with top pair or better
+        board = round_state.board_set
+        if self.is_top_pair(self.my_hand, board):
+            if not self.params.top_pair_needs_kicker or self.has_medium_or_better_kicker(self.my_hand, board):
+                return PokerAction.ALL_IN, remaining_chips
+        if self.has_two_pair_or_better(self.my_hand, board):
             return PokerAction.ALL_IN, remaining_chips
         return PokerAction.FOLD, 0
 
     def has_top_pair_or_better(self, hand, community_cards):
-        if not community_cards:
+        board = self.to_card_set(community_cards)
+        return self.is_top_pair(hand, board) or self.has_two_pair_or_better(hand, board)
+
+    def has_two_pair_or_better(self, hand, community_cards):
+        board = self.to_card_set(community_cards)
+        if not board.mask:
             return False
-        evaluator = eval7.Evaluator()
-        board = [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        hand_value = evaluator.evaluate(board, hand)
-        # Find the best possible top pair hand for this board
-        board_ranks = [c.rank for c in board]
-        top_board = max(board_ranks, key=lambda r: eval7.RANKS.index(r))
-        # Try all possible top pair hands with this board
-        top_pair_hands = []
-        for c in hand:
-            if c.rank == top_board:
-                # The other card is kicker
-                for kicker in eval7.RANKS:
-                    if kicker != top_board:
-                        top_pair_hands.append([eval7.Card(f"{top_board}{hand[0].suit}"), eval7.Card(f"{kicker}{hand[1].suit}")])
-        # If our hand is at least as strong as any top pair hand, return True
-        for tp_hand in top_pair_hands:
-            tp_value = evaluator.evaluate(board, tp_hand)
-            if hand_value <= tp_value:
-                return True
-        # If no top pair hand found, fallback to original top pair logic
-        return self.is_top_pair(hand, community_cards)
+        # Two pair or better, counted only if our hole cards improve on the board
+        board_cards = board.cards()
+        hand_type = eval7.evaluate(list(hand) + board_cards) >> HAND_TYPE_SHIFT
+        return hand_type >= TWO_PAIR and hand_type > eval7.evaluate(board_cards) >> HAND_TYPE_SHIFT
 
     def has_medium_or_better_kicker(self, hand, community_cards):
-        # Assume top pair is present, check if kicker is Q or better
-        board = [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        board_ranks = [c.rank for c in board]
-        hand_ranks = [c.rank for c in hand]
-        top_board = max(board_ranks, key=lambda r: eval7.RANKS.index(r))
+        # Assume top pair is present, check if kicker is Q (or the configured rank) or better
+        top_board = self.to_card_set(community_cards).top_rank()
         # Find the kicker (the non-top-pair card)
         for c in hand:
             if c.rank != top_board:
-                # Q or better kicker
-                return eval7.RANKS.index(c.rank) >= eval7.RANKS.index('Q')
+                return c.rank >= self.params.min_kicker_rank
         return False
 
     def has_straight_draw(self, hand, community_cards):
-        # Only open-ended straight draws (OESD): 4 consecutive ranks with two outs
-        all_cards = hand + [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        values = sorted(set([eval7.RANKS.index(c.rank) for c in all_cards]))
-        for i in range(len(values) - 3):
-            # OESD: four consecutive cards, and both ends are open
-            if values[i+3] - values[i] == 3 and values[i+1] - values[i] == 1 and values[i+2] - values[i+1] == 1 and values[i+3] - values[i+2] == 1:
-                # Check that neither the lowest nor highest card is an Ace-low wrap (A234 is not open-ended)
-                # OESD is e.g. 5-6-7-8 (outs: 4 or 9)
-                return True
-        return False
+        # Only open-ended straight draws (OESD): 4 consecutive ranks, e.g. 5-6-7-8 (outs: 4 or 9)
+        return (CardSet.from_cards(hand) | self.to_card_set(community_cards)).has_four_consecutive_ranks()
 
     def board_is_high(self, community_cards):
-        if not community_cards:
-            return False
-        board = [self.card_from_string(c) if isinstance(c, str) else c for c in community_cards]
-        values = [eval7.RANKS.index(c.rank) for c in board]
-        return sum(v >= 8 for v in values) >= 2  # 8 = 'T', so T/J/Q/K/A
+        board = self.to_card_set(community_cards)
+        return board.count_at_least(TEN) >= 2  # T/J/Q/K/A
 
     def on_end_round(self, round_state: RoundStateClient, remaining_chips: int):
         """ Called at the end of the round. """
-        print("Player called on end round")
+        logger.debug("Round end")
+        self.observe(round_state)
 
     def on_end_game(self, round_state: RoundStateClient, player_score: float, all_scores: dict, active_players_hands: dict):
-        print("Player called on end game, with player score: ", player_score)
-        print("All final scores: ", all_scores)
-        print("Active players hands: ", active_players_hands)
\ No newline at end of file
+        logger.debug("Game end: score %s, all scores %s, hands %s", player_score, all_scores, active_players_hands)
+        self.observe(round_state)
+        if self.opponent_stats:
+            self.opponent_stats.end_hand(all_scores, active_players_hands)
+        for player_id, hand in (active_players_hands or {}).items():
+            if str(player_id) != str(self.id) and hand and len(hand) == 2:
+                self.showdown_ranges.setdefault(str(player_id), HandRange.empty()).add(parse_cards(hand))
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Background pondering: bot work started while an opponent is to act.
+
+Only one ponder task runs at a time. Starting a new one cancels the previous
+task, and the runner cancels the current task before asking the bot for its
+action. Ponder work must therefore check its cancel event regularly and
+leave its results somewhere get_action can find them, e.g. a cache.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+from config import PONDER_CANCEL_TIMEOUT
+
+
+class Ponderer:
+    """Runs ponder work on a single background thread."""
+    def __init__(self, cancel_timeout: float = PONDER_CANCEL_TIMEOUT) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            cancel_timeout: Seconds to wait for cancelled work to stop before moving on
+        """
+        self.cancel_timeout = cancel_timeout
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bot-ponder')
+        self.future: Optional[Future] = None
+        self.cancel_event: Optional[threading.Event] = None
+        self.logger = logging.getLogger('Ponderer')
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    def start(self, work: Callable[..., Any], *args: Any) -> None:
+        """
+        Cancel any running work without waiting for it and start new work.
+
+        The new work runs once the cancelled work has returned.
+
+        Args:
+            work: Callable run as work(*args, cancel_event)
+            args: Arguments passed before the cancel event
+        """
+        self.cancel(wait_for_stop=False)
+        self.cancel_event = threading.Event()
+        self.future = self.executor.submit(work, *args, self.cancel_event)
+        self.started += 1
+
+    def cancel(self, wait_for_stop: bool = True) -> Optional[bool]:
+        """
+        Ask the running work to stop.
+
+        Args:
+            wait_for_stop: Block up to cancel_timeout until the work returns
+
+        Returns:
+            Optional[bool]: True if the work had already completed, False if it
+            was cancelled, None if no work was started since the last cancel
+        """
+        future = self.future
+        if future is None:
+            return None
+        self.future = None
+        if future.done():
+            self.completed += 1
+            self._report(future)
+            return True
+        self.cancel_event.set()
+        self.cancelled += 1
+        if wait_for_stop:
+            done, _ = wait([future], timeout=self.cancel_timeout)
+            if not done:
+                self.logger.warning("Ponder work did not stop within %ss", self.cancel_timeout)
+        future.add_done_callback(self._report)
+        return False
+
+    def _report(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error("Ponder work failed: %s", future.exception())
+
+    def shutdown(self) -> None:
+        """Cancel any running work and stop the worker thread."""
+        self.cancel(wait_for_stop=False)
+        self.executor.shutdown(wait=False)
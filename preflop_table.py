@@ -0,0 +1,133 @@
+"""
+Precomputed all-in equities of the 169 starting-hand classes against 1 to 9
+random opponents, read from a memory-mapped binary table.
+
+The table is produced by gen_preflop_table.py. Layout (little-endian):
+
+    magic        4 bytes   b'PFEQ'
+    version      uint8
+    max_opps     uint8     number of opponent counts stored (9)
+    classes      uint16    number of hand classes (169)
+    equities     uint16 * max_opps * classes, equity scaled to 0..65535,
+                 row per opponent count, column per hand class index
+"""
+import logging
+import mmap
+import os
+import struct
+from typing import List, Optional, Sequence
+
+import eval7
+
+from config import PREFLOP_TABLE_FILE
+
+MAGIC = b'PFEQ'
+VERSION = 1
+HEADER = struct.Struct('<4sBBH')
+ENTRY = struct.Struct('<H')
+SCALE = 65535
+NUM_CLASSES = 169
+MAX_OPPONENTS = 9
+
+logger = logging.getLogger('PreflopTable')
+
+
+def hand_class_index(hand: Sequence[eval7.Card]) -> int:
+    """
+    Index of a starting hand in the 13x13 class grid: pairs on the
+    diagonal, suited hands above it (high rank row) and offsuit hands
+    below it (low rank row).
+    """
+    first, second = hand[0], hand[1]
+    high, low = max(first.rank, second.rank), min(first.rank, second.rank)
+    if first.suit == second.suit and high != low:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class_name(index: int) -> str:
+    """Name of a hand class, e.g. 'AKs', 'T9o' or '77'."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return eval7.ranks[row] * 2
+    if row > col:
+        return eval7.ranks[row] + eval7.ranks[col] + 's'
+    return eval7.ranks[col] + eval7.ranks[row] + 'o'
+
+
+def class_representative(index: int) -> List[eval7.Card]:
+    """A concrete hand belonging to a class, used when generating the table."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return [eval7.Card(eval7.ranks[row] + 's'), eval7.Card(eval7.ranks[row] + 'h')]
+    if row > col:
+        return [eval7.Card(eval7.ranks[row] + 's'), eval7.Card(eval7.ranks[col] + 's')]
+    return [eval7.Card(eval7.ranks[col] + 's'), eval7.Card(eval7.ranks[row] + 'h')]
+
+
+def write_table(path: str, equities: Sequence[Sequence[float]]) -> None:
+    """
+    Write a table file.
+
+    Args:
+        path: Destination file
+        equities: One row of 169 equities per opponent count, starting at 1
+    """
+    # Written aside and renamed, so processes that have the old table mapped keep a valid file
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(equities), NUM_CLASSES))
+        for row in equities:
+            if len(row) != NUM_CLASSES:
+                raise ValueError(f"Expected {NUM_CLASSES} equities per row, got {len(row)}")
+            file.write(struct.pack(f'<{NUM_CLASSES}H', *(round(equity * SCALE) for equity in row)))
+    os.replace(temp_path, path)
+
+
+class PreflopTable:
+    """Read-only view of a table file, shared between processes through mmap."""
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_opponents, classes = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION or classes != NUM_CLASSES:
+            raise ValueError(f"Unsupported preflop table: {path}")
+        expected = HEADER.size + self.max_opponents * NUM_CLASSES * ENTRY.size
+        if len(self.buffer) != expected:
+            raise ValueError(f"Truncated preflop table: {path}")
+
+    def equity(self, hand: Sequence[eval7.Card], num_opponents: int = 1) -> float:
+        """Equity of a hand against random opponents, opponent count clamped to the table."""
+        num_opponents = min(max(num_opponents, 1), self.max_opponents)
+        offset = HEADER.size + ((num_opponents - 1) * NUM_CLASSES + hand_class_index(hand)) * ENTRY.size
+        return ENTRY.unpack_from(self.buffer, offset)[0] / SCALE
+
+
+def _load_table(path: str) -> Optional[PreflopTable]:
+    if not os.path.exists(path):
+        logger.warning("Preflop table not found at %s, run gen_preflop_table.py to create it", path)
+        return None
+    return PreflopTable(path)
+
+
+# Mapped once at import time, the pages are shared by every bot process
+TABLE = _load_table(PREFLOP_TABLE_FILE)
+
+
+def preflop_equity(hand: Sequence[eval7.Card], num_opponents: int = 1) -> float:
+    """
+    Look up the all-in equity of a starting hand.
+
+    Falls back to a Monte Carlo estimate when the table file is missing.
+
+    Args:
+        hand: The two hole cards
+        num_opponents: Number of opponents holding random hands (1 to 9)
+
+    Returns:
+        float: Share of the pot won on average, between 0 and 1
+    """
+    if TABLE is not None:
+        return TABLE.equity(hand, num_opponents)
+    from equity import estimate_equity
+    return estimate_equity(hand, (), num_opponents)
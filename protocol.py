@@ -0,0 +1,182 @@
+"""
+Wire protocol helpers: newline-delimited JSON frames read from the server,
+and newline-framed action messages written back to it.
+
+Bytes are received straight into a preallocated chunk with recv_into and
+appended to one reusable bytearray; complete lines are cut out of it in a
+single pass and decoded without going through str. Decoding uses orjson when
+it is installed and falls back to the standard json module otherwise.
+"""
+import json
+import numbers
+import socket
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+from type.message import MessageType
+
+# Bytes requested per recv_into call
+RECV_BUFFER_SIZE = 65536
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both backends
+DecodeError = json.JSONDecodeError
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+Frame = Union[bytes, bytearray, str]
+
+
+def decode(frame: Frame) -> Any:
+    """
+    Decode one JSON frame.
+
+    Args:
+        frame: A single message, without the trailing newline
+
+    Returns:
+        Any: The decoded message
+    """
+    if orjson is not None:
+        return orjson.loads(frame)
+    return json.loads(frame)
+
+
+class FrameDecoder:
+    """
+    Splits a byte stream into newline-delimited frames, keeping any
+    incomplete trailing frame until more bytes arrive.
+    """
+    def __init__(self, chunk_size: int = RECV_BUFFER_SIZE) -> None:
+        """
+        Initialize empty buffers.
+
+        Args:
+            chunk_size: Bytes requested per recv_into call
+        """
+        self.buffer = bytearray()
+        self.chunk = bytearray(chunk_size)
+        self.view = memoryview(self.chunk)
+        self.bytes_received = 0
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[bytes]:
+        """
+        Add received bytes and cut out every complete frame.
+
+        Args:
+            data: Bytes read from the socket
+
+        Returns:
+            List[bytes]: Complete frames, without newlines, empty lines skipped
+        """
+        buffer = self.buffer
+        self.bytes_received += len(data)
+        # Only the new bytes can hold a newline that ends a frame
+        search_from = len(buffer)
+        buffer += data
+        end = buffer.find(b'\n', search_from)
+        if end < 0:
+            return []
+        frames = []
+        start = 0
+        # Slicing the view copies each frame once, a bytearray slice would copy it twice.
+        # The view must be released before the buffer is resized.
+        with memoryview(buffer) as view:
+            while end >= 0:
+                if end > start:
+                    frames.append(view[start:end].tobytes())
+                start = end + 1
+                end = buffer.find(b'\n', start)
+        del buffer[:start]
+        return frames
+
+    def recv_from(self, sock) -> Optional[List[bytes]]:
+        """
+        Receive once from a socket and return the frames it completed.
+
+        Args:
+            sock: Connected socket
+
+        Returns:
+            Optional[List[bytes]]: Complete frames, None when the peer closed the connection
+        """
+        received = sock.recv_into(self.chunk)
+        if not received:
+            return None
+        return self.feed(self.view[:received])
+
+    def pending(self) -> int:
+        """Number of buffered bytes not yet ending in a newline."""
+        return len(self.buffer)
+
+
+def set_nodelay(sock) -> bool:
+    """
+    Disable Nagle's algorithm, so small action messages leave immediately
+    instead of waiting for the previous segment to be acknowledged.
+
+    Returns:
+        bool: True if the option was set
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+def _is_integer(value: Any) -> bool:
+    """Whether %d writes the value unchanged: ints, numpy integers included, but not bools."""
+    return isinstance(value, numbers.Integral) and not isinstance(value, bool)
+
+
+class ActionWriter:
+    """
+    Serializes player actions from precomputed byte templates and writes them
+    as newline-terminated frames. The output is byte-for-byte what json.dumps
+    produces for the same message, plus the newline; actions or amounts that
+    are not plain ints are serialized with json.dumps itself.
+    """
+    def __init__(self) -> None:
+        # Player ID -> message bytes up to the action value
+        self.prefixes: Dict[Any, bytes] = {}
+        self.actions_sent = 0
+        self.bytes_sent = 0
+
+    def encode(self, player_id: Any, action: int, amount: int) -> bytes:
+        """
+        Serialize a player action message.
+
+        Args:
+            player_id: The ID of the player, as received from the server
+            action: Action code
+            amount: Bet amount
+
+        Returns:
+            bytes: The framed message, ending in a newline
+        """
+        if not _is_integer(action) or not _is_integer(amount):
+            # %d would truncate a float amount and write a bool as 0 or 1, json.dumps keeps them as they are
+            message = {'type': MessageType.PLAYER_ACTION.value, 'message': {'player_id': player_id, 'action': action, 'amount': amount}}
+            return json.dumps(message).encode('utf-8') + b'\n'
+        prefix = self.prefixes.get(player_id)
+        if prefix is None:
+            prefix = self.prefixes[player_id] = b'{"type": %d, "message": {"player_id": %s, "action": ' % (
+                MessageType.PLAYER_ACTION.value, json.dumps(player_id).encode('utf-8'))
+        return prefix + b'%d, "amount": %d}}\n' % (action, amount)
+
+    def send(self, sock, player_id: Any, action: int, amount: int) -> int:
+        """
+        Write one action to a socket, retrying partial writes until it is sent.
+
+        Returns:
+            int: Bytes sent
+        """
+        data = self.encode(player_id, action, amount)
+        sock.sendall(data)
+        self.actions_sent += 1
+        self.bytes_sent += len(data)
+        return len(data)
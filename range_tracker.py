@@ -0,0 +1,217 @@
+"""
+Bayesian narrowing of opponent ranges from their observed actions.
+
+Every opponent starts a hand with a uniform HandRange (minus our own
+cards), and loses the combos holding a board card as each street is
+dealt. Each new action seen in a round state multiplies the range by the
+likelihood of that action for every combo, a function of the combo's
+strength percentile: raises favour strong combos, calls medium ones and
+checks weak ones, with a floor so that bluffs and slow plays never drop
+out entirely.
+
+Strength percentiles are computed once per street and shared by all
+opponents (preflop from the preflop equity table, postflop from the made
+hand on the current board), so an update is one multiplication of 1326
+weights.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import eval7
+import numpy as np
+
+from batch_eval import card_indices, evaluate_batch
+from hand_range import CARD_COMBOS, COMBO_CLASS, blocked_combos, COMBOS, NUM_COMBOS, HandRange
+from opponent_stats import AGGRESSIVE_ACTIONS, OpponentStatsStore, blind_posts, is_blind_post
+from preflop_table import NUM_CLASSES, class_representative, preflop_equity
+from type.poker_action import PokerAction
+from type.round_state import RoundStateClient
+
+# Likelihood of any action for the least likely combo
+LIKELIHOOD_FLOOR = 0.1
+# Percentile width of the transition between unlikely and likely combos
+LIKELIHOOD_WIDTH = 0.08
+# Strength percentiles above which calls and raises become likely, (call, raise)
+PREFLOP_THRESHOLDS = (0.5, 0.8)
+POSTFLOP_THRESHOLDS = (0.35, 0.65)
+# Hands of history needed before preflop thresholds follow the opponent's VPIP and PFR
+MIN_PROFILE_HANDS = 30
+
+
+@lru_cache(maxsize=None)
+def preflop_strength() -> np.ndarray:
+    """Heads-up preflop equity of every combo, from the preflop table."""
+    class_equity = np.array([preflop_equity(class_representative(index)) for index in range(NUM_CLASSES)])
+    return class_equity[COMBO_CLASS]
+
+
+def postflop_strength(board: Sequence[eval7.Card]) -> np.ndarray:
+    """Made hand score of every combo on the board, -1 for combos holding a board card."""
+    board_indices = card_indices(board)
+    live = ~CARD_COMBOS[board_indices].any(axis=0)
+    strength = np.full(NUM_COMBOS, -1, dtype=np.int64)
+    strength[live] = evaluate_batch(np.concatenate([COMBOS[live], np.broadcast_to(board_indices, (int(live.sum()), len(board_indices)))], axis=1))
+    return strength
+
+
+def strength_percentiles(strength: np.ndarray, live: np.ndarray) -> np.ndarray:
+    """Share of the live combos each combo beats, ties counted half."""
+    ordered = np.sort(strength[live])
+    if not len(ordered):
+        return np.zeros(NUM_COMBOS)
+    below = np.searchsorted(ordered, strength, side='left')
+    at_or_below = np.searchsorted(ordered, strength, side='right')
+    return (below + at_or_below) / (2 * len(ordered))
+
+
+def action_likelihood(action: str, percentiles: np.ndarray, thresholds: Tuple[float, float]) -> Optional[np.ndarray]:
+    """
+    Likelihood of an action for every combo.
+
+    Args:
+        action: PokerAction name
+        percentiles: Strength percentile of every combo
+        thresholds: Percentiles (call, raise) around which calls and raises become likely
+
+    Returns:
+        Optional[np.ndarray]: 1326 likelihoods, None for actions that say nothing about the hand
+    """
+    call_threshold, raise_threshold = thresholds
+    if action in AGGRESSIVE_ACTIONS:
+        likely = 1 / (1 + np.exp(-(percentiles - raise_threshold) / LIKELIHOOD_WIDTH))
+    elif action == PokerAction.CALL.name:
+        likely = 1 / (1 + np.exp(-(percentiles - call_threshold) / LIKELIHOOD_WIDTH))
+    elif action == PokerAction.CHECK.name:
+        likely = 1 / (1 + np.exp((percentiles - raise_threshold) / LIKELIHOOD_WIDTH))
+    else:
+        return None
+    return LIKELIHOOD_FLOOR + (1 - LIKELIHOOD_FLOOR) * likely
+
+
+class RangeTracker:
+    """
+    Per-opponent ranges narrowed by every action they take.
+
+    Call begin_hand from on_start and observe with every round state.
+    """
+    def __init__(self, opponent_stats: Optional[OpponentStatsStore] = None) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            opponent_stats: Optional store whose VPIP and PFR set each opponent's preflop thresholds
+        """
+        self.opponent_stats = opponent_stats
+        self.hero_id: Optional[str] = None
+        self.blind_amount = 0
+        self.blind_posts: Dict[str, int] = {}
+        self.dead = np.zeros(NUM_COMBOS, dtype=bool)
+        self.ranges: Dict[str, HandRange] = {}
+        # Last (street, action, bet) seen per opponent, to apply each action once
+        self.last_seen: Dict[str, Tuple[str, str, int]] = {}
+        # Strength percentiles of the current street, keyed by (street, board)
+        self.percentiles_key: Optional[Tuple[str, Tuple[int, ...]]] = None
+        self.percentiles = np.zeros(NUM_COMBOS)
+        # Board the ranges were last cleared of
+        self.board_key: Tuple[int, ...] = ()
+        self.updates = 0
+
+    def begin_hand(self, hero_id: Any, players: Iterable[Any], blind_amount: int, hero_hand: Optional[Sequence[eval7.Card]] = None, small_blind_id: Any = None, big_blind_id: Any = None) -> None:
+        """
+        Reset every opponent to a uniform range.
+
+        Args:
+            hero_id: Our own player ID, never tracked
+            players: Every player dealt into the hand
+            blind_amount: Big blind
+            hero_hand: Our hole cards, removed from every range
+            small_blind_id: Small blind player ID, its first raise up to half the big blind is its post
+            big_blind_id: Big blind player ID, its first raise up to the big blind is its post
+        """
+        self.hero_id = str(hero_id)
+        self.blind_amount = blind_amount
+        self.blind_posts = blind_posts(blind_amount, small_blind_id, big_blind_id)
+        self.dead = CARD_COMBOS[card_indices(hero_hand)].any(axis=0) if hero_hand else np.zeros(NUM_COMBOS, dtype=bool)
+        uniform = np.where(self.dead, 0.0, 1.0 / np.count_nonzero(~self.dead))
+        self.ranges = {str(player_id): HandRange(uniform) for player_id in players if str(player_id) != self.hero_id}
+        self.last_seen = {}
+        self.percentiles_key = None
+        self.board_key = ()
+
+    def observe(self, round_state: RoundStateClient) -> int:
+        """
+        Apply the actions that are new since the last observed state.
+
+        Args:
+            round_state: Any state received during the hand
+
+        Returns:
+            int: Number of range updates applied
+        """
+        street = round_state.round.upper()
+        bets = round_state.player_bets
+        self._remove_board(round_state.board)
+        applied = 0
+        for player_id, action in round_state.player_actions.items():
+            hand_range = self.ranges.get(player_id)
+            if hand_range is None or not action:
+                continue
+            action = str(action).upper()
+            bet = bets.get(player_id, 0)
+            seen = (street, action, bet)
+            previous = self.last_seen.get(player_id)
+            if previous == seen:
+                continue
+            self.last_seen[player_id] = seen
+            if street == 'PREFLOP' and is_blind_post(self.blind_posts, self.blind_amount, player_id, previous is None, action, bet):
+                continue
+            likelihood = action_likelihood(action, self._percentiles(street, round_state.board), self._thresholds(player_id, street))
+            if likelihood is None:
+                continue
+            weights = hand_range.weights * likelihood
+            total = weights.sum()
+            if total > 0:
+                hand_range.weights = weights / total
+                applied += 1
+        self.updates += applied
+        return applied
+
+    def range(self, player_id: Any) -> HandRange:
+        """Current range of an opponent, uniform if not tracked."""
+        hand_range = self.ranges.get(str(player_id))
+        return hand_range if hand_range is not None else HandRange(np.where(self.dead, 0.0, 1.0))
+
+    def _remove_board(self, board: Sequence[eval7.Card]) -> None:
+        """Zero the combos holding a board card, once for every new street."""
+        key = tuple(card.mask for card in board)
+        if key == self.board_key:
+            return
+        self.board_key = key
+        self.dead = self.dead | blocked_combos(board)
+        for hand_range in self.ranges.values():
+            weights = np.where(self.dead, 0.0, hand_range.weights)
+            total = weights.sum()
+            if total > 0:
+                hand_range.weights = weights / total
+
+    def _percentiles(self, street: str, board: Sequence[eval7.Card]) -> np.ndarray:
+        key = (street, tuple(card.mask for card in board))
+        if key != self.percentiles_key:
+            if board:
+                strength = postflop_strength(board)
+                live = (strength >= 0) & ~self.dead
+            else:
+                strength = preflop_strength()
+                live = ~self.dead
+            self.percentiles = strength_percentiles(strength, live)
+            self.percentiles_key = key
+        return self.percentiles
+
+    def _thresholds(self, player_id: str, street: str) -> Tuple[float, float]:
+        if street != 'PREFLOP':
+            return POSTFLOP_THRESHOLDS
+        if self.opponent_stats is not None:
+            profile = self.opponent_stats.get(player_id)
+            if profile.hands >= MIN_PROFILE_HANDS:
+                return 1 - profile.vpip, 1 - profile.pfr
+        return PREFLOP_THRESHOLDS
@@ -0,0 +1,75 @@
+"""
+Append-only recording of the raw message stream received from the server.
+
+Each record is one line: the receive time as seconds since the epoch, a tab,
+and the raw JSON message exactly as received. Files ending in '.gz' are
+gzip-compressed; appending to an existing recording adds a new gzip member,
+which readers see as one continuous stream. The runner flushes the recording
+at the end of every game, so an unclosed recording reads up to the last game.
+"""
+import gzip
+import time
+from typing import IO, Iterator, Optional, Tuple, Union
+
+
+def _open(path: str, mode: str, compress: Optional[bool]) -> IO[bytes]:
+    if compress is None:
+        compress = path.endswith('.gz')
+    return gzip.open(path, mode) if compress else open(path, mode)
+
+
+class MessageRecorder:
+    """Writes inbound server messages with timestamps to a recording file."""
+    def __init__(self, path: str, compress: Optional[bool] = None) -> None:
+        """
+        Open a recording for appending.
+
+        Args:
+            path: Recording file, created if missing
+            compress: Gzip the recording, decided by the '.gz' suffix when None
+        """
+        self.path = path
+        self.file = _open(path, 'ab', compress)
+        self.records = 0
+
+    def record(self, message: Union[str, bytes], timestamp: Optional[float] = None) -> None:
+        """
+        Append one raw message.
+
+        Args:
+            message: A single message line as received, without the newline
+            timestamp: Receive time, defaults to now
+        """
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        stamp = b'%.6f\t' % (time.time() if timestamp is None else timestamp)
+        self.file.write(stamp + message + b'\n')
+        self.records += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_recording(path: str, compress: Optional[bool] = None) -> Iterator[Tuple[float, str]]:
+    """
+    Iterate over the records of a recording.
+
+    Args:
+        path: Recording file
+        compress: Whether the file is gzipped, decided by the '.gz' suffix when None
+
+    Yields:
+        Tuple[float, str]: Receive timestamp and raw message
+    """
+    with _open(path, 'rb', compress) as file:
+        try:
+            for line in file:
+                stamp, _, message = line.rstrip(b'\n').partition(b'\t')
+                if message:
+                    yield float(stamp), message.decode('utf-8')
+        except EOFError:
+            # A gzip recording still open, or cut off by a crash, ends after its last flush
+            return
@@ -0,0 +1,128 @@
+import argparse
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from protocol import DecodeError, decode
+from recorder import read_recording
+from runner import Runner
+from type.poker_action import PokerAction
+
+
+class StubSocket:
+    """Stands in for the server socket and keeps every action the bot sends."""
+    def __init__(self) -> None:
+        self.sent: List[bytes] = []
+
+    def send(self, data: bytes) -> int:
+        self.sent.append(data)
+        return len(data)
+
+    def sendall(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    def setsockopt(self, *args: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayRunner(Runner):
+    """
+    Runner fed from a recording instead of a live server, so a new bot can be
+    re-evaluated against captured games as fast as it can decide.
+    """
+    def __init__(self, result_path: str = os.devnull) -> None:
+        """
+        Initialize the runner with a stubbed socket.
+
+        Args:
+            result_path: File the game results are appended to
+        """
+        super().__init__('replay', 0, result_path, sim=True)
+        self.client_socket.close()
+        self.client_socket = StubSocket()
+        # Keep the metrics in memory instead of overwriting the live client's export
+        self.metrics_prom_path = None
+        self.metrics_json_path = None
+
+    def write_to_file(self, filename: str, data: str) -> None:
+        """Leave the live player ID file alone during a replay."""
+        self.logger.debug("Replay: skipped writing to %s", filename)
+
+    def replay(self, path: str) -> int:
+        """
+        Feed every message of a recording through the message handlers.
+
+        Args:
+            path: Recording file written by MessageRecorder
+
+        Returns:
+            int: Number of messages replayed
+        """
+        count = 0
+        for _, line in read_recording(path):
+            try:
+                self._process_message(decode(line))
+            except DecodeError:
+                self.logger.error("Error decoding message: %s", line)
+            except Exception as e:
+                self.logger.exception("Error processing message: %s", e)
+            count += 1
+        return count
+
+    def sent_actions(self) -> List[Dict[str, Any]]:
+        """The action messages sent by the bot, decoded."""
+        return [json.loads(data)['message'] for data in self.client_socket.sent]
+
+
+def replay_files(paths: List[str], bot_factory, result_path: str = os.devnull) -> Dict[str, Any]:
+    """
+    Replay recordings against fresh bots and summarize the decisions made.
+
+    Args:
+        paths: Recording files
+        bot_factory: Callable returning a new bot for each recording
+        result_path: File the game results are appended to
+
+    Returns:
+        Dict[str, Any]: Message, game and action counts and the elapsed time
+    """
+    start = time.perf_counter()
+    messages = 0
+    games = 0
+    actions: Counter = Counter()
+    for path in paths:
+        runner = ReplayRunner(result_path)
+        runner.set_bot(bot_factory())
+        messages += runner.replay(path)
+        games += runner.get_game_count()
+        actions.update(PokerAction(action['action']).name for action in runner.sent_actions())
+    return {
+        'recordings': len(paths),
+        'messages': messages,
+        'games': games,
+        'actions': dict(actions),
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def main(paths: List[str]) -> None:
+    """Replay recordings against SimplePlayer and print a summary."""
+    from player import SimplePlayer
+
+    logging.getLogger('PokerRunner').setLevel(logging.WARNING)
+    summary = replay_files(paths, SimplePlayer)
+    print(f"Replayed {summary['messages']} messages from {summary['recordings']} recordings in {summary['elapsed']:.2f}s")
+    print(f"Games: {summary['games']}, actions: {summary['actions']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded server streams against a bot")
+    parser.add_argument('recordings', nargs='+', help='Recording files written with main.py --record')
+    args = parser.parse_args()
+    main(args.recordings)
@@ -0,0 +1,342 @@
+# python results_store.py --window 1000
+# python results_store.py compact
+
+"""
+Structured game results, stored for fast aggregation.
+
+Every game is one JSON line in an append-only log: session, game number,
+time, our player ID, our score and the score of every player. Lines are
+buffered and written in batches. When a run closes its writer with enough
+games logged, or on `python results_store.py compact`, the log is folded
+into a columnar file, one NumPy array per column in an .npz that is
+replaced atomically, and the log starts over. Readers load the columns plus
+the short log tail, so totals, per-opponent breakdowns and rolling windows
+over millions of games are plain array operations.
+
+Several processes may share the files: appends and compactions hold an
+exclusive lock on a lock file next to the log, readers a shared one, so
+no game is appended between a compaction reading the log and emptying it.
+
+Player IDs are stored as codes into a name table, so the columns stay
+numeric whatever the server uses as IDs.
+"""
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from config import RESULTS_COLUMNS_FILE, RESULTS_COMPACT_GAMES, RESULTS_FLUSH_GAMES, RESULTS_LOG_FILE
+
+
+@dataclass
+class ResultsTable:
+    """Game results as columns; opponent rows point into the game rows."""
+    session: np.ndarray  # int64, one session per runner
+    game: np.ndarray  # int64, game number within the session
+    time: np.ndarray  # float64, seconds since the epoch
+    player: np.ndarray  # int32 code of our player ID
+    score: np.ndarray  # float64, our chips won
+    opponent_row: np.ndarray  # int64 index of the game row
+    opponent: np.ndarray  # int32 code of the opponent's player ID
+    opponent_score: np.ndarray  # float64, the opponent's chips won
+    names: np.ndarray  # Player ID per code
+
+    def __len__(self) -> int:
+        return len(self.game)
+
+    def select(self, mask: np.ndarray) -> 'ResultsTable':
+        """Table with only the game rows where mask is True, and their opponents."""
+        new_row = np.cumsum(mask) - 1
+        kept = mask[self.opponent_row]
+        return ResultsTable(self.session[mask], self.game[mask], self.time[mask], self.player[mask], self.score[mask],
+                            new_row[self.opponent_row[kept]], self.opponent[kept], self.opponent_score[kept], self.names)
+
+    def latest_session(self) -> 'ResultsTable':
+        """Games of the session that ended last."""
+        if not len(self):
+            return self
+        return self.select(self.session == self.session[-1])
+
+
+def empty_table() -> ResultsTable:
+    return ResultsTable(np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.float64), np.zeros(0, np.int32),
+                        np.zeros(0, np.float64), np.zeros(0, np.int64), np.zeros(0, np.int32), np.zeros(0, np.float64),
+                        np.array([], dtype=str))
+
+
+def load_columns(path: str = RESULTS_COLUMNS_FILE) -> ResultsTable:
+    """Load the columnar file, an empty table if it does not exist."""
+    if not os.path.exists(path):
+        return empty_table()
+    with np.load(path) as columns:
+        return ResultsTable(**{name: columns[name] for name in ResultsTable.__dataclass_fields__})
+
+
+def save_columns(table: ResultsTable, path: str = RESULTS_COLUMNS_FILE) -> None:
+    """Write the columnar file aside and rename it, so readers never see a partial file."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        np.savez(file, **{name: getattr(table, name) for name in ResultsTable.__dataclass_fields__})
+    os.replace(temp_path, path)
+
+
+def read_log(path: str = RESULTS_LOG_FILE) -> List[Dict[str, Any]]:
+    """Records of the JSONL log, skipping a torn last line."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def append_records(table: ResultsTable, records: Iterable[Dict[str, Any]]) -> ResultsTable:
+    """Table with the log records added after the existing rows."""
+    names = list(table.names)
+    codes = {name: code for code, name in enumerate(names)}
+
+    def code(name: Any) -> int:
+        name = str(name)
+        if name not in codes:
+            codes[name] = len(names)
+            names.append(name)
+        return codes[name]
+
+    session, game, times, player, score = [], [], [], [], []
+    opponent_row, opponent, opponent_score = [], [], []
+    row = len(table)
+    for record in records:
+        me = str(record['player'])
+        session.append(record['session'])
+        game.append(record['game'])
+        times.append(record['time'])
+        player.append(code(me))
+        score.append(record['score'])
+        for player_id, other_score in record.get('scores', {}).items():
+            if str(player_id) != me:
+                opponent_row.append(row)
+                opponent.append(code(player_id))
+                opponent_score.append(other_score)
+        row += 1
+    if row == len(table):
+        return table
+    return ResultsTable(
+        np.concatenate([table.session, np.array(session, np.int64)]),
+        np.concatenate([table.game, np.array(game, np.int64)]),
+        np.concatenate([table.time, np.array(times, np.float64)]),
+        np.concatenate([table.player, np.array(player, np.int32)]),
+        np.concatenate([table.score, np.array(score, np.float64)]),
+        np.concatenate([table.opponent_row, np.array(opponent_row, np.int64)]),
+        np.concatenate([table.opponent, np.array(opponent, np.int32)]),
+        np.concatenate([table.opponent_score, np.array(opponent_score, np.float64)]),
+        np.array(names, dtype=str),
+    )
+
+
+@contextmanager
+def log_lock(log_path: str, exclusive: bool = True) -> Iterator[None]:
+    """Hold the lock shared by every process using this log, a no-op without fcntl."""
+    if fcntl is None:
+        yield
+        return
+    with open(log_path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_results(log_path: str = RESULTS_LOG_FILE, columns_path: str = RESULTS_COLUMNS_FILE) -> ResultsTable:
+    """Every stored game: the columnar file followed by the log tail."""
+    with log_lock(log_path, exclusive=False):
+        return append_records(load_columns(columns_path), read_log(log_path))
+
+
+def session_marker(result_path: str) -> str:
+    """File next to a run's result file naming the session its games were stored under."""
+    return result_path + '.session'
+
+
+def write_session_marker(result_path: str, session: int) -> None:
+    with open(session_marker(result_path), 'w') as file:
+        file.write(str(session))
+
+
+def read_session_marker(result_path: str) -> Optional[int]:
+    """Session of the run that wrote the result file, None if that run did not use the store."""
+    path = session_marker(result_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return int(file.read())
+
+
+def compact(log_path: str = RESULTS_LOG_FILE, columns_path: str = RESULTS_COLUMNS_FILE) -> int:
+    """
+    Fold the log into the columnar file and empty the log.
+
+    Appends from other writers wait on the lock until the log is emptied.
+    The log is emptied only after the new columnar file is in place, so a
+    crash in between can count the last logged games twice but never loses
+    them.
+
+    Returns:
+        int: Games in the columnar file
+    """
+    with log_lock(log_path):
+        table = append_records(load_columns(columns_path), read_log(log_path))
+        save_columns(table, columns_path)
+        open(log_path, 'w').close()
+    return len(table)
+
+
+class ResultsWriter:
+    """Appends game results to the log in batches and compacts it when closed."""
+    def __init__(self, log_path: str = RESULTS_LOG_FILE, columns_path: str = RESULTS_COLUMNS_FILE, session: Optional[int] = None, flush_every: int = RESULTS_FLUSH_GAMES, compact_every: int = RESULTS_COMPACT_GAMES) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            log_path: JSONL log, created if missing
+            columns_path: Columnar file the log is compacted into
+            session: ID shared by every game of this run, the start time in nanoseconds when None
+            flush_every: Games buffered before a write
+            compact_every: Games in the log that trigger a compaction on close, 0 to never compact
+        """
+        self.log_path = log_path
+        self.columns_path = columns_path
+        self.session = time.time_ns() if session is None else session
+        self.flush_every = flush_every
+        self.compact_every = compact_every
+        self.buffer: List[str] = []
+        self.logged = 0
+        if os.path.exists(log_path):
+            with open(log_path, 'rb') as file:
+                self.logged = sum(1 for _ in file)
+
+    def add(self, game: int, player_id: Any, score: float, all_scores: Dict[str, float]) -> None:
+        """
+        Record one finished game.
+
+        Args:
+            game: Game number within the session
+            player_id: Our player ID
+            score: Chips we won
+            all_scores: Chips won by every player, keyed by player ID
+        """
+        record = {
+            'session': self.session,
+            'game': game,
+            'time': time.time(),
+            'player': str(player_id),
+            'score': score,
+            'scores': {str(other): other_score for other, other_score in (all_scores or {}).items()},
+        }
+        self.buffer.append(json.dumps(record, separators=(',', ':')))
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered games."""
+        if self.buffer:
+            with log_lock(self.log_path), open(self.log_path, 'a') as file:
+                file.write('\n'.join(self.buffer) + '\n')
+            self.logged += len(self.buffer)
+            self.buffer = []
+
+    def close(self) -> None:
+        """
+        Write the buffered games and compact the log if it has grown enough.
+
+        Compaction rewrites the whole columnar file, so it runs here at the end
+        of a run rather than between games.
+        """
+        self.flush()
+        if self.compact_every and self.logged >= self.compact_every:
+            compact(self.log_path, self.columns_path)
+            self.logged = 0
+
+
+def summarize(table: ResultsTable) -> Dict[str, float]:
+    """Game count, total, mean, spread and extremes of our score."""
+    if not len(table):
+        return {'games': 0, 'total': 0.0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0}
+    score = table.score
+    return {
+        'games': len(table),
+        'total': float(score.sum()),
+        'mean': float(score.mean()),
+        'std': float(score.std(ddof=1)) if len(score) > 1 else 0.0,
+        'min': float(score.min()),
+        'max': float(score.max()),
+    }
+
+
+def by_opponent(table: ResultsTable) -> List[Dict[str, Any]]:
+    """Games, our total and mean, and the opponent's total per opponent, most games first."""
+    size = len(table.names)
+    games = np.bincount(table.opponent, minlength=size)
+    ours = np.bincount(table.opponent, weights=table.score[table.opponent_row], minlength=size)
+    theirs = np.bincount(table.opponent, weights=table.opponent_score, minlength=size)
+    rows = [{
+        'opponent': str(table.names[code]),
+        'games': int(games[code]),
+        'our_total': float(ours[code]),
+        'our_mean': float(ours[code] / games[code]),
+        'their_total': float(theirs[code]),
+    } for code in np.flatnonzero(games)]
+    return sorted(rows, key=lambda row: row['games'], reverse=True)
+
+
+def rolling(table: ResultsTable, window: int) -> Dict[str, float]:
+    """Mean score over the last window games, and the best and worst window."""
+    if len(table) < window or window < 1:
+        return {}
+    cumulative = np.concatenate([[0.0], np.cumsum(table.score)])
+    means = (cumulative[window:] - cumulative[:-window]) / window
+    return {'window': window, 'last': float(means[-1]), 'best': float(means.max()), 'worst': float(means.min())}
+
+
+def main(command: str, all_sessions: bool, window: int, top: int) -> None:
+    start = time.perf_counter()
+    if command == 'compact':
+        print(f"Compacted {compact()} games into {RESULTS_COLUMNS_FILE}")
+        return
+    table = load_results()
+    if not all_sessions:
+        table = table.latest_session()
+    summary = summarize(table)
+    print(f"Games: {summary['games']}, Total: {summary['total']:g}, Average: {summary['mean']:.2f}, "
+          f"Std: {summary['std']:.2f}, Min: {summary['min']:g}, Max: {summary['max']:g}")
+    windows = rolling(table, window)
+    if windows:
+        print(f"Last {window} games: {windows['last']:.2f}/game, best window {windows['best']:.2f}, worst window {windows['worst']:.2f}")
+    for row in by_opponent(table)[:top]:
+        print(f"  vs {row['opponent']:<10} games {row['games']:>9}  our total {row['our_total']:>12g}  "
+              f"our mean {row['our_mean']:>9.2f}  their total {row['their_total']:>12g}")
+    print(f"({time.perf_counter() - start:.3f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Game results aggregation")
+    parser.add_argument('command', nargs='?', choices=('summary', 'compact'), default='summary')
+    parser.add_argument('--all-sessions', action='store_true', help='Aggregate every stored session instead of the latest one')
+    parser.add_argument('--window', type=int, default=1000, help='Games per rolling window')
+    parser.add_argument('--top', type=int, default=10, help='Opponents listed')
+    args = parser.parse_args()
+    main(args.command, args.all_sessions, args.window, args.top)
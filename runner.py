@@ -1,14 +1,32 @@
-import json
 import socket
 import logging
-from typing import Optional, Any
+import time
+from typing import Any, Callable, Optional
 
 from type.utils import get_message_type_name
 
-from config import START_MONEY, GAMEID_LOG_FILE
+from config import START_MONEY, GAMEID_LOG_FILE, METRICS_PROM_FILE, METRICS_JSON_FILE
+from metrics import Metrics
+from ponder import Ponderer
+from protocol import ActionWriter, DecodeError, Frame, FrameDecoder, decode, set_nodelay
+from results_store import ResultsWriter
+from sequential import SequentialTest
 from type.message import MessageType
+from type.poker_action import PokerAction
 from type.round_state import RoundStateClient
 
+# Prometheus label name per metric
+METRIC_LABELS = {
+    'handler_latency': 'message_type',
+    'messages': 'message_type',
+    'decision_latency': 'round',
+    'send_latency': 'action',
+    'games': 'state',
+    'action_timeouts': 'round',
+    'ponders': 'state',
+}
+ACTION_NAMES = {action.value: action.name for action in PokerAction}
+
 class Runner:
     """
     Client runner that connects to a poker server and handles the game flow.
@@ -38,6 +56,29 @@ class Runner:
 
         # Simulation mode
         self.sim = sim
+
+        # Optional recording of the inbound message stream
+        self.recorder = None
+
+        # Optional background pondering while other players act
+        self.ponderer: Optional[Ponderer] = None
+        # (game, street, board) the last ponder was started for, it is not restarted until this changes
+        self.ponder_key: Optional[tuple] = None
+
+        # Optional sequential test fed with every game score, stops the run once decided
+        self.evaluator: Optional[SequentialTest] = None
+        self.stop_requested = False
+
+        # Optional structured log of every game result, for the results_store CLI
+        self.results_writer: Optional[ResultsWriter] = None
+
+        # Newline-framed action messages built from byte templates
+        self.action_writer = ActionWriter()
+
+        # Latency histograms and counters, exported at the end of each game
+        self.metrics = Metrics(METRIC_LABELS)
+        self.metrics_prom_path = METRICS_PROM_FILE
+        self.metrics_json_path = METRICS_JSON_FILE
         
         # Multi-game support
         self.game_count = 0
@@ -94,6 +135,43 @@ class Runner:
         """
         self.bot = bot
 
+    def enable_pondering(self, ponderer: Optional[Ponderer] = None) -> None:
+        """
+        Call the bot's ponder hook in the background after every game state
+        where another player is to act.
+
+        Args:
+            ponderer: Worker to run the hook on, a new one by default
+        """
+        self.ponderer = ponderer or Ponderer()
+
+    def set_evaluator(self, evaluator: SequentialTest) -> None:
+        """
+        Stream every game score into a sequential test and disconnect once it is decided.
+
+        Args:
+            evaluator: Test the player scores are added to
+        """
+        self.evaluator = evaluator
+
+    def set_results_writer(self, results_writer: ResultsWriter) -> None:
+        """
+        Store every game result in the structured results log.
+
+        Args:
+            results_writer: Writer the game results are added to, flushed on close
+        """
+        self.results_writer = results_writer
+
+    def set_recorder(self, recorder) -> None:
+        """
+        Record every message received from the server.
+
+        Args:
+            recorder: MessageRecorder the raw messages are appended to
+        """
+        self.recorder = recorder
+
     def _process_message(self, json_message: dict) -> None:
         """
         Process a single JSON message from the server.
@@ -109,7 +187,7 @@ class Runner:
             return
             
         message_type_name = get_message_type_name(message_type)
-        self.logger.info(f"Received message type: {message_type_name}")
+        self.logger.debug("Received message type: %s", message_type_name)
         
         handlers = {
             MessageType.CONNECT.value: self._handle_connect,
@@ -124,19 +202,22 @@ class Runner:
         
         handler = handlers.get(message_type)
         if handler:
+            start = time.perf_counter_ns()
             handler(message)
+            self.metrics.observe('handler_latency', message_type_name, time.perf_counter_ns() - start)
+            self.metrics.increment('messages', message_type_name)
         else:
-            self.logger.warning(f"No handler for message type: {message_type}")
+            self.logger.warning("No handler for message type: %s", message_type)
 
     def _handle_txt(self, message: Any) -> None:
         """Handle text message."""
-        self.logger.info(f"Server: {message}")
+        self.logger.info("Server: %s", message)
 
     def _handle_connect(self, message: Any) -> None:
         """Handle connection confirmation message."""
         self.player_id = message
         self.bot.set_id(self.player_id)
-        self.logger.info(f"Connected with player ID: {self.player_id}")
+        self.logger.info("Connected with player ID: %s", self.player_id)
         
         # Log player ID to gameid.log file
         self.write_to_file(GAMEID_LOG_FILE, f"Player connected: {self.player_id}")
@@ -158,10 +239,10 @@ class Runner:
         all_players = message.get('all_players', [])
         
         if self.bot:
-            self.bot.on_start(self.player_money, hands, self.blind_amount, big_blind_player_id, small_blind_player_id, all_players)
-        self.logger.info(f"Game #{self.game_count + 1} started with {len(hands)} cards, blind: {self.blind_amount}")
-        self.logger.info(f"All players in game: {all_players}")
-        self.logger.info(f"Small blind player: {small_blind_player_id}, Big blind player: {big_blind_player_id}")
+            self._call_bot(self.bot.on_start, self.player_money, hands, self.blind_amount, big_blind_player_id, small_blind_player_id, all_players)
+        self.logger.info("Game #%s started with %s cards, blind: %s", self.game_count + 1, len(hands), self.blind_amount)
+        self.logger.info("All players in game: %s", all_players)
+        self.logger.info("Small blind player: %s, Big blind player: %s", small_blind_player_id, big_blind_player_id)
         if self.is_small_blind:
             self.logger.info("This player is the small blind")
         elif self.is_big_blind:
@@ -174,22 +255,64 @@ class Runner:
             if 'player_money' in message and message['player_money'] and str(self.player_id) in message['player_money']:
                 server_money = message['player_money'][str(self.player_id)]
                 if server_money != self.player_money:
-                    self.logger.info(f"Updating money from server: {self.player_money} -> {server_money}")
+                    self.logger.info("Updating money from server: %s -> %s", self.player_money, server_money)
                     self.player_money = server_money
                     # Recalculate delta based on server money
                     self.player_delta = self.player_money - self.initial_money
             
-            self.current_round = RoundStateClient.from_message(message)
-            self.logger.debug(f"Updated game state: round {message['round_num']}")
+            # One state object per game, updated in place from each message
+            if self.current_round is None:
+                self.current_round = RoundStateClient.from_message(message)
+            else:
+                self.current_round.update(message)
+            self.logger.debug("Updated game state: round %s, changed %s", message['round_num'], self.current_round.changed)
             if message.get('side_pots'):
-                self.logger.info(f"Side pots active: {len(message['side_pots'])} pot(s)")
+                self.logger.debug("Side pots active: %s pot(s)", len(message['side_pots']))
                 for i, pot in enumerate(message['side_pots']):
-                    self.logger.info(f"  Pot {i}: {pot['amount']} chips, eligible players: {pot['eligible_players']}")
+                    self.logger.debug("  Pot %s: %s chips, eligible players: %s", i, pot['amount'], pot['eligible_players'])
+            # Every state, so the bot sees the actions taken between its turns
+            self._call_bot(self.bot.observe, self.current_round)
+            self._start_pondering()
+
+    def _start_pondering(self) -> None:
+        """Start the bot's ponder hook if pondering is enabled and another player is to act."""
+        if not self.ponderer or self.current_round.is_to_act(self.player_id):
+            return
+        # Other players' actions do not change what the hook computes, only a new street does
+        key = (self.game_count, self.current_round.round, tuple(self.current_round.community_cards))
+        if key == self.ponder_key:
+            return
+        # The previous street's work is abandoned without waiting, the new work queues behind it
+        self._stop_pondering(wait_for_stop=False)
+        self.ponder_key = key
+        # The hook runs on its own copy, the live state keeps being updated
+        self.ponderer.start(self.bot.ponder, self.current_round.snapshot(), self.player_money)
+        self.metrics.increment('ponders', 'started')
+
+    def _stop_pondering(self, wait_for_stop: bool = True) -> None:
+        """
+        Cancel the ponder hook so the bot has the CPU to itself.
+
+        Args:
+            wait_for_stop: Block until the hook returns, up to the ponderer's cancel timeout
+        """
+        if not self.ponderer:
+            return
+        completed = self.ponderer.cancel(wait_for_stop)
+        if completed is not None:
+            self.metrics.increment('ponders', 'completed' if completed else 'cancelled')
+        if completed is False:
+            # Interrupted work may be resumed on the same street
+            self.ponder_key = None
+
+    def _call_bot(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run a bot callback other than get_action, in the receiving thread."""
+        callback(*args)
 
     def _handle_round_start(self, _: Any) -> None:
         """Handle round start message."""
         if self.bot and self.current_round:
-            self.bot.on_round_start(self.current_round, self.player_money)
+            self._call_bot(self.bot.on_round_start, self.current_round, self.player_money)
         self.logger.info("Round started")
 
     def _handle_request_action(self, _: Any) -> None:
@@ -198,25 +321,48 @@ class Runner:
             self.logger.error("No bot or current round available")
             return
         
-        # Check if this player needs to post a blind and hasn't done so yet
+        self._stop_pondering()
+        if self._post_blind():
+            return
+            
+        start = time.perf_counter_ns()
+        action, amount = self.bot.get_action(self.current_round, self.player_money)
+        self.metrics.observe('decision_latency', self.current_round.round, time.perf_counter_ns() - start)
+        self._submit_action(action, amount)
+
+    def _post_blind(self) -> bool:
+        """
+        Post the blind if this player owes one and hasn't done so yet.
+
+        Returns:
+            bool: True if a blind was posted in place of an action
+        """
         if not self.blind_posted and (self.is_small_blind or self.is_big_blind):
             if self.is_small_blind:
                 blind_amount = self.blind_amount // 2
-                self.logger.info(f"Automatically posting small blind: {blind_amount}")
+                self.logger.info("Automatically posting small blind: %s", blind_amount)
                 self.send_action_to_server(self.player_id, 4, blind_amount)  # raise action
                 self.player_money -= blind_amount
                 self.blind_posted = True
-                return
+                return True
             elif self.is_big_blind:
                 blind_amount = self.blind_amount
-                self.logger.info(f"Automatically posting big blind: {blind_amount}")
+                self.logger.info("Automatically posting big blind: %s", blind_amount)
                 self.send_action_to_server(self.player_id, 4, blind_amount)  # raise action
                 self.player_money -= blind_amount
                 self.blind_posted = True
-                return
-            
-        action, amount = self.bot.get_action(self.current_round, self.player_money)
-        self.logger.info(f"Bot action: {action.name}, amount: {amount}")
+                return True
+        return False
+
+    def _submit_action(self, action: PokerAction, amount: int) -> None:
+        """
+        Validate the bot's action, send it to the server and track money locally.
+
+        Args:
+            action: Action chosen by the bot
+            amount: Bet amount chosen by the bot
+        """
+        self.logger.info("Bot action: %s, amount: %s", action.name, amount)
         ok = self._validate_action(action.value, amount)
         if not ok:
             self.logger.error("Invalid action or amount")
@@ -226,7 +372,7 @@ class Runner:
         # For CALL actions, calculate actual call amount and send to server
         if action.value == 3:  # CALL
             # Calculate actual call amount for local money tracking
-            actual_call_amount = self.current_round.current_bet - self.current_round.player_bets[str(self.player_id)]
+            actual_call_amount = self.current_round.amount_to_call(self.player_id)
             self.send_action_to_server(self.player_id, action.value, actual_call_amount)
             self.player_money -= actual_call_amount  # Deduct actual amount locally
         # For ALL_IN actions, calculate actual all-in amount and send to server
@@ -243,32 +389,43 @@ class Runner:
     def _handle_round_end(self, _: Any) -> None:
         """Handle round end message."""
         if self.bot and self.current_round:
-            self.bot.on_end_round(self.current_round, self.player_money)
+            self._call_bot(self.bot.on_end_round, self.current_round, self.player_money)
         self.logger.info("Round ended")
 
     def _handle_game_end(self, message: Any) -> None:
         """Handle game end message."""
+        self._stop_pondering()
         if self.bot and self.current_round:
             player_score = message.get('player_score', 0)
             all_scores = message.get('all_scores', {})
             active_players_hands = message.get('active_players_hands', {})
             self.points = int(player_score)
-            self.logger.info(f"All final scores: {all_scores}")
-            self.logger.info(f"Active players hands: {active_players_hands}")
+            self.logger.debug("All final scores: %s", all_scores)
+            self.logger.debug("Active players hands: %s", active_players_hands)
             # Always log game results regardless of simulation mode
             self.append_to_file(self.result_path, f"Game_{self.game_count + 1}: Player score: {player_score}, All scores: {all_scores}")
+            if self.results_writer:
+                self.results_writer.add(self.game_count + 1, self.player_id, player_score, all_scores)
             
             # Update player delta and money based on game result using delta approach
             old_delta = self.player_delta
             self.player_delta += player_score
             old_money = self.player_money
             self.player_money = self.initial_money + self.player_delta
-            self.logger.info(f"Delta updated: {old_delta} + {player_score} = {self.player_delta}, money: {old_money} -> {self.player_money}")
+            self.logger.info("Delta updated: %s + %s = %s, money: %s -> %s", old_delta, player_score, self.player_delta, old_money, self.player_money)
             
-            self.bot.on_end_game(self.current_round, player_score, all_scores, active_players_hands)
+            self._call_bot(self.bot.on_end_game, self.current_round, player_score, all_scores, active_players_hands)
             self.total_points += self.points
             self.run_success = True
-        self.logger.info(f"Game #{self.game_count + 1} ended with score: {self.points}")
+            if self.evaluator and self.evaluator.add(float(player_score)).is_final and not self.stop_requested:
+                self.logger.info("Stopping: %s", self.evaluator.summary())
+                self.stop_requested = True
+        self.logger.info("Game #%s ended with score: %s", self.game_count + 1, self.points)
+        self.metrics.increment('games', 'ended')
+        self.export_metrics()
+        if self.recorder:
+            # A crash or kill loses at most the game in progress
+            self.recorder.flush()
         
         # Reset for next game instead of closing connection
         self.reset_for_new_game()
@@ -284,14 +441,24 @@ class Runner:
         for line in lines:
             if not line:  # Skip empty lines
                 continue
-                
-            try:
-                json_message = json.loads(line)
-                self._process_message(json_message)
-            except json.JSONDecodeError:
-                self.logger.error(f"Error decoding message: {line}")
-            except Exception as e:
-                self.logger.exception(f"Error processing message: {e}")
+            self.handle_frame(line)
+
+    def handle_frame(self, frame: Frame) -> None:
+        """
+        Decode and process a single message frame.
+
+        Args:
+            frame: One JSON message as received, without the newline
+        """
+        if self.recorder:
+            self.recorder.record(frame)
+        try:
+            json_message = decode(frame)
+            self._process_message(json_message)
+        except DecodeError:
+            self.logger.error("Error decoding message: %s", frame)
+        except Exception as e:
+            self.logger.exception("Error processing message: %s", e)
 
     def _validate_action(self, action: int, amount: int) -> bool:
 
@@ -322,7 +489,7 @@ class Runner:
 
         # For actions that require money, check if player has enough
         if amount > self.player_money:
-            self.logger.warning(f"Player doesn't have enough money for action: needs {amount}, has {self.player_money}")
+            self.logger.warning("Player doesn't have enough money for action: needs %s, has %s", amount, self.player_money)
             # Allow the action to proceed - the server will handle insufficient funds
             # This allows for all-in scenarios where player bets all they have
             return True
@@ -334,7 +501,7 @@ class Runner:
                 if actual_call_amount >= 0 and actual_call_amount <= self.player_money:
                     return True
                 else:
-                    self.logger.error(f"Invalid call action: cannot afford {actual_call_amount}, have {self.player_money}")
+                    self.logger.error("Invalid call action: cannot afford %s, have %s", actual_call_amount, self.player_money)
                     return False
             return False
             
@@ -367,33 +534,31 @@ class Runner:
             action: Action code (from MessageType enum)
             amount: Bet amount
         """
-        message = {
-            'type': MessageType.PLAYER_ACTION.value,
-            'message': {
-                'player_id': player_id,
-                'action': action,
-                'amount': amount
-            }
-        }
-
         try:
-            self.client_socket.send(json.dumps(message).encode('utf-8'))
-            self.logger.debug(f"Sent action: {action}, amount: {amount}")
+            start = time.perf_counter_ns()
+            self.action_writer.send(self.client_socket, player_id, action, amount)
+            elapsed = time.perf_counter_ns() - start
+            self.metrics.observe('send_latency', ACTION_NAMES.get(action, str(action)), elapsed)
+            self.logger.debug("Sent action: %s, amount: %s in %.1f us", action, amount, elapsed / 1e3)
         except Exception as e:
-            self.logger.error(f"Failed to send action: {e}")
+            self.logger.error("Failed to send action: %s", e)
 
     def receive_messages(self) -> None:
         """Receive and process messages from the server."""
-        sock_file = self.client_socket.makefile('r')
+        decoder = FrameDecoder()
         while True:
             try:
-                line = sock_file.readline()
-                if not line:
-                    self.logger.info("Server closed connection")
-                    break
-                self.handle_messages(line.strip())
-            except Exception as e:
-                self.logger.error(f"Error decoding message: {e}")
+                frames = decoder.recv_from(self.client_socket)
+            except OSError as e:
+                self.logger.error("Error receiving message: %s", e)
+                break
+            if frames is None:
+                self.logger.info("Server closed connection")
+                break
+            for frame in frames:
+                self.handle_frame(frame)
+            if self.stop_requested:
+                break
 
     def connect(self) -> bool:
         """
@@ -404,10 +569,12 @@ class Runner:
         """
         try:
             self.client_socket.connect((self.host, self.port))
-            self.logger.info(f"Connected to server at {self.host}:{self.port}")
+            # Actions are tiny and latency-critical, do not let Nagle hold them back
+            set_nodelay(self.client_socket)
+            self.logger.info("Connected to server at %s:%s", self.host, self.port)
             return True
         except socket.error as e:
-            self.logger.error(f"Connection failed: {e}")
+            self.logger.error("Connection failed: %s", e)
             return False
 
     def run(self) -> None:
@@ -426,31 +593,50 @@ class Runner:
         finally:
             self.close()
 
+    def export_metrics(self) -> None:
+        """Write the Prometheus text file and the JSON snapshot of the metrics."""
+        try:
+            if self.metrics_prom_path:
+                self.metrics.write_prometheus(self.metrics_prom_path)
+            if self.metrics_json_path:
+                self.metrics.write_json(self.metrics_json_path)
+        except Exception as e:
+            self.logger.error("Error exporting metrics: %s", e)
+
     def append_to_file(self, filename: str, data: str) -> None:
         """Append data to a file."""
         try:
             with open(filename, 'a') as file:
                 file.write(data + '\n')
-            self.logger.info(f"Data appended to {filename}")
+            self.logger.info("Data appended to %s", filename)
         except Exception as e:
-            self.logger.error(f"Error writing to file {filename}: {e}")
+            self.logger.error("Error writing to file %s: %s", filename, e)
 
     def write_to_file(self, filename: str, data: str) -> None:
         """Overwrite data to a file."""
         try:
             with open(filename, 'w') as file:
                 file.write(data + '\n')
-            self.logger.info(f"Data written to {filename}")
+            self.logger.info("Data written to %s", filename)
         except Exception as e:
-            self.logger.error(f"Error writing to file {filename}: {e}")
+            self.logger.error("Error writing to file %s: %s", filename, e)
 
     def close(self) -> None:
         """Close the connection to the server."""
-        try:
-            self.client_socket.close()
-            self.logger.info("Connection closed")
-        except Exception as e:
-            self.logger.error(f"Error closing connection: {e}")
+        closers = [self.client_socket.close]
+        if self.ponderer:
+            closers.append(self.ponderer.shutdown)
+        if self.recorder:
+            closers.append(self.recorder.close)
+        if self.results_writer:
+            closers.append(self.results_writer.close)
+        # One failure must not keep the rest, above all the results writer, from closing
+        for close in closers:
+            try:
+                close()
+            except Exception as e:
+                self.logger.error("Error closing connection: %s", e)
+        self.logger.info("Connection closed")
 
     def reset_for_new_game(self):
         """Reset client state for a new game"""
@@ -465,4 +651,4 @@ class Runner:
         self.is_small_blind = False
         self.is_big_blind = False
         self.blind_posted = False
-        self.logger.info(f"Reset for Game #{self.game_count}, current money: {self.player_money}, delta: {self.player_delta}")
\ No newline at end of file
+        self.logger.info("Reset for Game #%s, current money: %s, delta: %s", self.game_count, self.player_money, self.player_delta)
\ No newline at end of file
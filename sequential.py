@@ -0,0 +1,148 @@
+"""
+Sequential stopping for bot evaluations.
+
+Per-game scores are streamed into running statistics (Welford's algorithm,
+so the mean and variance are exact at any point without keeping the
+scores). A two-sided sequential probability ratio test then decides, game
+by game, whether the mean score is at least `delta` chips away from zero
+in either direction or within `delta` of zero, and the run can stop as
+soon as one of the three holds instead of playing a fixed number of games.
+
+The test is the usual pair of one-sided Wald tests of mean 0 against mean
++delta and -delta, with normal likelihoods and the running variance
+plugged in. With heavy-tailed poker scores the variance estimate is poor
+for the first games, so no decision is taken before min_games.
+"""
+import math
+from enum import Enum
+from typing import Optional, Tuple
+
+from config import SPRT_ALPHA, SPRT_BETA, SPRT_MIN_GAMES
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of values."""
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.total = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 before two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean."""
+        return math.sqrt(self.variance / self.count) if self.count else 0.0
+
+    def confidence_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Normal confidence interval of the mean, 95% by default."""
+        margin = z * self.stderr
+        return self.mean - margin, self.mean + margin
+
+
+class Decision(Enum):
+    CONTINUE = 0
+    BETTER = 1  # Mean score at least delta above zero
+    WORSE = 2  # Mean score at least delta below zero
+    NEGLIGIBLE = 3  # Mean score within delta of zero
+
+    @property
+    def is_final(self) -> bool:
+        return self != Decision.CONTINUE
+
+
+class SequentialTest:
+    """Two-sided SPRT on the mean of a stream of per-game scores."""
+    def __init__(self, delta: float, alpha: float = SPRT_ALPHA, beta: float = SPRT_BETA, min_games: int = SPRT_MIN_GAMES, max_games: Optional[int] = None) -> None:
+        """
+        Initialize the test.
+
+        Args:
+            delta: Smallest mean score per game worth detecting, in chips
+            alpha: Probability of calling a zero mean better or worse, split over both sides
+            beta: Probability of calling a mean of +/-delta negligible
+            min_games: Games before any decision
+            max_games: Optional cap; at the cap the result is decided by the confidence interval
+        """
+        if delta <= 0:
+            raise ValueError(f"delta must be positive, got {delta}")
+        self.delta = delta
+        self.alpha = alpha
+        self.beta = beta
+        self.min_games = min_games
+        self.max_games = max_games
+        # Wald boundaries of each one-sided test
+        self.upper = math.log((1 - beta) / (alpha / 2))
+        self.lower = math.log(beta / (1 - alpha / 2))
+        self.stats = RunningStats()
+        self.decision = Decision.CONTINUE
+
+    def log_likelihood_ratios(self) -> Tuple[float, float]:
+        """
+        Log-likelihood ratios of mean +delta and of mean -delta against mean 0.
+
+        Returns:
+            Tuple[float, float]: (towards better, towards worse), 0 before the variance is known
+        """
+        variance = self.stats.variance
+        if variance <= 0:
+            return 0.0, 0.0
+        total, count = self.stats.total, self.stats.count
+        better = self.delta / variance * (total - count * self.delta / 2)
+        worse = -self.delta / variance * (total + count * self.delta / 2)
+        return better, worse
+
+    def add(self, score: float) -> Decision:
+        """
+        Add one game's score and update the decision.
+
+        Once the decision is final, later scores are still counted but do
+        not change it.
+
+        Args:
+            score: Chips won in the game
+
+        Returns:
+            Decision: Current decision
+        """
+        self.stats.add(score)
+        if self.decision.is_final or self.stats.count < self.min_games:
+            return self.decision
+        better, worse = self.log_likelihood_ratios()
+        if better >= self.upper:
+            self.decision = Decision.BETTER
+        elif worse >= self.upper:
+            self.decision = Decision.WORSE
+        elif better <= self.lower and worse <= self.lower:
+            self.decision = Decision.NEGLIGIBLE
+        elif self.max_games is not None and self.stats.count >= self.max_games:
+            self.decision = self._decide_by_interval()
+        return self.decision
+
+    def _decide_by_interval(self) -> Decision:
+        low, high = self.stats.confidence_interval()
+        if low > 0:
+            return Decision.BETTER
+        if high < 0:
+            return Decision.WORSE
+        return Decision.NEGLIGIBLE
+
+    def summary(self) -> str:
+        low, high = self.stats.confidence_interval()
+        return (f"{self.decision.name} after {self.stats.count} games: mean {self.stats.mean:.2f} chips/game, "
+                f"95% CI [{low:.2f}, {high:.2f}], delta {self.delta}")
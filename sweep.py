@@ -0,0 +1,175 @@
+# python sweep.py --grid call_strength=5.4,5.6,5.8,6 all_in_pairs=AKQ,AK,AKQJ -g 4000
+# Parameter sweep of SimplePlayer against a fixed opponent on seeded duplicate deals
+
+import argparse
+import csv
+import logging
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import SWEEP_RESULTS_FILE
+from engine import LocalEngine
+from player import SimplePlayer, SimplePlayerParams
+from tournament import load_bot_factory
+
+PARAM_TYPES = {field.name: type(field.default) for field in fields(SimplePlayerParams)}
+
+
+def parse_space(specs: Sequence[str]) -> Dict[str, List[Any]]:
+    """
+    Parse 'name=value,value,...' into candidate values per parameter.
+
+    Args:
+        specs: One spec per swept parameter of SimplePlayerParams
+
+    Returns:
+        Dict[str, List[Any]]: Parameter name to its candidate values, typed like the default
+    """
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in PARAM_TYPES:
+            raise ValueError(f"Unknown parameter {name}, expected one of {', '.join(PARAM_TYPES)}")
+        if not values:
+            raise ValueError(f"No values given for {name}")
+        space[name] = [parse_value(PARAM_TYPES[name], value) for value in values.split(',')]
+    return space
+
+
+def parse_value(value_type: type, text: str) -> Any:
+    if value_type is bool:
+        if text.lower() not in ('true', 'false', '1', '0'):
+            raise ValueError(f"Expected true or false, got {text}")
+        return text.lower() in ('true', '1')
+    return value_type(text)
+
+
+def grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Every combination of the candidate values."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in product(*(space[name] for name in names))]
+
+
+def random_search(space: Dict[str, List[Any]], count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Up to count distinct combinations drawn at random from the grid.
+
+    Positions in the grid are sampled and decoded into values, so the grid
+    itself is never built and a large space costs only the draws.
+    """
+    names = list(space)
+    sizes = [len(space[name]) for name in names]
+    total = math.prod(sizes)
+    candidates = []
+    for index in random.Random(seed).sample(range(total), min(count, total)):
+        # Same order as grid: the last parameter varies fastest
+        positions = []
+        for size in reversed(sizes):
+            index, position = divmod(index, size)
+            positions.append(position)
+        candidates.append({name: space[name][position] for name, position in zip(names, reversed(positions))})
+    return candidates
+
+
+@dataclass
+class SweepResult:
+    params: Dict[str, Any]
+    games: int
+    chips: int
+    variance: float  # Of the chip total, from the spread of the duplicate deals
+    seconds: float
+
+    @property
+    def chips_per_100(self) -> float:
+        return 100.0 * self.chips / self.games if self.games else 0.0
+
+    @property
+    def margin_per_100(self) -> float:
+        """Half-width of the 95% confidence interval of chips_per_100."""
+        return 1.96 * 100.0 * math.sqrt(self.variance) / self.games if self.games else 0.0
+
+
+def evaluate(params: Dict[str, Any], opponent_path: str, deals: int, seed: int) -> SweepResult:
+    """Play one parameter set on the seeded deals; runs in a worker process."""
+    start = time.perf_counter()
+    random.seed(seed)
+    hero = SimplePlayer(params=SimplePlayerParams(**params))
+    engine = LocalEngine([hero, load_bot_factory(opponent_path)()], seed=seed)
+    scores = [deal[hero.id] for deal in engine.run_duplicate(deals)]
+    chips = sum(scores)
+    mean = chips / len(scores) if scores else 0.0
+    variance = sum((score - mean) ** 2 for score in scores) * len(scores) / (len(scores) - 1) if len(scores) > 1 else 0.0
+    return SweepResult(params, engine.get_game_count(), chips, variance, time.perf_counter() - start)
+
+
+def run_sweep(candidates: List[Dict[str, Any]], opponent_path: str, games: int, seed: int = 0, workers: Optional[int] = None) -> List[SweepResult]:
+    """
+    Evaluate every parameter set against the opponent, best first.
+
+    Every set plays the same seeded duplicate deals, so the ranking reflects
+    the parameters rather than the cards each set was dealt.
+
+    Args:
+        candidates: Parameter sets, as keyword arguments of SimplePlayerParams
+        opponent_path: Dotted path of the opponent bot
+        games: Games per parameter set, half as many deals
+        seed: Seed of the deals
+        workers: Worker processes, all cores when None, in-process when 1
+
+    Returns:
+        List[SweepResult]: Results sorted by chips per 100 games
+    """
+    load_bot_factory(opponent_path)
+    for params in candidates:
+        # Fail on invalid values before starting any worker
+        SimplePlayerParams(**params)
+    deals = max(1, games // 2)
+    if workers == 1:
+        results = [evaluate(params, opponent_path, deals, seed) for params in candidates]
+    else:
+        count = len(candidates)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evaluate, candidates, [opponent_path] * count, [deals] * count, [seed] * count))
+    return sorted(results, key=lambda result: result.chips_per_100, reverse=True)
+
+
+def write_results(path: str, results: Sequence[SweepResult]) -> None:
+    """Write the ranked results table as CSV, one row per parameter set."""
+    names = [field.name for field in fields(SimplePlayerParams)]
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['rank'] + names + ['games', 'chips', 'chips_per_100', 'margin_per_100', 'seconds'])
+        for rank, result in enumerate(results, 1):
+            params = asdict(SimplePlayerParams(**result.params))
+            writer.writerow([rank] + [params[name] for name in names]
+                            + [result.games, result.chips, f"{result.chips_per_100:.2f}", f"{result.margin_per_100:.2f}", f"{result.seconds:.2f}"])
+
+
+def main(specs: Sequence[str], samples: Optional[int], opponent: str, games: int, seed: int, workers: Optional[int], output: str) -> None:
+    space = parse_space(specs)
+    candidates = random_search(space, samples, seed) if samples else grid(space)
+    start = time.perf_counter()
+    results = run_sweep(candidates, opponent, games, seed, workers)
+    write_results(output, results)
+    print(f"Evaluated {len(results)} parameter sets in {time.perf_counter() - start:.1f}s, results written to {output}")
+    for rank, result in enumerate(results[:5], 1):
+        print(f"{rank:>3} {result.chips_per_100:>10.2f} +/- {result.margin_per_100:<8.2f} {result.params}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SimplePlayer Parameter Sweep")
+    parser.add_argument('--grid', nargs='+', required=True, metavar='NAME=V1,V2', help=f"Candidate values per parameter: {', '.join(PARAM_TYPES)}")
+    parser.add_argument('--random', type=int, default=None, metavar='N', help='Evaluate N random combinations instead of the full grid')
+    parser.add_argument('--opponent', type=str, default='player.SimplePlayer', help='Dotted path of the opponent bot')
+    parser.add_argument('-g', '--games', type=int, default=2000, help='Games per parameter set')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the deals shared by every parameter set')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('-o', '--output', type=str, default=SWEEP_RESULTS_FILE, help='Ranked results CSV')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    main(args.grid, args.random, args.opponent, args.games, args.seed, args.workers, args.output)
@@ -0,0 +1,46 @@
+"""
+Bots and server messages shared by several test modules.
+"""
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import Bot
+from type.poker_action import PokerAction
+
+
+class CallingBot(Bot):
+    """Calls every bet and checks otherwise, so every deal is played to showdown."""
+    def on_start(self, starting_chips, player_hands, blind_amount, big_blind_player_id, small_blind_player_id, all_players):
+        pass
+
+    def on_round_start(self, round_state, remaining_chips):
+        pass
+
+    def get_action(self, round_state, remaining_chips):
+        return PokerAction.CALL, round_state.amount_to_call(self.id)
+
+    def on_end_round(self, round_state, remaining_chips):
+        pass
+
+    def on_end_game(self, round_state, player_score, all_scores, active_players_hands):
+        pass
+
+
+def message(message_type, body):
+    """One server message, without the newline."""
+    return json.dumps({'type': message_type, 'message': body})
+
+
+def game(score):
+    """Messages of one preflop game: we are dealt 7-2, asked to act facing a raise, and the game ends."""
+    return [
+        message(2, {'hands': ['Card("7c")', 'Card("2d")'], 'blind_amount': 10, 'all_players': [1, 2]}),
+        message(9, {
+            'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': 50, 'current_player': [1], 'current_bet': 40,
+            'min_raise': 30, 'max_raise': 990, 'player_bets': {'1': 10, '2': 40}, 'player_actions': {'1': 'RAISE', '2': 'RAISE'},
+        }),
+        message(4, {}),
+        message(7, {'player_score': score, 'all_scores': {'1': score, '2': -score}, 'active_players_hands': {}}),
+    ]
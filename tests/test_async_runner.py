@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio runner's action deadline, fallback actions and stale decisions.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_runner import AsyncRunner
+from bot import Bot
+from type.poker_action import PokerAction
+
+
+class StubWriter:
+    """Stands in for the asyncio stream writer and keeps every action sent."""
+    def __init__(self):
+        self.sent = []
+
+    def write(self, data):
+        self.sent.append(json.loads(data))
+
+    def close(self):
+        pass
+
+
+class SlowBot(Bot):
+    """Raises once released, long after the deadline, and records the order of its callbacks."""
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.interrupted = False
+        self.calls = []
+
+    def on_start(self, starting_chips, player_hands, blind_amount, big_blind_player_id, small_blind_player_id, all_players):
+        self.calls.append('on_start')
+
+    def on_round_start(self, round_state, remaining_chips):
+        self.calls.append('on_round_start')
+
+    def get_action(self, round_state, remaining_chips):
+        self.calls.append('get_action')
+        self.release.wait(5.0)
+        self.calls.append('get_action done')
+        return PokerAction.RAISE, 100
+
+    def interrupt(self):
+        self.interrupted = True
+
+    def on_end_round(self, round_state, remaining_chips):
+        self.calls.append('on_end_round')
+
+    def on_end_game(self, round_state, player_score, all_scores, active_players_hands):
+        self.calls.append('on_end_game')
+
+
+def make_runner(bot):
+    runner = AsyncRunner('localhost', 0, os.devnull, sim=True, action_timeout=0.05)
+    runner.client_socket.close()
+    runner.metrics_prom_path = None
+    runner.metrics_json_path = None
+    runner.writer = StubWriter()
+    runner.player_id = 1
+    bot.set_id(1)
+    runner.set_bot(bot)
+    return runner
+
+
+def message(message_type, body):
+    return json.dumps({'type': message_type, 'message': body})
+
+
+START = message(2, {'hands': ['Card("2c")', 'Card("7d")'], 'blind_amount': 10, 'all_players': [1, 2]})
+REQUEST = message(4, {})
+END = message(7, {'player_score': -10, 'all_scores': {'1': -10, '2': 10}, 'active_players_hands': {}})
+
+
+def state(current_bet, my_bet):
+    return message(9, {
+        'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': current_bet + my_bet, 'current_player': [1],
+        'current_bet': current_bet, 'min_raise': 20, 'max_raise': 990, 'player_bets': {'1': my_bet, '2': current_bet},
+        'player_actions': {'1': 'RAISE', '2': 'RAISE'},
+    })
+
+
+async def play(runner, *lines):
+    runner.handle_messages('\n'.join(lines))
+    while runner.pending_actions:
+        await asyncio.gather(*runner.pending_actions)
+
+
+def test_fallback_takes_the_big_blind_option_and_folds_to_a_bet():
+    bot = SlowBot()
+    runner = make_runner(bot)
+    asyncio.run(play(runner, START, state(10, 10), REQUEST))
+    asyncio.run(play(runner, state(20, 10), REQUEST))
+    bot.release.set()
+    runner.close()
+    actions = [(sent['message']['action'], sent['message']['amount']) for sent in runner.writer.sent]
+    assert actions == [(PokerAction.CALL.value, 0), (PokerAction.FOLD.value, 0)]
+    assert runner.timeouts == 2 and bot.interrupted
+
+
+def test_late_decision_is_dropped_and_callbacks_wait_for_it():
+    bot = SlowBot()
+    runner = make_runner(bot)
+
+    async def scenario():
+        await play(runner, START, state(0, 0), REQUEST)
+        # The game ends and the next one starts while get_action is still running
+        await play(runner, END, START, state(0, 0))
+        assert bot.calls == ['on_start', 'get_action']
+        bot.release.set()
+        await asyncio.wrap_future(runner.executor.submit(lambda: None))
+
+    asyncio.run(scenario())
+    runner.close()
+    assert bot.calls == ['on_start', 'get_action', 'get_action done', 'on_end_game', 'on_start']
+    # Only the fallback check was sent, never the late raise
+    assert [sent['message']['action'] for sent in runner.writer.sent] == [PokerAction.CHECK.value]
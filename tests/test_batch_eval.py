@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized hand evaluator, checked against eval7.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+import numpy as np
+
+from batch_eval import HAND_TYPE_SHIFT, card_indices, evaluate_batch, evaluate_hands, rollout_equity
+from type.cards import CARDS
+
+
+def cards(*names):
+    return [eval7.Card(name) for name in names]
+
+
+def test_orders_hands_like_eval7():
+    rng = np.random.default_rng(3)
+    hands = np.argsort(rng.random((20000, 52)), axis=1)[:, :7]
+    # Edge cases: wheel, steel wheel, two sets of trips, three pairs, quads with a pair
+    special = [
+        cards('As', '2d', '3c', '4h', '5s', 'Kd', 'Qc'),
+        cards('As', '2s', '3s', '4s', '5s', 'Kd', 'Qs'),
+        cards('9s', '9d', '9c', '4h', '4s', '4d', 'Ac'),
+        cards('9s', '9d', '4c', '4h', '2s', '2d', '7c'),
+        cards('9s', '9d', '9c', '9h', '2s', '2d', '7c'),
+    ]
+    hands = np.concatenate([hands, np.array([card_indices(hand) for hand in special])])
+    scores = evaluate_batch(hands)
+    expected = np.array([eval7.evaluate([CARDS[index] for index in row]) for row in hands])
+    assert np.array_equal(scores >> HAND_TYPE_SHIFT, expected >> HAND_TYPE_SHIFT)
+    order = np.argsort(expected, kind='stable')
+    assert np.all(np.diff(scores[order]) >= 0)
+    # Equal eval7 scores must stay equal
+    same = expected[order][1:] == expected[order][:-1]
+    assert np.all(np.diff(scores[order])[same] == 0)
+
+
+def test_hands_against_shared_board():
+    board = card_indices(cards('Kd', '7s', '6s', '2c', '3d'))
+    hole = np.array([card_indices(cards('Kh', 'Qc')), card_indices(cards('As', 'Ks')), card_indices(cards('4h', '5h'))])
+    scores = evaluate_hands(hole, board)
+    assert scores[2] > scores[1] > scores[0]
+
+
+def test_rollout_equity_is_close_to_known_value():
+    assert abs(rollout_equity(cards('As', 'Ad'), samples=50000, seed=1) - 0.85) < 0.01
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the card helpers used on the decision path.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+
+from player import SimplePlayer
+from type.card_set import CardSet
+
+
+def cards(*names):
+    return [eval7.Card(name) for name in names]
+
+
+def test_card_set_masks():
+    card_set = CardSet.from_cards(cards('As', 'Ks', '9h', '9d'))
+    assert len(card_set) == 4
+    assert eval7.Card('9h') in card_set and eval7.Card('9c') not in card_set
+    assert card_set.top_rank() == 12
+    assert card_set.has_rank(7) and not card_set.has_rank(6)
+    assert card_set.max_suit_count() == 2
+    assert card_set.count_at_least(8) == 2
+    assert sorted(map(str, card_set.cards())) == sorted(['As', 'Ks', '9h', '9d'])
+
+
+def test_board_texture_helpers():
+    player = SimplePlayer()
+    board = ['Card("Kd")', 'Card("7s")', 'Card("6s")']
+    assert player.is_top_pair(cards('Ks', '2c'), board)
+    assert not player.is_top_pair(cards('Qs', 'Qc'), board)
+    assert player.is_overcard(eval7.Card('Ah'), board)
+    assert not player.is_overcard(eval7.Card('Kh'), board)
+    assert player.has_flush_draw(cards('As', '2s'), board)
+    assert not player.has_flush_draw(cards('Ah', '2s'), board)
+    assert player.has_straight_draw(cards('8c', '9d'), board)
+    assert not player.has_straight_draw(cards('8c', 'Td'), board)
+    assert player.board_is_high(['Card("Kd")', 'Card("Th")', 'Card("2s")'])
+    assert not player.board_is_high(board)
+
+
+def test_top_pair_or_better():
+    player = SimplePlayer()
+    board = ['Card("Kd")', 'Card("7s")', 'Card("6s")']
+    assert player.has_top_pair_or_better(cards('Kh', '2c'), board)
+    # A set of sevens beats top pair without holding a king
+    assert player.has_top_pair_or_better(cards('7h', '7c'), board)
+    assert not player.has_top_pair_or_better(cards('Ah', 'Qc'), board)
+    # A pair on the board does not count as our two pair
+    paired = ['Card("Kd")', 'Card("7s")', 'Card("7d")']
+    assert not player.has_top_pair_or_better(cards('Ah', '2c'), paired)
+    assert player.has_medium_or_better_kicker(cards('Kh', 'Qc'), board)
+    assert not player.has_medium_or_better_kicker(cards('Kh', 'Jc'), board)
+
+
+def test_card_table_interns_both_spellings():
+    from type.cards import parse_card, parse_cards
+
+    assert parse_card('Card("9s")') is parse_card('9s')
+    assert parse_cards(['Card("Ah")', eval7.Card('2c')]) == cards('Ah', '2c')
+
+
+def test_round_state_parses_board_once():
+    from type.round_state import RoundStateClient
+
+    state = RoundStateClient.from_message({
+        'round_num': 1, 'round': 'FLOP', 'community_cards': ['Card("Kd")', 'Card("7s")', 'Card("6s")'],
+        'pot': 20, 'current_player': [1], 'current_bet': 0, 'min_raise': 10, 'max_raise': 100,
+        'player_bets': {'1': 0, '2': 0}, 'player_actions': {'1': '', '2': ''},
+    })
+    assert state.board == cards('Kd', '7s', '6s')
+    assert state.board is state.board
+    assert state.board_set.top_rank() == 11
+
+
+def test_round_state_updates_in_place():
+    from type.round_state import RoundStateClient
+
+    message = {
+        'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': 30, 'current_player': [1],
+        'current_bet': 20, 'min_raise': 20, 'max_raise': 980, 'player_bets': {'1': 10, '2': 20},
+        'player_actions': {'1': 'RAISE', '2': 'RAISE'}, 'player_money': {'1': 990, '2': 480}, 'side_pots': [],
+    }
+    state = RoundStateClient.from_message(message)
+    bets = state.player_bets
+    assert state.amount_to_call(1) == 10
+    assert state.pot_odds(1) == 0.25
+    assert state.effective_stack(1) == 480
+
+    frozen = state.snapshot()
+    state.update(dict(message, pot=40, player_bets={'1': 20, '2': 20}, player_actions={'1': 'CALL', '2': 'RAISE'}))
+    assert state.player_bets is bets
+    assert state.changed == {'pot', 'player_bets', 'player_actions'}
+    assert state.changed_players == {'1'}
+    assert not state.new_street
+    assert state.amount_to_call(1) == 0
+    assert frozen.player_bets == {'1': 10, '2': 20}
+
+    state.update(dict(message, round_num=1, round='FLOP', community_cards=['Card("Kd")', 'Card("7s")', 'Card("6s")'], current_bet=0))
+    assert state.new_street
+    assert state.board == cards('Kd', '7s', '6s')
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process game engine.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+
+from bot import Bot
+from engine import LocalEngine, FULL_DECK
+from type.poker_action import PokerAction
+
+
+class ScriptedBot(Bot):
+    """Bot that always answers with the same action and records callbacks."""
+    def __init__(self, action=PokerAction.CALL):
+        super().__init__()
+        self.action = action
+        self.calls = []
+        self.scores = []
+
+    def on_start(self, starting_chips, player_hands, blind_amount, big_blind_player_id, small_blind_player_id, all_players):
+        self.calls.append('on_start')
+        self.hand = player_hands
+
+    def on_round_start(self, round_state, remaining_chips):
+        self.calls.append('on_round_start')
+
+    def get_action(self, round_state, remaining_chips):
+        self.calls.append('get_action')
+        if self.action == PokerAction.CALL and round_state.current_bet == round_state.player_bets[str(self.id)]:
+            return PokerAction.CHECK, 0
+        if self.action == PokerAction.ALL_IN:
+            return PokerAction.ALL_IN, remaining_chips
+        return self.action, 0
+
+    def on_end_round(self, round_state, remaining_chips):
+        self.calls.append('on_end_round')
+
+    def on_end_game(self, round_state, player_score, all_scores, active_players_hands):
+        self.calls.append('on_end_game')
+        self.scores.append(player_score)
+        self.active_players_hands = active_players_hands
+
+
+def stacked_deck(*cards):
+    """Deck with the given cards on top, followed by the rest in order."""
+    top = [eval7.Card(card) for card in cards]
+    return top + [card for card in FULL_DECK if card not in top]
+
+
+def test_fold_gives_blinds_to_big_blind():
+    folder, caller = ScriptedBot(PokerAction.FOLD), ScriptedBot(PokerAction.CALL)
+    engine = LocalEngine([folder, caller], blind_amount=10)
+    scores = engine.play_game()
+    # Heads-up the first seat is the small blind and folds its 5 chips
+    assert scores == {1: -5, 2: 5}
+    assert caller.active_players_hands == {}
+    assert caller.calls[0] == 'on_start' and caller.calls[-1] == 'on_end_game'
+
+
+def test_showdown_pays_best_hand():
+    a, b = ScriptedBot(PokerAction.CALL), ScriptedBot(PokerAction.CALL)
+    engine = LocalEngine([a, b], blind_amount=10)
+    deck = stacked_deck('As', 'Ad', '2c', '7d', 'Ks', 'Kd', '9h', '4c', '3s')
+    scores = engine.play_game(deck)
+    assert scores == {1: 10, 2: -10}
+    assert set(a.active_players_hands) == {'1', '2'}
+    assert a.calls.count('on_round_start') == 4
+
+
+def test_side_pot_with_short_stack():
+    short, big_a, big_b = ScriptedBot(PokerAction.ALL_IN), ScriptedBot(PokerAction.ALL_IN), ScriptedBot(PokerAction.ALL_IN)
+    engine = LocalEngine([short, big_a, big_b], starting_chips=1000, blind_amount=10)
+    engine._reset_game()
+    engine.stacks[1] = 100
+    engine.contributions = {1: 100, 2: 1000, 3: 1000}
+    engine.all_in = {1, 2, 3}
+    pots = engine._side_pots()
+    assert pots == [
+        {'amount': 300, 'eligible_players': [1, 2, 3]},
+        {'amount': 1800, 'eligible_players': [2, 3]},
+    ]
+
+
+def test_seeded_games_are_reproducible():
+    results = []
+    for _ in range(2):
+        engine = LocalEngine([ScriptedBot(PokerAction.CALL), ScriptedBot(PokerAction.ALL_IN)], seed=7)
+        results.append(engine.run(20))
+    assert results[0] == results[1]
+    assert sum(results[0].values()) == 0
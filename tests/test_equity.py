@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the equity calculators.
+"""
+import os
+import sys
+import threading
+from itertools import combinations
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+
+from equity import FULL_DECK, EquityCalculator, enumerate_equity
+from preflop_table import NUM_CLASSES, PreflopTable, hand_class_index, write_table
+
+
+def cards(*names):
+    return [eval7.Card(name) for name in names]
+
+
+def test_monte_carlo_equity_is_close_to_known_value():
+    calculator = EquityCalculator(samples=4000, seed=1)
+    # Pocket aces win about 85% of the time heads-up
+    equity = calculator.equity(cards('As', 'Ah'))
+    assert 0.81 < equity < 0.89
+
+
+def test_equity_drops_with_more_opponents():
+    calculator = EquityCalculator(samples=2000, seed=2)
+    heads_up = calculator.equity(cards('As', 'Ah'), num_opponents=1)
+    multiway = calculator.equity(cards('As', 'Ah'), num_opponents=4)
+    assert multiway < heads_up
+
+
+def test_nut_hand_on_river_always_wins():
+    calculator = EquityCalculator(samples=200, seed=3)
+    equity = calculator.equity(cards('As', 'Ks'), cards('Qs', 'Js', 'Ts', '2d', '3c'))
+    assert equity == 1.0
+
+
+def test_repeated_queries_hit_the_cache():
+    calculator = EquityCalculator(samples=200, cache_size=2, seed=4)
+    first = calculator.equity(cards('7c', '2d'), cards('Ah', 'Kh', '9s'))
+    # Card order does not change the cache key
+    second = calculator.equity(cards('2d', '7c'), cards('9s', 'Kh', 'Ah'))
+    assert first == second
+    assert (calculator.hits, calculator.misses) == (1, 1)
+
+    calculator.equity(cards('As', 'Ad'))
+    calculator.equity(cards('Ks', 'Kd'))
+    assert len(calculator.cache) == 2
+
+
+def test_preflop_table_round_trip(tmp_path):
+    path = str(tmp_path / 'table.bin')
+    rows = [[(index + opponents) / 1000 for index in range(NUM_CLASSES)] for opponents in range(3)]
+    write_table(path, rows)
+    table = PreflopTable(path)
+
+    aces = cards('As', 'Ah')
+    index = hand_class_index(aces)
+    assert abs(table.equity(aces, 1) - index / 1000) < 1e-4
+    assert abs(table.equity(aces, 3) - (index + 2) / 1000) < 1e-4
+    # Opponent counts beyond the table use the last row
+    assert table.equity(aces, 9) == table.equity(aces, 3)
+    # Suited and offsuit versions of the same ranks are different classes
+    assert hand_class_index(cards('Ks', 'Qs')) != hand_class_index(cards('Ks', 'Qh'))
+    assert hand_class_index(cards('Ks', 'Qs')) == hand_class_index(cards('Qd', 'Kd'))
+
+
+def test_cancelled_estimate_is_not_cached():
+    calculator = EquityCalculator(samples=100000, batch_size=50, seed=4)
+    cancel = threading.Event()
+    cancel.set()
+    calculator.equity(cards('As', 'Ks'), cards('Qs', '7d', '2c'), cancel=cancel)
+    assert not calculator.cache
+    # Nor is one cut short by its time budget
+    calculator.equity(cards('As', 'Ks'), cards('Qs', '7d', '2c'), time_budget=0.0)
+    assert not calculator.cache
+
+
+def test_low_sample_estimate_is_not_served_to_larger_budgets():
+    calculator = EquityCalculator(samples=2000, seed=4)
+    calculator.equity(cards('As', 'Ks'), cards('Qs', '7d', '2c'), samples=50)
+    calculator.equity(cards('As', 'Ks'), cards('Qs', '7d', '2c'))
+    assert (calculator.hits, calculator.misses) == (0, 2)
+    # The full-budget estimate serves smaller budgets too
+    calculator.equity(cards('As', 'Ks'), cards('Qs', '7d', '2c'), samples=50)
+    assert calculator.hits == 1
+
+
+def test_exact_equity_matches_brute_force_on_the_river():
+    hand, board = cards('As', 'Ks'), cards('Qs', '7d', '2c', '9h', 'Kc')
+    hero = eval7.evaluate(hand + board)
+    deck = [card for card in FULL_DECK if card not in hand + board]
+    outcomes = [eval7.evaluate(list(pair) + board) for pair in combinations(deck, 2)]
+    expected = sum(1.0 if hero > score else 0.5 if hero == score else 0.0 for score in outcomes) / len(outcomes)
+    equity, complete = enumerate_equity(hand, board)
+    assert complete
+    assert abs(equity - expected) < 1e-12
+
+
+def test_exact_equity_stops_once_thresholds_are_settled():
+    hand, board = cards('7h', '7c'), cards('7s', '7d', '2c', '9h')
+    exact, complete = enumerate_equity(hand, board)
+    assert complete and exact > 0.99
+    early, complete = enumerate_equity(hand, board, thresholds=(0.5,))
+    assert not complete
+    assert early > 0.5
+    # The river has a single runout, it stops within it
+    river = board + cards('Kc')
+    early, complete = enumerate_equity(hand, river, thresholds=(0.5,))
+    assert not complete and early > 0.5
+
+    cancel = threading.Event()
+    cancel.set()
+    _, complete = enumerate_equity(cards('Ah', '2h'), river, cancel=cancel)
+    assert not complete
+
+    # A weighted range: only the hands that beat us on this board
+    equity, _ = enumerate_equity(cards('Ah', '2h'), cards('Kd', '7s', '6s', '2c', '3d'), [(cards('Kh', 'Kc'), 1.0), (cards('As', 'Ad'), 0.0)])
+    assert equity == 0.0
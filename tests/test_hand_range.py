@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for weighted hand ranges and their equity.
+"""
+import os
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+import numpy as np
+
+from equity import enumerate_equity
+from hand_range import NUM_COMBOS, HandRange, blocked_combos, combo_equities, combo_index, hero_equity, range_equity
+
+
+def cards(*names):
+    return [eval7.Card(name) for name in names]
+
+
+def test_ranges_from_classes_and_hands():
+    suited = HandRange.from_classes(['AKs'])
+    assert len(suited) == 4 and suited.total() == 4.0
+    assert suited.weight(cards('As', 'Ks')) == 1.0 and suited.weight(cards('As', 'Kd')) == 0.0
+    # A class name without a suffix takes both the suited and offsuit combos
+    assert len(HandRange.from_classes(['AK'])) == 16
+    assert len(HandRange.from_classes(['QQ', '72o'])) == 6 + 12
+
+    hands = HandRange.from_hands([cards('Qh', 'Qc'), cards('7d', '2s')], weight=0.5)
+    assert len(hands) == 2 and hands.total() == 1.0
+    # Either card order is the same combo
+    assert hands.weight(cards('Qc', 'Qh')) == 0.5
+    assert HandRange().total() == NUM_COMBOS
+
+
+def test_blocked_combos():
+    assert not blocked_combos([]).any()
+    # Each card is in 51 combos, and one combo holds both
+    assert np.count_nonzero(blocked_combos(cards('As'))) == 51
+    blocked = blocked_combos(cards('As', 'Kd'))
+    assert np.count_nonzero(blocked) == 101
+    assert blocked[combo_index(cards('As', 'Kd'))] and not blocked[combo_index(cards('Ah', 'Kh'))]
+
+
+def test_range_equity_matches_enumeration_with_blockers():
+    hand, board = cards('Ah', 'Kd'), cards('Kh', '7s', '6s', '2c')
+    opponent = HandRange.from_classes(['QQ', '77', 'AK', 'T9s'])
+    # Blockers: our ace and the two kings seen leave 3 x 2 AK combos, the board leaves 3 combos of sevens
+    assert len(opponent.without(hand + board)) == 6 + 3 + 6 + 4
+    expected, _ = enumerate_equity(hand, board, opponent.weighted_hands())
+    assert abs(hero_equity(hand, opponent, board) - expected) < 1e-12
+    assert abs(combo_equities(opponent, board)[combo_index(hand)] - expected) < 1e-12
+    assert abs(range_equity(HandRange.from_hands([hand]), opponent, board) - expected) < 1e-12
+    # Both sides of a range matchup add up to one
+    ours = HandRange.from_classes(['AA', 'KQ', '65s'])
+    assert abs(range_equity(ours, opponent, board) + range_equity(opponent, ours, board) - 1.0) < 1e-9
+
+
+def test_combo_equities_skip_board_blocked_combos():
+    board = cards('Kh', '7s', '6s', '2c', '2d')
+    opponent = HandRange.from_classes(['QQ', 'AK'])
+    equities = combo_equities(opponent, board)
+    # A combo holding a board card cannot be dealt, its equity is 0
+    assert equities[combo_index(cards('Kh', 'Qd'))] == 0.0
+    assert equities[combo_index(cards('Qs', '2c'))] == 0.0
+    # Sevens full beat every QQ and AK combo left
+    assert equities[combo_index(cards('7h', '7d'))] == 1.0
+    live = ~blocked_combos(board)
+    assert np.all((equities[live] >= 0) & (equities[live] <= 1))
+
+
+def test_hero_equity_stops_once_thresholds_are_settled():
+    hand, board = cards('Ah', 'Ad'), cards('Kh', '7s', '6s', '2c')
+    opponent = HandRange.from_classes(['KQ', 'T9s', '55'])
+    full = hero_equity(hand, opponent, board)
+    settled = hero_equity(hand, opponent, board, thresholds=(0.3, 0.5))
+    assert full > 0.5 and settled > 0.5 and settled != full
+    # Within the bounds, so it lands on the same side of a threshold near the exact value
+    assert hero_equity(hand, opponent, board, thresholds=(full - 0.01,)) > full - 0.01
+    cancel = threading.Event()
+    cancel.set()
+    assert 0.0 <= hero_equity(hand, opponent, board, cancel=cancel) <= 1.0
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the queued, rate-limited logging mode.
+"""
+import logging
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logging_config import RateLimitFilter, configure_logging, stop_listener
+
+
+def test_queued_records_are_rendered_when_logged(tmp_path):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    path = str(tmp_path / 'client.log')
+    try:
+        configure_logging(path, logging.DEBUG, queued=True, rate_limit=2)
+        changed = {'pot'}
+        logger = logging.getLogger('test_logging')
+        for _ in range(5):
+            logger.debug("Changed %s", changed)
+        # Updated in place after logging, as the live round state is
+        changed.clear()
+        changed.update(range(100))
+        logger.warning("Warnings are never dropped")
+        stop_listener()
+    finally:
+        root.handlers[:] = handlers
+        root.setLevel(level)
+    with open(path) as file:
+        lines = file.read().splitlines()
+    assert [line.split(' - ', 3)[3] for line in lines] == ["Changed {'pot'}", "Changed {'pot'}", "Warnings are never dropped"]
+
+
+def test_rate_limit_reports_suppressed_records():
+    rate_limit = RateLimitFilter(rate=1, burst=1)
+
+    def record(created):
+        entry = logging.LogRecord('bot', logging.INFO, __file__, 1, "Action %s", ('CALL',), None)
+        entry.created = created
+        return entry
+
+    assert rate_limit.filter(record(0.0))
+    assert not rate_limit.filter(record(0.1))
+    assert not rate_limit.filter(record(0.2))
+    passed = record(1.5)
+    assert rate_limit.filter(passed)
+    assert passed.getMessage() == "Action CALL [2 similar messages suppressed]"
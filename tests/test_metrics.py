@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the latency histograms and the metrics export.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import LatencyHistogram, Metrics, bucket_index, bucket_value
+
+
+def test_buckets_are_within_one_64th_of_the_value():
+    for value in (0, 1, 127, 128, 1000, 123456, 98765432109):
+        low = bucket_value(bucket_index(value))
+        assert low <= value
+        assert value - low <= value / 64
+
+
+def test_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+    assert histogram.count == 1000
+    assert abs(histogram.percentile(0.5) - 500000) <= 500000 / 64
+    assert abs(histogram.percentile(0.99) - 990000) <= 990000 / 64
+    assert histogram.percentile(1.0) == 1000000
+
+
+def test_prometheus_export():
+    metrics = Metrics({'handler_latency': 'message_type'})
+    metrics.observe('handler_latency', 'Game State', 2000)
+    metrics.increment('messages', 'Game State')
+    text = metrics.to_prometheus()
+    assert 'poker_client_handler_latency_seconds_count{message_type="Game State"} 1' in text
+    assert 'poker_client_messages_total{label="Game State"} 1' in text
+    assert metrics.to_json()['counters'] == {'messages': {'Game State': 1}}
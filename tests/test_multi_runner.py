@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-session host's selector loop, driven over socket pairs.
+"""
+import json
+import os
+import socket
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers import game
+from multi_runner import MultiSessionHost, SessionRunner
+from player import SimplePlayer
+from results_store import ResultsWriter, load_results
+from type.poker_action import PokerAction
+
+
+def stream(*games):
+    """Bytes the server sends for the games, one message per line."""
+    return ''.join(line + '\n' for lines in games for line in lines).encode()
+
+
+def connected_session(host, result_path):
+    """A session whose socket is one end of a socket pair, and the server's end."""
+    session = SessionRunner('localhost', 0, result_path, sim=True)
+    session.client_socket.close()
+    session.client_socket, server = socket.socketpair()
+    session.metrics_prom_path = None
+    session.metrics_json_path = None
+    session.player_id = 1
+    bot = SimplePlayer()
+    bot.set_id(1)
+    session.set_bot(bot)
+    host.add_session(session)
+    return session, server
+
+
+def received_actions(server):
+    server.settimeout(1.0)
+    data = b''
+    while True:
+        chunk = server.recv(4096)
+        if not chunk:
+            return [json.loads(line)['message']['action'] for line in data.splitlines()]
+        data += chunk
+
+
+class DecidedAfterOneGame:
+    """Sequential test stand-in that is final after the first score."""
+    is_final = True
+
+    def add(self, score):
+        return self
+
+    def summary(self):
+        return 'decided'
+
+
+def test_selector_loop_serves_sessions_until_closed_or_stopped(tmp_path):
+    results_log = str(tmp_path / 'results.jsonl')
+    host = MultiSessionHost('localhost', 0, SimplePlayer, 0, str(tmp_path / 'result.log'), report_interval=0, results_log=results_log)
+    first, first_server = connected_session(host, str(tmp_path / 'result_0.log'))
+    first.set_results_writer(ResultsWriter(results_log, session=host.results_session))
+    second, second_server = connected_session(host, str(tmp_path / 'result_1.log'))
+    second.set_evaluator(DecidedAfterOneGame())
+
+    # The first server plays two games and hangs up, the second keeps its end open after two games
+    first_server.sendall(stream(game(-10), game(20)))
+    first_server.shutdown(socket.SHUT_WR)
+    second_server.sendall(stream(game(-10), game(20)))
+    host.run()
+
+    assert first.get_game_count() == 2 and first.messages == 8
+    assert received_actions(first_server) == [PokerAction.FOLD.value, PokerAction.FOLD.value]
+    # Stopped by its sequential test after the first game although the server is still connected
+    assert second.get_game_count() == 1 and second.finished_at is not None
+    assert host.report()['aggregate']['games'] == 3
+    assert list(load_results(results_log).score) == [-10, 20]
+    second_server.close()
+
+
+def test_failed_connects_close_their_sockets(tmp_path, monkeypatch):
+    listener = socket.socket()
+    listener.bind(('localhost', 0))
+    port = listener.getsockname()[1]
+    # Nothing accepts on a closed port, so every connect is refused
+    listener.close()
+    host = MultiSessionHost('localhost', port, SimplePlayer, 2, str(tmp_path / 'result.log'), report_interval=0, results_log=None)
+    closed = []
+    close = SessionRunner.close
+
+    def recording_close(session):
+        closed.append(session)
+        close(session)
+
+    monkeypatch.setattr(SessionRunner, 'close', recording_close)
+    assert host.open_sessions() == 0
+    assert len(closed) == 2 and all(session.client_socket.fileno() == -1 for session in closed)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent opponent statistics.
+"""
+import os
+import sqlite3
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import LocalEngine
+from helpers import CallingBot
+from opponent_stats import SCHEMA_VERSION, OpponentStatsStore
+from player import SimplePlayer
+from type.round_state import RoundStateClient
+
+
+def state(bets, actions):
+    return RoundStateClient.from_message({
+        'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': sum(bets.values()), 'current_player': [1],
+        'current_bet': max(bets.values()), 'min_raise': 20, 'max_raise': 980, 'player_bets': bets, 'player_actions': actions,
+    })
+
+
+def test_opponent_stats_survive_sessions(tmp_path):
+    path = str(tmp_path / 'opponents.db')
+    store = OpponentStatsStore(path)
+    engine = LocalEngine([SimplePlayer(store), CallingBot()], blind_amount=10, seed=7)
+    engine.run(20)
+    profile = store.get(2)
+    assert profile.hands == 20
+    # The calling station never raises beyond its blind, and calls whenever it has to
+    assert profile.pfr_hands == 0
+    assert profile.aggressive_actions == 0
+    assert 0 < profile.vpip <= 1
+    assert profile.showdowns_won <= profile.showdowns <= profile.hands
+    store.close()
+
+    reopened = OpponentStatsStore(path)
+    assert reopened.get(2) == profile
+    assert reopened.get(1).hands == 0
+    reopened.close()
+
+
+def test_only_the_blinds_first_raises_are_posts():
+    store = OpponentStatsStore(':memory:')
+    store.begin_hand(1, [1, 2, 3, 4], 10, small_blind_id=2, big_blind_id=3)
+    store.observe(state({'1': 0, '2': 5, '3': 10, '4': 0}, {'2': 'RAISE', '3': 'RAISE'}))
+    # A short stack shoving less than a big blind raises, it does not post
+    store.observe(state({'1': 0, '2': 5, '3': 10, '4': 8}, {'2': 'RAISE', '3': 'RAISE', '4': 'ALL_IN'}))
+    store.end_hand({}, {})
+    assert store.get(2).aggressive_actions == 0 and store.get(3).aggressive_actions == 0
+    assert store.get(4).aggressive_actions == 1 and store.get(4).pfr == 1.0
+    store.close()
+
+
+def test_old_files_gain_new_counters(tmp_path):
+    path = str(tmp_path / 'opponents.db')
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("CREATE TABLE opponent_stats (player_id TEXT PRIMARY KEY, hands INTEGER NOT NULL DEFAULT 0, folds INTEGER NOT NULL DEFAULT 0)")
+        connection.execute("INSERT INTO opponent_stats VALUES ('2', 12, 5)")
+    connection.close()
+
+    store = OpponentStatsStore(path)
+    profile = store.get(2)
+    assert (profile.hands, profile.folds, profile.showdowns) == (12, 5, 0)
+    store.begin_hand(1, [1, 2], 10)
+    store.end_hand({'2': 20}, {'2': ['As', 'Ad']})
+    assert store.get(2).showdowns_won == 1
+    assert store.connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    store.close()
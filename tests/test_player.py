@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for SimplePlayer's preflop decisions.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player import SimplePlayer
+from type.poker_action import PokerAction
+from type.round_state import RoundStateClient
+
+
+def preflop(current_bet, bets, actions):
+    return RoundStateClient.from_message({
+        'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': sum(bets.values()), 'current_player': [2],
+        'current_bet': current_bet, 'min_raise': 10, 'max_raise': 990, 'player_bets': bets, 'player_actions': actions,
+    })
+
+
+def big_blind_with_seven_deuce():
+    player = SimplePlayer()
+    player.set_id(2)
+    player.on_start(1000, ['Card("7c")', 'Card("2d")'], 10, 2, 1, [1, 2])
+    return player
+
+
+def test_big_blind_takes_its_option_with_a_weak_hand():
+    player = big_blind_with_seven_deuce()
+    # The small blind completed, nothing is left to call
+    assert player.get_action(preflop(10, {'1': 10, '2': 10}, {'1': 'CALL', '2': 'RAISE'}), 990) == (PokerAction.CALL, 0)
+    assert player.get_action(preflop(0, {'1': 0, '2': 0}, {'1': 'CHECK', '2': ''}), 990) == (PokerAction.CHECK, 0)
+
+
+def test_weak_hand_folds_to_a_raise():
+    player = big_blind_with_seven_deuce()
+    assert player.get_action(preflop(40, {'1': 40, '2': 10}, {'1': 'RAISE', '2': 'RAISE'}), 990) == (PokerAction.FOLD, 0)
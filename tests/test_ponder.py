@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for pondering while other players act.
+"""
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+
+import equity
+from player import SimplePlayer
+from ponder import Ponderer
+from replay import ReplayRunner
+from type.round_state import RoundStateClient
+
+
+def cards(*names):
+    return [eval7.Card(name) for name in names]
+
+
+class CountingPlayer(SimplePlayer):
+    """Records the street of every state it ponders on."""
+    def __init__(self):
+        super().__init__()
+        self.pondered = []
+
+    def ponder(self, round_state, remaining_chips, cancel):
+        self.pondered.append(round_state.round)
+
+
+def test_ponder_warms_the_cache_for_get_action():
+    player = SimplePlayer()
+    player.set_id(1)
+    player.my_hand = cards('As', 'Ks')
+    state = RoundStateClient.from_message({
+        'round_num': 1, 'round': 'FLOP', 'community_cards': ['Card("Qs")', 'Card("7d")', 'Card("2c")'],
+        'pot': 40, 'current_player': [2], 'current_bet': 0, 'min_raise': 10, 'max_raise': 980,
+        'player_bets': {'1': 0, '2': 0}, 'player_actions': {'1': 'CALL', '2': 'CHECK'},
+    })
+    assert not state.is_to_act(1)
+
+    equity.default_calculator.clear()
+    ponderer = Ponderer(cancel_timeout=5.0)
+    ponderer.start(player.ponder, state, 980)
+    ponderer.future.result(timeout=5.0)
+    assert ponderer.cancel() is True
+    misses = equity.default_calculator.misses
+    player.evaluate_hand_strength(player.my_hand, state.board, player.count_opponents(state))
+    assert equity.default_calculator.misses == misses
+    ponderer.shutdown()
+
+
+def test_runner_ponders_once_per_street():
+    runner = ReplayRunner()
+    runner.player_id = 1
+    bot = CountingPlayer()
+    runner.set_bot(bot)
+    runner.enable_pondering(Ponderer(cancel_timeout=5.0))
+
+    def state(street, board, pot, actions):
+        return json.dumps({'type': 9, 'message': {
+            'round_num': 1, 'round': street, 'community_cards': board, 'pot': pot, 'current_player': [2], 'current_bet': 0,
+            'min_raise': 10, 'max_raise': 980, 'player_bets': {'1': 0, '2': 0}, 'player_actions': actions,
+        }})
+
+    flop = ['Card("Qs")', 'Card("7d")', 'Card("2c")']
+    runner.handle_messages('\n'.join([
+        state('FLOP', flop, 40, {'1': 'CHECK'}),
+        state('FLOP', flop, 40, {'1': 'CHECK', '2': ''}),
+        state('FLOP', flop, 60, {'1': 'CHECK', '2': 'RAISE'}),
+        state('TURN', flop + ['Card("9h")'], 80, {'1': 'CHECK'}),
+    ]))
+    runner.ponderer.future.result(timeout=5.0)
+    runner.ponderer.shutdown()
+    assert bot.pondered == ['FLOP', 'TURN']
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for frame splitting, decoding and action encoding.
+"""
+import json
+import os
+import socket
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from protocol import ActionWriter, FrameDecoder, decode
+
+
+def test_frames_split_across_chunks():
+    decoder = FrameDecoder()
+    assert decoder.feed(b'{"type": 10, "mess') == []
+    assert decoder.pending() == 18
+    frames = decoder.feed(b'age": "hi"}\n\n{"type": 0}\n{"ty')
+    assert [decode(frame) for frame in frames] == [{'type': 10, 'message': 'hi'}, {'type': 0}]
+    # Frames are independent copies, the buffer keeps being reused
+    assert all(type(frame) is bytes for frame in frames)
+    assert decoder.feed(b'pe": 7}\n') == [b'{"type": 7}']
+    assert decoder.pending() == 0
+
+
+def test_recv_from_socket():
+    receiver, sender = socket.socketpair()
+    try:
+        decoder = FrameDecoder(chunk_size=8)
+        sender.sendall(b'{"a": 1}\n{"b": 2}\n')
+        sender.shutdown(socket.SHUT_WR)
+        frames = []
+        while True:
+            received = decoder.recv_from(receiver)
+            if received is None:
+                break
+            frames.extend(received)
+        assert [decode(frame) for frame in frames] == [{'a': 1}, {'b': 2}]
+    finally:
+        receiver.close()
+        sender.close()
+
+
+def test_action_writer_matches_json():
+    writer = ActionWriter()
+    # A numpy amount takes the template, json.dumps would not serialize it
+    assert writer.encode(3, 4, np.int64(40)) == writer.encode(3, 4, 40)
+    for player_id in (3, 'abc'):
+        for action, amount in ((1, 0), (4, 10000), (4, 12.5), (3, True), (1, None)):
+            expected = {'type': 5, 'message': {'player_id': player_id, 'action': action, 'amount': amount}}
+            encoded = writer.encode(player_id, action, amount)
+            assert encoded == json.dumps(expected).encode('utf-8') + b'\n'
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for narrowing opponent ranges from their actions.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+
+from range_tracker import RangeTracker
+from type.round_state import RoundStateClient
+
+
+def cards(*names):
+    return [eval7.Card(name) for name in names]
+
+
+def state(street, board, bets, actions):
+    return RoundStateClient.from_message({
+        'round_num': 0, 'round': street, 'community_cards': board, 'pot': 60, 'current_player': [1],
+        'current_bet': max(bets.values()), 'min_raise': 20, 'max_raise': 980, 'player_bets': bets, 'player_actions': actions,
+    })
+
+
+def test_range_tracker_narrows_on_raises_once_per_action():
+    tracker = RangeTracker()
+    tracker.begin_hand(1, [1, 2], 10, cards('As', 'Kd'))
+    assert tracker.range(2).weight(cards('As', 'Ah')) == 0.0
+    # The big blind post is not an action
+    assert tracker.observe(state('PREFLOP', [], {'1': 5, '2': 10}, {'1': 'RAISE', '2': 'RAISE'})) == 0
+    assert tracker.observe(state('PREFLOP', [], {'1': 10, '2': 40}, {'1': 'CALL', '2': 'RAISE'})) == 1
+    assert tracker.observe(state('PREFLOP', [], {'1': 10, '2': 40}, {'1': 'CALL', '2': 'RAISE'})) == 0
+    preflop = tracker.range(2)
+    assert preflop.weight(cards('Qh', 'Qc')) > 5 * preflop.weight(cards('7h', '2c'))
+
+    flop = ['Qs', '7d', '2s']
+    tracker.observe(state('FLOP', flop, {'1': 0, '2': 40}, {'1': 'CHECK', '2': 'RAISE'}))
+    flopped = tracker.range(2)
+    assert flopped.weight(cards('Qh', 'Qc')) > 10 * flopped.weight(cards('Jh', 'Tc'))
+    assert abs(flopped.total() - 1.0) < 1e-9
+    # Combos holding a board card are gone once the street is dealt, even before anyone acts on it
+    tracker.observe(state('TURN', flop + ['Kh'], {'1': 0, '2': 0}, {'1': 'CALL', '2': 'RAISE'}))
+    turned = tracker.range(2)
+    assert turned.weight(cards('Qs', 'Qh')) == 0.0 and turned.weight(cards('Kh', 'Kc')) == 0.0
+    assert turned.weight(cards('Qh', 'Qc')) > 0 and abs(turned.total() - 1.0) < 1e-9
+
+
+def test_only_the_blinds_posts_are_skipped():
+    tracker = RangeTracker()
+    tracker.begin_hand(1, [1, 2, 3], 10, cards('As', 'Kd'), small_blind_id=2, big_blind_id=3)
+    assert tracker.observe(state('PREFLOP', [], {'1': 0, '2': 5, '3': 10}, {'2': 'RAISE', '3': 'RAISE'})) == 0
+    # A short stack's all-in below the big blind is a real raise
+    tracker.begin_hand(1, [1, 2, 3, 4], 10, cards('As', 'Kd'), small_blind_id=2, big_blind_id=3)
+    assert tracker.observe(state('PREFLOP', [], {'1': 0, '2': 5, '3': 10, '4': 8}, {'2': 'RAISE', '3': 'RAISE', '4': 'ALL_IN'})) == 1
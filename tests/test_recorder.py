@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for recording the server message stream and replaying it against a bot.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from helpers import game
+from player import SimplePlayer
+from recorder import MessageRecorder, read_recording
+from replay import ReplayRunner, replay_files
+from type.poker_action import PokerAction
+
+
+@pytest.mark.parametrize('name', ['stream.log', 'stream.log.gz'])
+def test_recording_round_trips_and_appends(tmp_path, name):
+    path = str(tmp_path / name)
+    recorder = MessageRecorder(path)
+    recorder.record('{"type": 2}', timestamp=1.5)
+    recorder.record(b'{"type": 9}', timestamp=2.25)
+    recorder.close()
+    # Reopening appends, for gzip as a second member
+    recorder = MessageRecorder(path)
+    recorder.record('{"type": 7}', timestamp=3.0)
+    recorder.close()
+    assert list(read_recording(path)) == [(1.5, '{"type": 2}'), (2.25, '{"type": 9}'), (3.0, '{"type": 7}')]
+
+
+@pytest.mark.parametrize('name', ['stream.log', 'stream.log.gz'])
+def test_runner_flushes_the_recording_at_game_end(tmp_path, name):
+    path = str(tmp_path / name)
+    runner = ReplayRunner()
+    runner.player_id = 1
+    runner.set_bot(SimplePlayer())
+    runner.set_recorder(MessageRecorder(path))
+    runner.handle_messages('\n'.join(game(-10)))
+    # Readable while the recorder is still open, as after a crash
+    assert [line for _, line in read_recording(path)] == game(-10)
+    runner.close()
+
+
+def test_replay_feeds_the_recording_to_a_fresh_bot(tmp_path):
+    path = str(tmp_path / 'stream.log')
+    recorder = MessageRecorder(path)
+    for line in game(-10) + game(20):
+        recorder.record(line)
+    recorder.close()
+
+    runner = ReplayRunner()
+    runner.player_id = 1
+    runner.set_bot(SimplePlayer())
+    assert runner.replay(path) == 8
+    assert runner.get_game_count() == 2 and runner.get_total_score() == 10
+    assert [action['action'] for action in runner.sent_actions()] == [PokerAction.FOLD.value] * 2
+
+    summary = replay_files([path, path], SimplePlayer)
+    assert summary['messages'] == 16 and summary['games'] == 4
+    assert summary['actions'] == {PokerAction.FOLD.name: 4}
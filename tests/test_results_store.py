@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured results writer, compaction and aggregations.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import ProcessPoolExecutor
+
+from results_store import ResultsWriter, by_opponent, load_columns, load_results, read_log, rolling, summarize
+
+
+def test_writer_compacts_and_aggregates(tmp_path):
+    log_path, columns_path = str(tmp_path / 'results.jsonl'), str(tmp_path / 'results.npz')
+    first = ResultsWriter(log_path, columns_path, session=1, flush_every=2, compact_every=4)
+    for game, score in enumerate([10, -5, 20, -10, 5], 1):
+        first.add(game, 'me', score, {'me': score, 'alice': -score})
+    # Two batches are written and one game is still buffered, compaction waits for close
+    assert len(read_log(log_path)) == 4 and len(load_columns(columns_path)) == 0
+    first.close()
+    assert len(read_log(log_path)) == 0 and len(load_columns(columns_path)) == 5
+
+    second = ResultsWriter(log_path, columns_path, session=2, compact_every=0)
+    second.add(1, 'me', 30, {'me': 30, 'bob': -20, 'carol': -10})
+    second.close()
+    assert len(read_log(log_path)) == 1
+
+    table = load_results(log_path, columns_path)
+    assert summarize(table)['games'] == 6 and summarize(table)['total'] == 50
+    latest = table.latest_session()
+    assert len(latest) == 1 and latest.score[0] == 30
+    assert sorted(row['opponent'] for row in by_opponent(latest)) == ['bob', 'carol']
+    alice = next(row for row in by_opponent(table) if row['opponent'] == 'alice')
+    assert (alice['games'], alice['our_total'], alice['their_total']) == (5, 20, -20)
+    windows = rolling(table, 2)
+    assert (windows['last'], windows['best'], windows['worst']) == (17.5, 17.5, -2.5)
+
+
+def write_games(log_path, columns_path, session):
+    writer = ResultsWriter(log_path, columns_path, session=session, flush_every=5, compact_every=40)
+    for game in range(1, 301):
+        writer.add(game, 'me', 1, {'me': 1})
+    writer.close()
+
+
+def test_concurrent_writers_lose_no_games_to_compaction(tmp_path):
+    log_path, columns_path = str(tmp_path / 'results.jsonl'), str(tmp_path / 'results.npz')
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write_games, [log_path] * 4, [columns_path] * 4, range(4)))
+    table = load_results(log_path, columns_path)
+    assert len(table) == 1200
+    assert len(set(zip(table.session.tolist(), table.game.tolist()))) == 1200
+
+
+def test_check_reads_only_the_session_of_the_last_run(tmp_path, monkeypatch, capsys):
+    import check
+    from results_store import write_session_marker
+
+    log_path, columns_path = str(tmp_path / 'results.jsonl'), str(tmp_path / 'results.npz')
+    result_path = str(tmp_path / 'game_result.log')
+    for session, scores in ((1, [100, 200]), (2, [10.5, -3.5])):
+        writer = ResultsWriter(log_path, columns_path, session=session)
+        for game, score in enumerate(scores, 1):
+            writer.add(game, 'me', score, {'me': score})
+        writer.close()
+    monkeypatch.setattr(check, 'RESULT_FILE', result_path)
+    monkeypatch.setattr(check, 'load_results', lambda: load_results(log_path, columns_path))
+
+    # A run without the store leaves no marker, and nothing is read from an earlier session
+    check.extract_score()
+    assert capsys.readouterr().out == "0\n"
+    write_session_marker(result_path, 1)
+    check.extract_score()
+    assert capsys.readouterr().out == "300\n"
+    # Scores are truncated like Runner.total_points
+    write_session_marker(result_path, 2)
+    check.extract_score()
+    assert capsys.readouterr().out == "7\n"
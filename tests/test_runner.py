@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for how Runner feeds server messages to the bot.
+"""
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player import SimplePlayer
+from replay import ReplayRunner
+from results_store import ResultsWriter, read_log
+
+
+class ObservingPlayer(SimplePlayer):
+    """Records the actions of every state it observes."""
+    def __init__(self):
+        super().__init__()
+        self.observed = []
+
+    def observe(self, round_state):
+        self.observed.append(dict(round_state.player_actions))
+
+
+def state(actions):
+    return json.dumps({'type': 9, 'message': {
+        'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': 30, 'current_player': [3], 'current_bet': 10,
+        'min_raise': 10, 'max_raise': 980, 'player_bets': {'1': 0, '2': 10, '3': 0}, 'player_actions': actions,
+    }})
+
+
+def test_runner_feeds_every_state_to_observe():
+    runner = ReplayRunner()
+    runner.player_id = 1
+    bot = ObservingPlayer()
+    runner.set_bot(bot)
+    # Player 2's raise is followed by player 3's call before we are asked to act
+    runner.handle_messages('\n'.join([state({'2': 'RAISE'}), state({'2': 'RAISE', '3': 'CALL'})]))
+    assert bot.observed == [{'2': 'RAISE'}, {'2': 'RAISE', '3': 'CALL'}]
+
+
+class FailingPonderer:
+    def shutdown(self):
+        raise RuntimeError('worker stuck')
+
+
+def test_close_flushes_results_after_a_failing_resource(tmp_path):
+    log_path = str(tmp_path / 'results.jsonl')
+    runner = ReplayRunner()
+    runner.ponderer = FailingPonderer()
+    runner.set_results_writer(ResultsWriter(log_path, str(tmp_path / 'results.npz'), session=1, compact_every=0))
+    runner.results_writer.add(1, 1, 10, {'1': 10})
+    runner.close()
+    assert len(read_log(log_path)) == 1
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the sequential probability ratio test and the runner stopping on its decision.
+"""
+import json
+import os
+import random
+import statistics
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player import SimplePlayer
+from replay import ReplayRunner
+from sequential import Decision, RunningStats, SequentialTest
+
+
+def test_running_stats_match_the_statistics_module():
+    values = [3.0, -10.0, 250.0, 0.0, -5000.0, 7.5]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert abs(stats.mean - statistics.mean(values)) < 1e-9
+    assert abs(stats.variance - statistics.variance(values)) < 1e-6
+
+
+def test_sequential_test_stops_early_on_clear_results():
+    rng = random.Random(2)
+    outcomes = {}
+    for name, mean in (('better', 100.0), ('worse', -100.0), ('even', 0.0)):
+        test = SequentialTest(delta=50.0)
+        games = 0
+        while not test.add(rng.gauss(mean, 400.0)).is_final:
+            games += 1
+        outcomes[name] = (test.decision, games)
+    assert outcomes['better'][0] == Decision.BETTER
+    assert outcomes['worse'][0] == Decision.WORSE
+    assert outcomes['even'][0] == Decision.NEGLIGIBLE
+    # A fixed-size test with the same error rates needs about 830 games
+    assert all(games < 700 for _, games in outcomes.values())
+
+
+def test_runner_disconnects_once_the_test_is_decided():
+    runner = ReplayRunner()
+    runner.set_bot(SimplePlayer())
+    runner.set_evaluator(SequentialTest(delta=5.0, min_games=5))
+    start = json.dumps({'type': 2, 'message': {'hands': ['Card("2c")', 'Card("7d")'], 'blind_amount': 10, 'all_players': [1, 2]}})
+    state = json.dumps({'type': 9, 'message': {
+        'round_num': 0, 'round': 'PREFLOP', 'community_cards': [], 'pot': 15, 'current_player': [2], 'current_bet': 10,
+        'min_raise': 20, 'max_raise': 990, 'player_bets': {'1': 5, '2': 10}, 'player_actions': {'1': 'RAISE', '2': 'RAISE'},
+    }})
+    games = 0
+    while not runner.stop_requested and games < 100:
+        # Wins of 100 and 90 chips: clearly better than even after a few games
+        score = 100 if games % 2 else 90
+        end = json.dumps({'type': 7, 'message': {'player_score': score, 'all_scores': {'1': score, '2': -score}, 'active_players_hands': {}}})
+        runner.handle_messages('\n'.join([start, state, end]))
+        games += 1
+    assert games == runner.get_game_count() < 20
+    assert runner.evaluator.stats.mean > 0
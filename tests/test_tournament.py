@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the round-robin tournament, duplicate deals and the parameter sweep.
+"""
+import csv
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from engine import LocalEngine
+from helpers import CallingBot
+from player import SimplePlayer
+from sweep import grid, parse_space, random_search, run_sweep, write_results
+from tournament import leaderboard, parse_entries, run_tournament, schedule
+
+
+def test_tournament_merges_chunks_into_a_leaderboard():
+    entries = parse_entries(['player.SimplePlayer', 'simple2=player:SimplePlayer', 'simple3=player.SimplePlayer'])
+    assert list(entries) == ['SimplePlayer', 'simple2', 'simple3']
+    results = run_tournament(entries, games_per_match=30, chunk_size=20, seed=3, workers=1)
+    # Three pairs, each split into chunks of 20 and 10 games
+    assert len(results) == 6
+    standings = leaderboard(results)
+    assert sum(standing.chips for standing in standings) == 0
+    assert all(standing.games == 60 for standing in standings)
+    assert standings[0].chips_per_100 >= standings[-1].chips_per_100
+    # Same seed, same results
+    assert [result.scores for result in run_tournament(entries, 30, 20, seed=3, workers=1)] == [result.scores for result in results]
+
+    with pytest.raises(ValueError):
+        run_tournament(parse_entries(['player.SimplePlayer', 'player.NoSuchBot']), 10, workers=1)
+
+
+@pytest.mark.parametrize('bot_class', [CallingBot, SimplePlayer])
+def test_duplicate_deals_cancel_card_luck(bot_class):
+    # Without duplicates, identical strategies still win and lose chips on the cards they are dealt
+    engine = LocalEngine([bot_class(), bot_class()], seed=5)
+    assert any(engine.play_game()[1] for _ in range(20))
+
+    # With them, whatever one seat wins on a deal it loses with the other seat's cards
+    engine = LocalEngine([bot_class(), bot_class()], seed=5)
+    deals = engine.run_duplicate(10)
+    assert engine.get_game_count() == 20
+    assert all(deal == {1: 0, 2: 0} for deal in deals)
+
+
+def test_every_pair_plays_the_same_deck_seeds():
+    tasks = schedule({'a': 'x.A', 'b': 'x.B', 'c': 'x.C'}, games_per_match=25, chunk_size=11, seed=4, duplicate=True)
+    assert [task.games for task in tasks[:3]] == [10, 10, 4]
+    assert [task.seed for task in tasks] == [4, 5, 6] * 3
+
+
+def test_sweep_ranks_parameter_sets_on_shared_deals(tmp_path):
+    space = parse_space(['call_strength=3,9', 'all_in_pairs=AKQ', 'top_pair_needs_kicker=true'])
+    assert space == {'call_strength': [3.0, 9.0], 'all_in_pairs': ['AKQ'], 'top_pair_needs_kicker': [True]}
+    candidates = grid(space)
+    assert len(candidates) == 2
+    results = run_sweep(candidates, 'player.SimplePlayer', games=40, seed=1, workers=1)
+    assert [result.games for result in results] == [40, 40]
+    # Calling almost every open and almost none play differently on the same deals
+    chips = {result.params['call_strength']: result.chips for result in results}
+    assert chips[3.0] != chips[9.0]
+    assert results[0].chips_per_100 >= results[1].chips_per_100
+    # The same seed deals the same cards, so the totals repeat
+    repeated = run_sweep(candidates, 'player.SimplePlayer', games=40, seed=1, workers=1)
+    assert {result.params['call_strength']: result.chips for result in repeated} == chips
+
+    path = str(tmp_path / 'sweep.csv')
+    write_results(path, results)
+    with open(path) as file:
+        rows = list(csv.DictReader(file))
+    assert [row['rank'] for row in rows] == ['1', '2']
+    assert rows[0]['min_kicker'] == 'Q'
+
+
+def test_random_search_draws_distinct_grid_points():
+    space = {'call_strength': [5.0, 6.0, 7.0], 'all_in_pairs': ['AK', 'AKQ'], 'min_kicker': ['J', 'Q', 'K']}
+    drawn = random_search(space, 5, seed=2)
+    assert len(drawn) == 5 and all(params in grid(space) for params in drawn)
+    assert len({tuple(params.values()) for params in drawn}) == 5
+    assert random_search(space, 5, seed=2) == drawn
+    assert len(random_search(space, 100)) == 18
+    # A space far too large to list is sampled directly
+    huge = {name: list(range(10)) for name in 'abcdefghijkl'}
+    assert len(random_search(huge, 3)) == 3
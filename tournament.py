@@ -0,0 +1,253 @@
+# python tournament.py player.SimplePlayer tight=my_bots.TightPlayer -g 2000
+# Round-robin tournament between bots on the in-process engine, one process per core
+
+import argparse
+import importlib
+import json
+import logging
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bot import Bot
+from engine import LocalEngine
+
+# Games per worker task; matches are split into chunks of this size so all cores stay busy
+DEFAULT_CHUNK_SIZE = 500
+
+
+def load_bot_factory(path: str) -> Callable[[], Bot]:
+    """
+    Resolve a dotted path like 'player.SimplePlayer' or 'my_bots:make_tight'.
+
+    Args:
+        path: Module and attribute, separated by the last dot or by a colon
+
+    Returns:
+        Callable[[], Bot]: Class or function creating a new bot
+    """
+    module_name, separator, attribute = path.rpartition(':') if ':' in path else path.rpartition('.')
+    if not separator or not module_name or not attribute:
+        raise ValueError(f"Bot path must look like 'module.Attribute': {path}")
+    try:
+        factory = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot load bot {path}: {e}") from e
+    if not callable(factory):
+        raise ValueError(f"Bot {path} is not callable")
+    return factory
+
+
+def parse_entries(specs: Sequence[str]) -> Dict[str, str]:
+    """
+    Map entry names to bot paths.
+
+    Args:
+        specs: 'name=module.Attribute' or just 'module.Attribute', named after the attribute
+
+    Returns:
+        Dict[str, str]: Entry name to bot path, in the given order
+    """
+    entries = {}
+    for spec in specs:
+        name, _, path = spec.rpartition('=')
+        name = name or path.replace(':', '.').rsplit('.', 1)[-1]
+        if name in entries:
+            raise ValueError(f"Duplicate entry name: {name}")
+        entries[name] = path
+    return entries
+
+
+@dataclass
+class MatchTask:
+    players: Tuple[str, str]  # Entry names, in seat order
+    paths: Tuple[str, str]
+    games: int
+    seed: int
+    duplicate: bool = False  # Play every deal twice with the seats swapped
+
+
+@dataclass
+class MatchResult:
+    players: Tuple[str, str]
+    games: int
+    scores: Tuple[int, int]  # Chips won by each player
+    seconds: float
+    # Scoring units of the first player (games, or deals in duplicate mode) and the sum of their squares
+    units: int = 0
+    square_sum: float = 0.0
+
+    @property
+    def variance(self) -> float:
+        """Variance of the first player's total, from the spread of its units."""
+        if self.units < 2:
+            return 0.0
+        mean = self.scores[0] / self.units
+        return max(self.square_sum - self.units * mean * mean, 0.0) * self.units / (self.units - 1)
+
+
+def play_match(task: MatchTask) -> MatchResult:
+    """Play one chunk of a match on a fresh engine; runs in a worker process."""
+    start = time.perf_counter()
+    # Bots drawing from the global RNG get the same numbers in every match with this seed
+    random.seed(task.seed)
+    bots = [load_bot_factory(path)() for path in task.paths]
+    engine = LocalEngine(bots, seed=task.seed)
+    first = engine.player_ids[0]
+    if task.duplicate:
+        units = [deal[first] for deal in engine.run_duplicate(task.games // 2)]
+    else:
+        units = [engine.play_game()[first] for _ in range(task.games)]
+    totals = engine.get_total_scores()
+    scores = (totals[first], totals[engine.player_ids[1]])
+    return MatchResult(task.players, engine.get_game_count(), scores, time.perf_counter() - start,
+                       len(units), float(sum(unit * unit for unit in units)))
+
+
+def schedule(entries: Dict[str, str], games_per_match: int, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = 0, duplicate: bool = False) -> List[MatchTask]:
+    """
+    Split a round robin into worker tasks.
+
+    Deck seeds depend only on the chunk's position within its match, so
+    every pair of entries plays the same deals (common random numbers) and
+    differences between entries are not drowned out by card luck.
+
+    Args:
+        entries: Entry name to bot path
+        games_per_match: Games played by every pair of entries
+        chunk_size: Maximum games per task
+        seed: Base seed for the deck seeds
+        duplicate: Play every deal twice with the seats swapped; game counts are rounded down to even
+
+    Returns:
+        List[MatchTask]: Tasks covering every pair
+    """
+    if duplicate:
+        games_per_match -= games_per_match % 2
+        chunk_size = max(2, chunk_size - chunk_size % 2)
+    tasks = []
+    for first, second in combinations(entries, 2):
+        remaining = games_per_match
+        chunk = 0
+        while remaining > 0:
+            games = min(chunk_size, remaining)
+            tasks.append(MatchTask((first, second), (entries[first], entries[second]), games, seed + chunk, duplicate))
+            remaining -= games
+            chunk += 1
+    return tasks
+
+
+def run_tournament(entries: Dict[str, str], games_per_match: int, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = 0, workers: Optional[int] = None, duplicate: bool = False) -> List[MatchResult]:
+    """
+    Play every pair of entries against each other.
+
+    Args:
+        entries: Entry name to bot path, at least two
+        games_per_match: Games played by every pair of entries
+        chunk_size: Maximum games per worker task
+        seed: Base seed for the deck shuffles
+        workers: Worker processes, all cores when None, in-process when 1
+        duplicate: Play every deal twice with the seats swapped
+
+    Returns:
+        List[MatchResult]: One result per task
+    """
+    if len(entries) < 2:
+        raise ValueError("A tournament needs at least two entries")
+    for path in entries.values():
+        # Fail before starting any worker
+        load_bot_factory(path)
+    tasks = schedule(entries, games_per_match, chunk_size, seed, duplicate)
+    if workers == 1:
+        return [play_match(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(play_match, tasks))
+
+
+@dataclass
+class Standing:
+    name: str
+    games: int = 0
+    chips: int = 0
+    matches_won: int = 0
+    variance: float = 0.0  # Of the chip total, summed over independent chunks
+
+    @property
+    def chips_per_100(self) -> float:
+        """Chips won per 100 games (hands)."""
+        return 100.0 * self.chips / self.games if self.games else 0.0
+
+    @property
+    def margin_per_100(self) -> float:
+        """Half-width of the 95% confidence interval of chips_per_100."""
+        return 1.96 * 100.0 * math.sqrt(self.variance) / self.games if self.games else 0.0
+
+
+def leaderboard(results: Sequence[MatchResult]) -> List[Standing]:
+    """
+    Merge match results into standings, best chips per 100 games first.
+
+    A match is won by the entry ahead in chips over all of its chunks.
+    """
+    standings: Dict[str, Standing] = {}
+    matches: Dict[Tuple[str, str], List[int]] = {}
+    for result in results:
+        for name, score in zip(result.players, result.scores):
+            standing = standings.setdefault(name, Standing(name))
+            standing.games += result.games
+            standing.chips += score
+            # Heads-up the second player's total mirrors the first's, with the same variance
+            standing.variance += result.variance
+        match = matches.setdefault(result.players, [0, 0])
+        match[0] += result.scores[0]
+        match[1] += result.scores[1]
+    for players, (first, second) in matches.items():
+        if first != second:
+            standings[players[0] if first > second else players[1]].matches_won += 1
+    return sorted(standings.values(), key=lambda standing: standing.chips_per_100, reverse=True)
+
+
+def format_leaderboard(standings: Sequence[Standing]) -> str:
+    lines = [f"{'#':>3} {'Bot':<24} {'Games':>9} {'Chips':>11} {'Chips/100':>10} {'95% +/-':>9} {'Matches':>8}"]
+    for rank, standing in enumerate(standings, 1):
+        lines.append(f"{rank:>3} {standing.name:<24} {standing.games:>9} {standing.chips:>11} {standing.chips_per_100:>10.2f} "
+                     f"{standing.margin_per_100:>9.2f} {standing.matches_won:>8}")
+    return '\n'.join(lines)
+
+
+def main(specs: Sequence[str], games: int, chunk_size: int, seed: int, workers: Optional[int], output: Optional[str], duplicate: bool = False) -> None:
+    entries = parse_entries(specs)
+    start = time.perf_counter()
+    results = run_tournament(entries, games, chunk_size, seed, workers, duplicate)
+    standings = leaderboard(results)
+    print(format_leaderboard(standings))
+    print(f"{sum(result.games for result in results)} games in {time.perf_counter() - start:.1f}s")
+    if output:
+        with open(output, 'w') as file:
+            json.dump({
+                'entries': entries,
+                'games_per_match': games,
+                'seed': seed,
+                'duplicate': duplicate,
+                'standings': [dict(asdict(standing), chips_per_100=standing.chips_per_100, margin_per_100=standing.margin_per_100) for standing in standings],
+                'matches': [asdict(result) for result in results],
+            }, file, indent=2)
+        print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round-Robin Bot Tournament")
+    parser.add_argument('bots', nargs='+', help="Bots as 'module.Attribute' or 'name=module.Attribute'")
+    parser.add_argument('-g', '--games', type=int, default=1000, help='Games per pair of bots')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Games per worker task')
+    parser.add_argument('--seed', type=int, default=0, help='Base seed for the deck shuffles')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--duplicate', action='store_true', help='Play every deal twice with the seats swapped')
+    parser.add_argument('-o', '--output', type=str, default=None, help='Write standings and match results to this JSON file')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    main(args.bots, args.games, args.chunk_size, args.seed, args.workers, args.output, args.duplicate)
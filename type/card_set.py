@@ -0,0 +1,80 @@
+from typing import Iterable, Tuple
+
+import eval7
+
+from type.cards import CARD_BY_BIT
+
+# Bits per suit in a card mask, one per rank from '2' (bit 0) to 'A' (bit 12)
+RANK_BITS = 13
+RANK_MASK = (1 << RANK_BITS) - 1
+
+
+class CardSet:
+    """
+    Set of cards stored as a 52-bit mask using the eval7 card layout
+    (bit suit * 13 + rank), with per-suit 13-bit rank masks so board texture
+    checks are a handful of bit operations.
+    """
+    __slots__ = ('mask', 'suit_masks', 'rank_mask')
+
+    def __init__(self, mask: int = 0) -> None:
+        self.mask = mask
+        self.suit_masks: Tuple[int, int, int, int] = (
+            mask & RANK_MASK,
+            (mask >> RANK_BITS) & RANK_MASK,
+            (mask >> 2 * RANK_BITS) & RANK_MASK,
+            (mask >> 3 * RANK_BITS) & RANK_MASK,
+        )
+        # Ranks present in any suit
+        self.rank_mask = self.suit_masks[0] | self.suit_masks[1] | self.suit_masks[2] | self.suit_masks[3]
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[eval7.Card]) -> 'CardSet':
+        """Create a CardSet from eval7 cards."""
+        mask = 0
+        for card in cards:
+            mask |= card.mask
+        return cls(mask)
+
+    def __or__(self, other: 'CardSet') -> 'CardSet':
+        return CardSet(self.mask | other.mask)
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __contains__(self, card: eval7.Card) -> bool:
+        return bool(self.mask & card.mask)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CardSet) and other.mask == self.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        return f"CardSet({self.cards()})"
+
+    def cards(self) -> list:
+        """The cards in the set, as eval7 cards."""
+        return [CARD_BY_BIT[bit] for bit in range(4 * RANK_BITS) if self.mask >> bit & 1]
+
+    def has_rank(self, rank: int) -> bool:
+        """Whether any card of the given rank (0 = '2' ... 12 = 'A') is in the set."""
+        return bool(self.rank_mask >> rank & 1)
+
+    def top_rank(self) -> int:
+        """Highest rank in the set, -1 when empty."""
+        return self.rank_mask.bit_length() - 1
+
+    def max_suit_count(self) -> int:
+        """Number of cards in the most common suit."""
+        return max(suit_mask.bit_count() for suit_mask in self.suit_masks)
+
+    def count_at_least(self, rank: int) -> int:
+        """Number of cards (not distinct ranks) of the given rank or higher."""
+        return sum((suit_mask >> rank).bit_count() for suit_mask in self.suit_masks)
+
+    def has_four_consecutive_ranks(self) -> bool:
+        """Whether the set holds four ranks in a row, e.g. 5-6-7-8."""
+        ranks = self.rank_mask
+        return bool(ranks & ranks >> 1 & ranks >> 2 & ranks >> 3)
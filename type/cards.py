@@ -0,0 +1,28 @@
+from typing import Dict, Iterable, List
+
+import eval7
+
+# The 52 cards, created once and shared by every parser and deck
+CARDS = tuple(eval7.Card(rank + suit) for rank in eval7.ranks for suit in eval7.suits)
+
+# Cards indexed by their bit in the eval7 card mask (suit * 13 + rank)
+CARD_BY_BIT = tuple(sorted(CARDS, key=lambda card: card.mask))
+
+# Both the plain ('9s') and the server ('Card("9s")') spelling map to the same card
+CARD_TABLE: Dict[str, eval7.Card] = {}
+for _card in CARDS:
+    CARD_TABLE[str(_card)] = _card
+    CARD_TABLE[repr(_card)] = _card
+
+
+def parse_card(card_str: str) -> eval7.Card:
+    """Parse 'Card("9s")' or '9s' into the interned eval7 card."""
+    card = CARD_TABLE.get(card_str)
+    if card is None:
+        raise ValueError(f"Invalid card: {card_str}")
+    return card
+
+
+def parse_cards(card_strs: Iterable) -> List[eval7.Card]:
+    """Parse card strings, passing through values that are already cards."""
+    return [parse_card(card) if isinstance(card, str) else card for card in card_strs]
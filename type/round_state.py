@@ -1,21 +1,51 @@
-from dataclasses import dataclass
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
+
+import eval7
+
+from type.card_set import CardSet
+from type.cards import parse_cards
+
+# Fields replaced by value on every update
+SCALAR_FIELDS = ('round_num', 'round', 'pot', 'current_player', 'current_bet', 'min_raise', 'max_raise')
+# Per-player fields, kept in dicts owned by the state and updated in place
+PLAYER_FIELDS = ('player_bets', 'player_actions', 'player_money')
+FIELDS = ('round_num', 'round', 'community_cards', 'pot', 'current_player', 'current_bet', 'min_raise', 'max_raise',
+          'player_bets', 'player_actions', 'player_money', 'side_pots')
+
 
-@dataclass
 class RoundStateClient:
-    round_num: int # The number of the current round
-    round: str # The type of round (preflop, flop, turn, river)
-    community_cards: List[str] # The community cards
-    pot: int # The total pot
-    current_player: List[int] # The ids of the current players
-    current_bet: int # The current bet
-    min_raise: int # The minimum raise amount
-    max_raise: int # The maximum raise amount
-    player_bets: Dict[str, int] # The bets of the players
-    player_actions: Dict[str, str] # The actions of the players
-    player_money: Dict[str, int] = None  # The money of the players
-    side_pots: List[Dict[str, Any]] = None  # The side pots
-    
+    """
+    State of the current hand as last sent by the server.
+
+    The runner keeps one instance per game and updates it in place from each
+    GAME_STATE message. After an update, `changed` holds the names of the
+    fields that changed, `changed_players` the IDs whose bet, action or money
+    changed, and `new_street` whether the message started a new street.
+    Callers that keep a state across messages should take a `snapshot()`.
+    """
+    __slots__ = FIELDS + ('changed', 'changed_players', 'new_street', '_board', '_board_set')
+
+    def __init__(self, round_num: int, round: str, community_cards: List[str], pot: int, current_player: List[int], current_bet: int,
+                 min_raise: int, max_raise: int, player_bets: Dict[str, int], player_actions: Dict[str, str],
+                 player_money: Dict[str, int] = None, side_pots: List[Dict[str, Any]] = None) -> None:
+        self.round_num = round_num  # The number of the current round
+        self.round = round  # The type of round (preflop, flop, turn, river)
+        self.community_cards = community_cards  # The community cards
+        self.pot = pot  # The total pot
+        self.current_player = current_player  # The ids of the current players
+        self.current_bet = current_bet  # The current bet
+        self.min_raise = min_raise  # The minimum raise amount
+        self.max_raise = max_raise  # The maximum raise amount
+        self.player_bets = dict(player_bets)  # The bets of the players
+        self.player_actions = dict(player_actions)  # The actions of the players
+        self.player_money = dict(player_money) if player_money is not None else None  # The money of the players
+        self.side_pots = side_pots  # The side pots
+        self.changed: Set[str] = set(FIELDS)
+        self.changed_players: Set[str] = set(self.player_bets)
+        self.new_street = True
+        self._board: Optional[List[eval7.Card]] = None
+        self._board_set: Optional[CardSet] = None
+
     @classmethod
     def from_message(cls, message: Dict[str, Any]) -> 'RoundStateClient':
         """Create RoundStateClient from a message dictionary"""
@@ -32,4 +62,124 @@ class RoundStateClient:
             player_actions=message['player_actions'],
             player_money=message.get('player_money'),
             side_pots=message.get('side_pots', [])
-        )
\ No newline at end of file
+        )
+
+    def update(self, message: Dict[str, Any]) -> Set[str]:
+        """
+        Apply a GAME_STATE message in place.
+
+        Args:
+            message: The GAME_STATE message body
+
+        Returns:
+            Set[str]: Names of the fields that changed
+        """
+        changed = self.changed
+        changed.clear()
+        changed_players = self.changed_players
+        changed_players.clear()
+
+        for name in SCALAR_FIELDS:
+            value = message[name]
+            if value != getattr(self, name):
+                setattr(self, name, value)
+                changed.add(name)
+
+        community_cards = message['community_cards']
+        if community_cards != self.community_cards:
+            self.community_cards = community_cards
+            self._board = None
+            self._board_set = None
+            changed.add('community_cards')
+
+        for name in PLAYER_FIELDS:
+            source = message.get(name)
+            target = getattr(self, name)
+            if source == target:
+                continue
+            changed.add(name)
+            if source is None or target is None:
+                setattr(self, name, dict(source) if source is not None else None)
+                changed_players.update(source or target)
+                continue
+            for player_id, value in source.items():
+                if target.get(player_id) != value:
+                    changed_players.add(player_id)
+            changed_players.update(target.keys() - source.keys())
+            target.clear()
+            target.update(source)
+
+        side_pots = message.get('side_pots', [])
+        if side_pots != self.side_pots:
+            self.side_pots = side_pots
+            changed.add('side_pots')
+
+        self.new_street = 'round' in changed
+        return changed
+
+    def snapshot(self) -> 'RoundStateClient':
+        """An independent copy that later updates do not touch."""
+        state = RoundStateClient(self.round_num, self.round, list(self.community_cards), self.pot, self.current_player,
+                                 self.current_bet, self.min_raise, self.max_raise, self.player_bets, self.player_actions,
+                                 self.player_money, list(self.side_pots) if self.side_pots is not None else None)
+        state.changed = set(self.changed)
+        state.changed_players = set(self.changed_players)
+        state.new_street = self.new_street
+        state._board = self._board
+        state._board_set = self._board_set
+        return state
+
+    @property
+    def board(self) -> List[eval7.Card]:
+        """The community cards parsed into eval7 cards, computed once per street"""
+        if self._board is None:
+            self._board = parse_cards(self.community_cards)
+        return self._board
+
+    @property
+    def board_set(self) -> CardSet:
+        """The community cards as a CardSet, computed once per street"""
+        if self._board_set is None:
+            self._board_set = CardSet.from_cards(self.board)
+        return self._board_set
+
+    def is_to_act(self, player_id: Any) -> bool:
+        """Whether the player is the one the server waits on."""
+        if isinstance(self.current_player, list):
+            return player_id in self.current_player or str(player_id) in map(str, self.current_player)
+        return str(self.current_player) == str(player_id)
+
+    def amount_to_call(self, player_id: Any) -> int:
+        """Chips the player must add to match the current bet."""
+        return max(0, self.current_bet - self.player_bets.get(str(player_id), 0))
+
+    def pot_odds(self, player_id: Any) -> float:
+        """Share of the final pot the player would put in by calling, 0 when there is nothing to call."""
+        to_call = self.amount_to_call(player_id)
+        if not to_call:
+            return 0.0
+        return to_call / (self.pot + to_call)
+
+    def effective_stack(self, player_id: Any) -> int:
+        """
+        Chips that can actually be won or lost: the player's stack, capped by
+        the largest stack among opponents who have not folded.
+        """
+        if not self.player_money:
+            return 0
+        player_id = str(player_id)
+        own = self.player_money.get(player_id, 0)
+        opponents = [money for other_id, money in self.player_money.items()
+                     if other_id != player_id and str(self.player_actions.get(other_id, '')).upper() != 'FOLD']
+        return min(own, max(opponents)) if opponents else own
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RoundStateClient):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in FIELDS)
+        return f"RoundStateClient({fields})"